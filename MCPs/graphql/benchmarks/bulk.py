@@ -0,0 +1,137 @@
+"""
+Bulk mutation benchmark.
+
+Inserts N rows into one table of a generated Hasura schema served by the stub,
+whose mutations take a fixed latency plus a cost per row and which rejects
+request bodies above a size limit (413), like a proxy in front of Hasura:
+- single_request: every row in one insert, as execute-query would send it
+- window_<n>: the bulk-mutation path, size-bounded chunks with n in flight
+
+Reports wall time, rows per second, requests and bytes sent, affected_rows,
+failed chunks and the peak number of requests in flight at the stub.
+
+Usage (from MCPs/graphql):
+    python -m benchmarks.bulk --rows 100000 --windows 1,4,8,16
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any, Dict, List
+
+from .common import ensure_src_on_path, run_metadata, write_results
+from .schema_gen import generate_introspection, table_names
+from .stub_server import StubConfig, StubGraphQLServer
+
+ensure_src_on_path()
+
+from graphql_client import GraphQLClient  # noqa: E402
+from tools.bulk_mutation import build_bulk_document, describe_bulk_mutation  # noqa: E402
+
+
+def make_rows(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": f"00000000-0000-4000-8000-{i:012d}",
+            "name": f"seed row {i}",
+            "count": i,
+            "active": i % 2 == 0,
+            "created_at": "2024-01-01T00:00:00+00:00"
+        }
+        for i in range(count)
+    ]
+
+
+def _reset(server: StubGraphQLServer):
+    for key in ("requests", "request_bytes", "too_large", "mutation_rows", "max_in_flight"):
+        server.stats[key] = 0
+
+
+async def _single_request(server: StubGraphQLServer, mutation: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    client = GraphQLClient(endpoint=server.url)
+    try:
+        info = describe_bulk_mutation(await client._get_index(), mutation)
+        _reset(server)
+        start = time.perf_counter()
+        try:
+            await client._execute_query(build_bulk_document(info), {"rows": rows})
+            error = None
+        except Exception as e:
+            error = str(e).splitlines()[0]
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.aclose()
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "requests": server.stats["requests"],
+        "request_mb": round(server.stats["request_bytes"] / 1e6, 2),
+        "affected_rows": server.stats["mutation_rows"],
+        "error": error
+    }
+
+
+async def _windowed(server: StubGraphQLServer, mutation: str, rows: List[Dict[str, Any]], window: int,
+                    chunk_rows: int, chunk_bytes: int) -> Dict[str, Any]:
+    client = GraphQLClient(endpoint=server.url, max_connections=max(window, 1))
+    try:
+        info = describe_bulk_mutation(await client._get_index(), mutation)
+        _reset(server)
+        totals = await client._bulk_mutation(info, rows, None, chunk_rows, chunk_bytes, window)
+    finally:
+        await client.aclose()
+    return {
+        "elapsed_s": round(totals["elapsed"], 3),
+        "rows_per_s": round(len(rows) / totals["elapsed"]) if totals["elapsed"] else None,
+        "chunks": totals["chunks"],
+        "requests": server.stats["requests"],
+        "request_mb": round(server.stats["request_bytes"] / 1e6, 2),
+        "affected_rows": totals["affected_rows"],
+        "stub_rows": server.stats["mutation_rows"],
+        "failed_chunks": len(totals["failures"]),
+        "stub_max_in_flight": server.stats["max_in_flight"]
+    }
+
+
+async def measure_bulk(row_count: int, windows: List[int], chunk_rows: int, chunk_bytes: int, latency_ms: float,
+                       row_latency_ms: float, max_request_bytes: int) -> Dict[str, Any]:
+    config = StubConfig(latency_ms=latency_ms, schema=generate_introspection(n_tables=10))
+    config.row_latency_ms = row_latency_ms
+    config.max_request_bytes = max_request_bytes
+    mutation = f"insert_{table_names(1)[0]}"
+    rows = make_rows(row_count)
+    results: Dict[str, Any] = {"mutation": mutation}
+    with StubGraphQLServer(config=config) as server:
+        print("single request...", file=sys.stderr)
+        results["single_request"] = await _single_request(server, mutation, rows)
+        for window in windows:
+            print(f"chunked, {window} in flight...", file=sys.stderr)
+            results[f"window_{window}"] = await _windowed(server, mutation, rows, window, chunk_rows, chunk_bytes)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chunked, pipelined bulk inserts against the stub")
+    parser.add_argument("--rows", type=int, default=100000, help="Rows to insert")
+    parser.add_argument("--windows", default="1,4,8,16", help="Comma-separated chunks-in-flight levels")
+    parser.add_argument("--chunk-rows", type=int, default=1000, help="Maximum rows per request")
+    parser.add_argument("--chunk-bytes", type=int, default=512 * 1024, help="Approximate maximum row bytes per request")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="Stub latency per request")
+    parser.add_argument("--row-latency-ms", type=float, default=0.02, help="Stub latency per inserted row")
+    parser.add_argument("--max-request-bytes", type=int, default=1024 * 1024, help="Stub body size limit (0 = none)")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/bulk-<rev>-<time>.json)")
+    args = parser.parse_args()
+    
+    windows = [int(s) for s in args.windows.split(",") if s]
+    results = {
+        "meta": run_metadata(vars(args)),
+        "bulk": asyncio.run(measure_bulk(
+            args.rows, windows, args.chunk_rows, args.chunk_bytes, args.latency_ms, args.row_latency_ms,
+            args.max_request_bytes
+        ))
+    }
+    print(write_results(results, args.output, "bulk"))
+
+
+if __name__ == "__main__":
+    main()
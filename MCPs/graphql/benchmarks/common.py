@@ -0,0 +1,75 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PACKAGE_DIR = os.path.dirname(BENCH_DIR)
+SRC_DIR = os.path.join(PACKAGE_DIR, "src")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+
+def ensure_src_on_path():
+    """Make the server modules importable the same way main.py imports them."""
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
+
+
+def percentiles(samples_ms: List[float]) -> Dict[str, float]:
+    """Summarize latency samples (milliseconds)."""
+    if not samples_ms:
+        return {"count": 0}
+    ordered = sorted(samples_ms)
+    
+    def pick(q: float) -> float:
+        index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+        return round(ordered[index], 3)
+    
+    return {
+        "count": len(ordered),
+        "min_ms": round(ordered[0], 3),
+        "mean_ms": round(sum(ordered) / len(ordered), 3),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": round(ordered[-1], 3)
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PACKAGE_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(args: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "git_revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "args": args
+    }
+
+
+def write_results(results: Dict[str, Any], output: Optional[str], prefix: str) -> str:
+    """Write results as JSON; defaults to benchmarks/results/<prefix>-<rev>-<time>.json."""
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        meta = results.get("meta", {})
+        stamp = meta.get("timestamp", time.strftime("%Y-%m-%dT%H:%M:%S")).replace(":", "")
+        output = os.path.join(RESULTS_DIR, f"{prefix}-{meta.get('git_revision') or 'norev'}-{stamp}.json")
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    return output
@@ -0,0 +1,81 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+Usage (from MCPs/graphql):
+    python -m benchmarks.compare old.json new.json --threshold 0.10
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Tuple
+
+
+# Metric suffixes where larger values are better; every other tracked suffix is lower-is-better
+HIGHER_IS_BETTER = ("_rps",)
+TRACKED_SUFFIXES = ("p50_ms", "p95_ms", "p99_ms", "mean_ms", "_kb", "_bytes", "_rps")
+
+
+def flatten(data: Any, prefix: str = "") -> Dict[str, float]:
+    """Flatten nested dicts/lists into dotted keys with numeric leaves."""
+    flat: Dict[str, float] = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key == "meta":
+                continue
+            flat.update(flatten(value, f"{prefix}{key}."))
+    elif isinstance(data, list):
+        for index, value in enumerate(data):
+            label = value.get("concurrency", value.get("workers", index)) if isinstance(value, dict) else index
+            flat.update(flatten(value, f"{prefix}{label}."))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        flat[prefix.rstrip(".")] = float(data)
+    return flat
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float) -> List[Tuple[str, float, float, float]]:
+    """Return (metric, old, new, relative change) for every tracked metric that regressed."""
+    old_flat, new_flat = flatten(old), flatten(new)
+    regressions = []
+    for key in sorted(old_flat.keys() & new_flat.keys()):
+        if not key.endswith(TRACKED_SUFFIXES):
+            continue
+        before, after = old_flat[key], new_flat[key]
+        if before == 0:
+            continue
+        change = (after - before) / before
+        if key.endswith(HIGHER_IS_BETTER):
+            change = -change
+        if change > threshold:
+            regressions.append((key, before, after, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative regression threshold (default: 0.10)")
+    args = parser.parse_args()
+    
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    
+    regressions = compare(old, new, args.threshold)
+    old_rev = old.get("meta", {}).get("git_revision")
+    new_rev = new.get("meta", {}).get("git_revision")
+    print(f"Comparing {old_rev} -> {new_rev} (threshold {args.threshold:.0%})")
+    
+    if not regressions:
+        print("No regressions found")
+        return
+    
+    for key, before, after, change in regressions:
+        print(f"REGRESSION {key}: {before:g} -> {after:g} ({change:+.1%})")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
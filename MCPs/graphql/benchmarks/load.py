@@ -0,0 +1,126 @@
+"""
+Load test for the adaptive concurrency limiter.
+
+Closed-loop workers issue data queries against a stub whose upstream pool has a
+fixed capacity (requests beyond it queue and slow every request down), while a
+probe sends a small introspection query every 100ms. For each worker count the
+test reports throughput, data and probe latency, limiter rejections and the peak
+number of requests in flight at the stub, with and without the limiter.
+
+Usage (from MCPs/graphql):
+    python -m benchmarks.load --workers 1,8,32,128,256
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any, Dict, List
+
+from .common import ensure_src_on_path, percentiles, run_metadata, write_results
+from .stub_server import StubConfig, StubGraphQLServer
+
+ensure_src_on_path()
+
+from concurrency_limiter import LimiterPolicy, OverloadedError  # noqa: E402
+from graphql_client import GraphQLClient  # noqa: E402
+from resilience import ResiliencePolicy  # noqa: E402
+
+
+QUERY = "query Bench { items { id name count active } }"
+PROBE = "query Probe { __schema { queryType { name } } }"
+
+
+async def run_level(server: StubGraphQLServer, workers: int, duration: float, limiter: bool,
+                    max_connections: int) -> Dict[str, Any]:
+    client = GraphQLClient(
+        endpoint=server.url,
+        max_connections=max_connections,
+        persisted_queries=False,
+        resilience=ResiliencePolicy(max_retries=0, hedge=False),
+        limiter=LimiterPolicy(enabled=limiter)
+    )
+    samples: List[float] = []
+    probe_samples: List[float] = []
+    errors = {"rejected": 0, "failed": 0}
+    stop_at = time.perf_counter() + duration
+    
+    async def worker():
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            try:
+                await client._execute_query(QUERY)
+                samples.append((time.perf_counter() - start) * 1000)
+            except OverloadedError:
+                errors["rejected"] += 1
+            except Exception:
+                errors["failed"] += 1
+    
+    async def probe():
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            try:
+                await client._execute_query(PROBE)
+                probe_samples.append((time.perf_counter() - start) * 1000)
+            except Exception:
+                pass
+            await asyncio.sleep(0.1)
+    
+    server.stats["max_in_flight"] = 0
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(probe(), *(worker() for _ in range(workers)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.aclose()
+    
+    return {
+        "workers": workers,
+        "throughput_rps": round(len(samples) / elapsed, 2),
+        "latency": percentiles(samples),
+        "probe_latency": percentiles(probe_samples),
+        "rejected": errors["rejected"],
+        "failed": errors["failed"],
+        "upstream_max_in_flight": server.stats["max_in_flight"],
+        "final_limit": client.limiter.snapshot()["limit"] if limiter else None
+    }
+
+
+async def measure_load(worker_levels: List[int], duration: float, latency_ms: float, capacity: int,
+                       overload_penalty: float, max_connections: int) -> Dict[str, Any]:
+    config = StubConfig(latency_ms=latency_ms, latency_jitter_ms=latency_ms / 4, payload_bytes=1024)
+    config.capacity = capacity
+    config.overload_penalty = overload_penalty
+    results: Dict[str, Any] = {"unlimited": [], "limiter": []}
+    with StubGraphQLServer(config=config) as server:
+        for workers in worker_levels:
+            for mode in ("unlimited", "limiter"):
+                print(f"{mode}, {workers} workers...", file=sys.stderr)
+                results[mode].append(await run_level(server, workers, duration, mode == "limiter", max_connections))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput/latency curve with and without the concurrency limiter")
+    parser.add_argument("--workers", default="1,8,32,128,256", help="Comma-separated closed-loop worker counts")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per level")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Stub service time per request")
+    parser.add_argument("--capacity", type=int, default=8, help="Stub upstream pool size")
+    parser.add_argument("--overload-penalty", type=float, default=0.05,
+                        help="Extra service time fraction per request in flight above capacity")
+    parser.add_argument("--max-connections", type=int, default=256, help="Client connection pool size")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/load-<rev>-<time>.json)")
+    args = parser.parse_args()
+    
+    levels = [int(s) for s in args.workers.split(",") if s]
+    results = {
+        "meta": run_metadata(vars(args)),
+        "load": asyncio.run(measure_load(
+            levels, args.duration, args.latency_ms, args.capacity, args.overload_penalty, args.max_connections
+        ))
+    }
+    print(write_results(results, args.output, "load"))
+
+
+if __name__ == "__main__":
+    main()
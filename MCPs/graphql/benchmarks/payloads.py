@@ -0,0 +1,153 @@
+"""
+Large response benchmark.
+
+For each payload size, fetches a synthetic response from the stub server with:
+- baseline: buffered `response.json()` (stdlib decode of the full body as text)
+- streamed: the client's transport (chunks fed to json_codec.StreamDecoder)
+- streamed_gzip: the same with gzip/br response compression negotiated
+and times stdlib vs fast (orjson) decode and pretty-print of the same body, and
+execute-query's rendering of the decoded result as one joined string vs chunked
+content parts (time to first part and allocation peak).
+
+Usage (from MCPs/graphql):
+    python -m benchmarks.payloads --sizes-mb 1,10,50
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List
+
+from .common import ensure_src_on_path, percentiles, run_metadata, write_results
+from .stub_server import StubConfig, StubGraphQLServer, build_payload
+
+ensure_src_on_path()
+
+import json_codec  # noqa: E402
+from graphql_client import GraphQLClient  # noqa: E402
+from tools.rendering import chunk_lines, render  # noqa: E402
+
+
+QUERY = "query Bench { items { id name count active } }"
+
+
+async def _sample(call: Callable[[], Awaitable[Any]], repeats: int) -> Dict[str, Any]:
+    """Latency percentiles plus the allocation peak of one extra traced call."""
+    await call()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+    
+    tracemalloc.start()
+    await call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"latency": percentiles(samples), "peak_kb": round(peak / 1024, 1)}
+
+
+def _render(client: GraphQLClient, data: Any, chunked: bool) -> float:
+    """Render execute-query output for `data`; returns the time until the first part was ready."""
+    start = time.perf_counter()
+    lines = client._render_query_result(QUERY, None, None, data)
+    if not chunked:
+        render(lines)
+        return time.perf_counter() - start
+    first = None
+    parts = []
+    for part in chunk_lines(lines):
+        if first is None:
+            first = time.perf_counter() - start
+        parts.append(part)
+    return first
+
+
+def _render_sample(client: GraphQLClient, data: Any, chunked: bool) -> Dict[str, Any]:
+    """Total and first-part time, then the allocation peak of one traced render."""
+    start = time.perf_counter()
+    first = _render(client, data, chunked)
+    total = time.perf_counter() - start
+    
+    tracemalloc.start()
+    _render(client, data, chunked)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"first_part_ms": round(first * 1000, 3), "total_ms": round(total * 1000, 3), "peak_kb": round(peak / 1024, 1)}
+
+
+def _sample_sync(call: Callable[[], Any], repeats: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+
+async def measure_payload(server: StubGraphQLServer, payload_bytes: int, repeats: int) -> Dict[str, Any]:
+    server.config.payload_bytes = payload_bytes
+    client = GraphQLClient(endpoint=server.url, persisted_queries=False)
+    http = client._get_http_client()
+    
+    async def baseline():
+        # The transport before the codec layer: httpx buffers the body, decodes text, stdlib json.loads
+        response = await http.post(server.url, json={"query": QUERY}, headers={"Accept-Encoding": "identity"}, timeout=60.0)
+        response.raise_for_status()
+        return response.json()["data"]
+    
+    results: Dict[str, Any] = {}
+    try:
+        server.config.compression = False
+        results["baseline"] = await _sample(baseline, repeats)
+        results["streamed"] = await _sample(lambda: client._execute_query(QUERY), repeats)
+        server.config.compression = True
+        results["streamed_gzip"] = await _sample(lambda: client._execute_query(QUERY), repeats)
+    finally:
+        await client.aclose()
+    
+    body = json.dumps({"data": build_payload(payload_bytes)}).encode()
+    data = json.loads(body)["data"]
+    encoding, compressed = server.compress(body, json_codec.accept_encoding())
+    results["render"] = {
+        "joined": _render_sample(client, data, chunked=False),
+        "chunked": _render_sample(client, data, chunked=True)
+    }
+    results["wire_bytes"] = {"identity": len(body), encoding or "identity": len(compressed)}
+    results["codec"] = {
+        "backend": json_codec.BACKEND,
+        "stdlib_decode": _sample_sync(lambda: json.loads(body), repeats),
+        "fast_decode": _sample_sync(lambda: json_codec.loads(body), repeats),
+        "stdlib_pretty": _sample_sync(lambda: json.dumps(data, indent=2), repeats),
+        "fast_pretty": _sample_sync(lambda: json_codec.dumps_pretty(data), repeats)
+    }
+    return results
+
+
+async def measure_payloads(sizes_mb: List[float], repeats: int) -> Dict[str, Any]:
+    """Transport and codec timings per payload size (keyed "<n>mb")."""
+    results = {}
+    with StubGraphQLServer(config=StubConfig()) as server:
+        for size in sizes_mb:
+            print(f"payload {size} MB...", file=sys.stderr)
+            results[f"{size:g}mb"] = await measure_payload(server, int(size * 1024 * 1024), repeats)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark large response decoding and compression")
+    parser.add_argument("--sizes-mb", default="1,10,50", help="Comma-separated payload sizes in MB")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/payloads-<rev>-<time>.json)")
+    args = parser.parse_args()
+    
+    sizes = [float(s) for s in args.sizes_mb.split(",") if s]
+    results = {"meta": run_metadata(vars(args)), "payloads": asyncio.run(measure_payloads(sizes, args.repeats))}
+    print(write_results(results, args.output, "payloads"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Replay a recorded workload (GRAPHQL_WORKLOAD_LOG) against an endpoint.
+
+Re-issues the execute-query records of a workload file in their recorded order and
+spacing, compressed by --speedup (0 = back to back), with at most --concurrency
+requests in flight. Variables are synthesized from the recorded shapes, so the
+replay has the original documents and payload sizes but placeholder values.
+Without --target the requests go to the local stub server.
+
+Mutations are skipped unless --include-mutations is given: documents keep their
+inline literals, so replaying them against a real endpoint writes data there.
+bulk-mutation records are always skipped, since only the shape of their
+arguments (not the target mutation) is recorded.
+
+Reports throughput, latency percentiles, how far requests started behind their
+schedule, and a per-document breakdown of the most frequent operations.
+
+Usage (from MCPs/graphql):
+    python -m benchmarks.replay workload.jsonl --speedup 10 --concurrency 32
+    python -m benchmarks.replay workload.jsonl --target https://host/v1/graphql --auth-value "$SECRET"
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Tuple
+
+from .common import ensure_src_on_path, percentiles, run_metadata, write_results
+from .stub_server import StubConfig, StubGraphQLServer
+
+ensure_src_on_path()
+
+import json_codec  # noqa: E402
+from graphql_client import GraphQLClient  # noqa: E402
+from concurrency_limiter import LimiterPolicy  # noqa: E402
+from resilience import ResiliencePolicy, operation_type  # noqa: E402
+from workload import synthesize  # noqa: E402
+
+
+def load_workload(path: str, limit: int = 0,
+                  include_mutations: bool = False) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    execute-query records with a document, oldest first (persisted queries are
+    resolved by name), and the number of records skipped per reason.
+    """
+    from persisted_queries import get_default_registry
+    
+    records = []
+    skipped = {"mutations": 0, "bulk_mutations": 0, "unknown_persisted_queries": 0}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json_codec.loads(line)
+            if record.get("tool") == "bulk-mutation":
+                skipped["bulk_mutations"] += 1
+                continue
+            if record.get("tool") != "execute-query":
+                continue
+            if not record.get("document") and record.get("persisted_query"):
+                document = get_default_registry().get(record["persisted_query"])
+                if document is None:
+                    skipped["unknown_persisted_queries"] += 1
+                    continue
+                record["document"] = document.document
+                record.setdefault("document_sha256", document.sha256)
+            if not record.get("document"):
+                continue
+            kind = record.get("operation_type") or operation_type(record["document"])
+            if kind == "mutation" and not include_mutations:
+                skipped["mutations"] += 1
+                continue
+            records.append(record)
+    records.sort(key=lambda record: record["ts"])
+    return (records[:limit] if limit else records), skipped
+
+
+async def replay(records: List[Dict[str, Any]], endpoint: str, speedup: float, concurrency: int,
+                 auth_header: str = "Authorization", auth_value: str = "") -> Dict[str, Any]:
+    # The requested concurrency is the load to apply, so the adaptive limiter stays out of the way
+    # and the pool has a connection per request that may be in flight (all of them when unbounded)
+    client = GraphQLClient(
+        endpoint=endpoint,
+        auth_header=auth_header,
+        auth_value=auth_value,
+        max_connections=concurrency if concurrency > 0 else max(len(records), 1),
+        resilience=ResiliencePolicy(max_retries=0, hedge=False),
+        limiter=LimiterPolicy(enabled=False)
+    )
+    semaphore = asyncio.Semaphore(concurrency) if concurrency > 0 else None
+    latency: List[float] = []
+    schedule_lag: List[float] = []
+    by_document: Dict[str, List[float]] = defaultdict(list)
+    errors = {"graphql_errors": 0, "failed": 0}
+    
+    first_ts = records[0]["ts"] if records else 0.0
+    start = time.perf_counter()
+    
+    async def issue(record: Dict[str, Any]):
+        due = (record["ts"] - first_ts) / speedup if speedup > 0 else 0.0
+        delay = due - (time.perf_counter() - start)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        async with semaphore or nullcontext():
+            issued = time.perf_counter()
+            schedule_lag.append(max(0.0, (issued - start - due) * 1000))
+            try:
+                await client._execute_query(
+                    record["document"], synthesize(record.get("variables") or {}) or None, record.get("operation_name")
+                )
+            except Exception as e:
+                # _execute_query raises on GraphQL errors in an answered request, like on transport failures
+                errors["graphql_errors" if str(e).startswith("GraphQL errors:") else "failed"] += 1
+                return
+            elapsed = (time.perf_counter() - issued) * 1000
+            latency.append(elapsed)
+            by_document[record.get("document_sha256") or record["document"][:64]].append(elapsed)
+    
+    try:
+        await asyncio.gather(*(issue(record) for record in records))
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.aclose()
+    
+    recorded_span = records[-1]["ts"] - first_ts if records else 0.0
+    top = sorted(by_document.items(), key=lambda item: len(item[1]), reverse=True)[:10]
+    return {
+        "requests": len(records),
+        "ok": len(latency),
+        "graphql_errors": errors["graphql_errors"],
+        "failed": errors["failed"],
+        "recorded_span_s": round(recorded_span, 3),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latency) / elapsed, 2) if elapsed else 0.0,
+        "latency": percentiles(latency),
+        "schedule_lag": percentiles(schedule_lag),
+        "documents": len(by_document),
+        "top_documents": [{"document_sha256": key, **percentiles(samples)} for key, samples in top]
+    }
+
+
+async def measure_replay(path: str, target: Optional[str], speedup: float, concurrency: int, limit: int,
+                         auth_header: str, auth_value: str, stub_latency_ms: float,
+                         include_mutations: bool = False) -> Dict[str, Any]:
+    records, skipped = load_workload(path, limit, include_mutations)
+    print(f"replaying {len(records)} execute-query records (skipped: {skipped})...", file=sys.stderr)
+    if target:
+        results = await replay(records, target, speedup, concurrency, auth_header, auth_value)
+    else:
+        config = StubConfig(latency_ms=stub_latency_ms, latency_jitter_ms=stub_latency_ms / 4)
+        with StubGraphQLServer(config=config) as server:
+            results = await replay(records, server.url, speedup, concurrency)
+            results["stub_max_in_flight"] = server.stats["max_in_flight"]
+    results["skipped"] = skipped
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded execute-query workload")
+    parser.add_argument("workload", help="Workload file written with GRAPHQL_WORKLOAD_LOG")
+    parser.add_argument("--target", help="GraphQL endpoint to replay against (default: a local stub server)")
+    parser.add_argument("--auth-header", default="Authorization", help="Auth header name for --target")
+    parser.add_argument("--auth-value", default="", help="Auth header value for --target")
+    parser.add_argument("--speedup", type=float, default=1.0, help="Compress recorded time by this factor (0 = no pacing)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Maximum requests in flight (0 = unbounded)")
+    parser.add_argument("--limit", type=int, default=0, help="Replay only the first N records")
+    parser.add_argument("--include-mutations", action="store_true",
+                        help="Also replay recorded mutations (they write to the target)")
+    parser.add_argument("--stub-latency-ms", type=float, default=20.0, help="Stub service time per request")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/replay-<rev>-<time>.json)")
+    args = parser.parse_args()
+    
+    meta_args = dict(vars(args))
+    # The auth value is a secret; keep it out of the result file
+    meta_args["auth_value"] = bool(args.auth_value)
+    results = {
+        "meta": run_metadata(meta_args),
+        "replay": asyncio.run(measure_replay(
+            args.workload, args.target, args.speedup, args.concurrency, args.limit,
+            args.auth_header, args.auth_value, args.stub_latency_ms, args.include_mutations
+        ))
+    }
+    print(write_results(results, args.output, "replay"))
+
+
+if __name__ == "__main__":
+    main()
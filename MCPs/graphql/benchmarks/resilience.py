@@ -0,0 +1,119 @@
+"""
+Tail-latency and failure handling benchmark.
+
+Runs execute-query traffic against the stub server with injected faults:
+- tail: a fraction of responses are slow; hedged reads on vs off
+- errors: a fraction of responses are 503s; retries on vs off
+- outage: every response fails; how quickly the circuit breaker starts failing fast
+
+Usage (from MCPs/graphql):
+    python -m benchmarks.resilience --requests 200
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any, Dict, List
+
+from .common import ensure_src_on_path, percentiles, run_metadata, write_results
+from .stub_server import StubConfig, StubGraphQLServer
+
+ensure_src_on_path()
+
+from graphql_client import GraphQLClient  # noqa: E402
+from resilience import ResiliencePolicy  # noqa: E402
+
+
+QUERY = "query Bench { items { id name count active } }"
+
+
+async def _drive(client: GraphQLClient, requests: int, concurrency: int) -> Dict[str, Any]:
+    """Run requests through the client's transport; returns latency (all calls) and the success rate."""
+    samples: List[float] = []
+    failures = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await client._execute_query(QUERY)
+            except Exception:
+                failures += 1
+            samples.append((time.perf_counter() - start) * 1000)
+    
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return {
+        "latency": percentiles(samples),
+        "success_rate": round(1 - failures / requests, 4),
+        "counters": client.resilience.snapshot()["counters"]
+    }
+
+
+async def _scenario(server: StubGraphQLServer, policy: ResiliencePolicy, requests: int, concurrency: int,
+                    warmup: int = 30) -> Dict[str, Any]:
+    client = GraphQLClient(endpoint=server.url, persisted_queries=False, resilience=policy)
+    try:
+        # Warm the latency window (hedge delay) and the connection pool without faults
+        faults = (server.config.error_rate, server.config.drop_rate, server.config.slow_rate)
+        server.config.error_rate = server.config.drop_rate = server.config.slow_rate = 0.0
+        for _ in range(warmup):
+            await client._execute_query(QUERY)
+        server.config.error_rate, server.config.drop_rate, server.config.slow_rate = faults
+        
+        before = server.stats["requests"]
+        result = await _drive(client, requests, concurrency)
+        result["server_requests"] = server.stats["requests"] - before
+        return result
+    finally:
+        await client.aclose()
+
+
+async def measure_resilience(requests: int, concurrency: int, latency_ms: float = 5.0) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    config = StubConfig(latency_ms=latency_ms, latency_jitter_ms=latency_ms / 2)
+    with StubGraphQLServer(config=config) as server:
+        print("tail latency (hedging)...", file=sys.stderr)
+        config.slow_rate, config.slow_latency_ms = 0.05, 300.0
+        results["tail"] = {
+            "no_hedge": await _scenario(server, ResiliencePolicy(hedge=False), requests, concurrency),
+            "hedge": await _scenario(server, ResiliencePolicy(hedge=True), requests, concurrency)
+        }
+        config.slow_rate = 0.0
+        
+        print("injected errors (retries)...", file=sys.stderr)
+        config.error_rate = 0.2
+        results["errors"] = {
+            "no_retry": await _scenario(server, ResiliencePolicy(max_retries=0, hedge=False), requests, concurrency),
+            "retry": await _scenario(server, ResiliencePolicy(max_retries=2, backoff_base=0.01, hedge=False), requests, concurrency)
+        }
+        
+        print("outage (circuit breaker)...", file=sys.stderr)
+        config.error_rate = 1.0
+        results["outage"] = {
+            "no_breaker": await _scenario(server, ResiliencePolicy(breaker_failures=0, backoff_base=0.01, hedge=False), requests, concurrency),
+            "breaker": await _scenario(server, ResiliencePolicy(breaker_failures=5, backoff_base=0.01, hedge=False), requests, concurrency)
+        }
+        config.error_rate = 0.0
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark timeouts, retries, hedging and the circuit breaker")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Base stub latency")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/resilience-<rev>-<time>.json)")
+    args = parser.parse_args()
+    
+    results = {
+        "meta": run_metadata(vars(args)),
+        "resilience": asyncio.run(measure_resilience(args.requests, args.concurrency, args.latency_ms))
+    }
+    print(write_results(results, args.output, "resilience"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Benchmark runner for the GraphQL MCP server.
+
+Measures cold start, stdio startup (time to first list_tools and first schema
+tool result), schema loading, every tool exposed by main.py, memory, request
+size with and without persisted queries, execute-query concurrency scaling,
+behaviour under injected faults and large (1-50 MB) response handling against a
+local stub server (and the websocket stub for the subscription tools, when
+websockets is installed). Results are written as JSON so runs from different
+commits can be compared with compare.py.
+
+Usage (from MCPs/graphql):
+    python -m benchmarks.run --tables 10,100,500
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import nullcontext
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .common import SRC_DIR, ensure_src_on_path, percentiles, run_metadata, write_results
+from .payloads import measure_payloads
+from .resilience import measure_resilience
+from .schema_gen import table_names, write_schema_files
+from .startup import measure_startup
+from .stub_server import StubConfig, StubGraphQLServer
+from .ws_stub import StubSubscriptionServer
+
+ensure_src_on_path()
+
+from endpoint_registry import DEFAULT_ENDPOINT_NAME, EndpointConfig, EndpointRegistry  # noqa: E402
+from graphql_client import GraphQLClient  # noqa: E402
+
+
+async def _subscription_round_trip(client: GraphQLClient) -> str:
+    """subscribe, poll-subscription until the first events arrive, then unsubscribe."""
+    started = await client.subscribe("subscription Events { events { seq sent_at row } }")
+    match = re.search(r"\*\*Subscription ID:\*\* (\S+)", started)
+    if not match:
+        return started
+    polled = await client.poll_subscription(match.group(1), cursor=0, max_events=10, wait_seconds=1.0)
+    return "\n".join((started, polled, await client.unsubscribe(match.group(1))))
+
+
+def _endpoint_registry(client: GraphQLClient) -> EndpointRegistry:
+    """A registry with `client` as its loaded default endpoint and two that were never used."""
+    registry = EndpointRegistry([
+        EndpointConfig(DEFAULT_ENDPOINT_NAME, client.endpoint, schema_file=client.schema_file),
+        EndpointConfig("staging", "http://127.0.0.1:9/staging/v1/graphql"),
+        EndpointConfig("prod", "http://127.0.0.1:9/prod/v1/graphql", schema_file=client.schema_file)
+    ])
+    registry._clients[DEFAULT_ENDPOINT_NAME] = client
+    return registry
+
+
+def _tool_cases(n_tables: int, subscriber: Optional[GraphQLClient] = None) -> Dict[str, Callable[[GraphQLClient], Awaitable[str]]]:
+    """
+    One representative call per tool in main.py. The subscription tools run as one
+    subscribe/poll/unsubscribe round trip on `subscriber`, a client of the websocket
+    stub, and are left out without one.
+    """
+    names = table_names(n_tables)
+    target = names[len(names) // 2]
+    rows = [{"name": f"bench row {i}", "created_at": "2024-01-01T00:00:00+00:00"} for i in range(1000)]
+    
+    async def constant(text: str) -> str:
+        return text
+    
+    cases = {
+        "introspect-schema": lambda c: c.introspect_schema(page=2, per_page=50),
+        "introspect-schema[kind]": lambda c: c.introspect_schema(page=1, per_page=50, filter_kind="INPUT_OBJECT"),
+        "get-type-info": lambda c: c.get_type_info(target),
+        "list-queries": lambda c: c.list_queries(),
+        "list-mutations": lambda c: c.list_mutations(),
+        "analyze-relations": lambda c: c.analyze_relations(),
+        "analyze-relations[type]": lambda c: c.analyze_relations(target),
+        "search-schema": lambda c: c.search_schema(target),
+        "diff-schema": lambda c: c.diff_schema("cached", "file", update_cache=False),
+        "build-query[depth=2]": lambda c: c.build_query(target, depth=2),
+        "execute-query": lambda c: c.execute_query(f"query {{ {target}(limit: 10) {{ id }} }}"),
+        "aggregate": lambda c: c.aggregate(target, functions={"max": ["created_at"]}),
+        "aggregate[group_by]": lambda c: c.aggregate(target, functions={"max": ["created_at"]}, group_by=["col_00"]),
+        "explain-query": lambda c: c.explain_query(f"query {{ {target}(limit: 10) {{ id }} }}"),
+        "bulk-mutation[1000 rows]": lambda c: c.bulk_mutation(f"insert_{target}", rows=rows, chunk_rows=250),
+        "get-metrics": lambda c: constant(c.get_metrics()),
+        "list-persisted-queries": lambda c: constant(c.list_persisted_queries()),
+        "list-endpoints": lambda c: constant(_endpoint_registry(c).format_status()),
+    }
+    if subscriber is not None:
+        cases["subscribe+poll+unsubscribe"] = lambda c: _subscription_round_trip(subscriber)
+    return cases
+
+
+async def _timed(coro_factory: Callable[[], Awaitable[Any]]) -> float:
+    start = time.perf_counter()
+    await coro_factory()
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_cold_start(schema_file: str, repeats: int) -> Dict[str, Any]:
+    """Wall time for a fresh interpreter to import main.py (what every stdio spawn pays)."""
+    env = dict(os.environ, GRAPHQL_SCHEMA_FILE=schema_file, GRAPHQL_ENDPOINT="http://127.0.0.1:9/v1/graphql")
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import main"], cwd=SRC_DIR, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    
+    baseline = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        baseline.append((time.perf_counter() - start) * 1000)
+    
+    return {"import_main": percentiles(samples), "bare_interpreter": percentiles(baseline)}
+
+
+async def measure_schema_load(schema_files: Dict[str, str], endpoint: str, repeats: int) -> Dict[str, Any]:
+    """First-call schema load time and allocation peak for each schema file format."""
+    results = {}
+    for fmt, path in schema_files.items():
+        samples = []
+        for _ in range(repeats):
+            client = GraphQLClient(endpoint=endpoint, schema_file=path)
+            samples.append(await _timed(client._get_schema))
+        
+        tracemalloc.start()
+        client = GraphQLClient(endpoint=endpoint, schema_file=path)
+        await client._get_schema()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        results[fmt] = {
+            "file_bytes": os.path.getsize(path),
+            "latency": percentiles(samples),
+            "retained_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1)
+        }
+    return results
+
+
+async def measure_tools(n_tables: int, schema_file: str, endpoint: str, repeats: int,
+                        subscription_endpoint: Optional[str] = None) -> Dict[str, Any]:
+    """Per-tool latency, output size and allocation peak with a warm schema cache."""
+    client = GraphQLClient(endpoint=endpoint, schema_file=schema_file)
+    await client._get_schema()
+    subscriber = GraphQLClient(endpoint=subscription_endpoint) if subscription_endpoint else None
+    
+    results = {}
+    try:
+        for tool, call in _tool_cases(n_tables, subscriber).items():
+            output = await call(client)
+            samples = [await _timed(lambda: call(client)) for _ in range(repeats)]
+            
+            tracemalloc.start()
+            await call(client)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            
+            results[tool] = {
+                "latency": percentiles(samples),
+                "output_bytes": len(output.encode()),
+                "error": output.startswith("Error") or output.startswith("# GraphQL Query Error"),
+                "peak_kb": round(peak / 1024, 1)
+            }
+    finally:
+        if subscriber is not None:
+            await subscriber.aclose()
+    return results
+
+
+async def measure_concurrency(server: StubGraphQLServer, schema_file: str, levels: List[int],
+                              latency_ms: float, payload_bytes: int) -> List[Dict[str, Any]]:
+    """execute-query throughput and latency as the number of in-flight calls grows."""
+    server.config.latency_ms = latency_ms
+    server.config.payload_bytes = payload_bytes
+    client = GraphQLClient(endpoint=server.url, schema_file=schema_file)
+    query = "query Bench { items { id name count active } }"
+    
+    results = []
+    try:
+        for level in levels:
+            total = max(level * 4, 32)
+            samples: List[float] = []
+            semaphore = asyncio.Semaphore(level)
+            
+            async def one():
+                async with semaphore:
+                    samples.append(await _timed(lambda: client.execute_query(query)))
+            
+            start = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(total)))
+            elapsed = time.perf_counter() - start
+            
+            results.append({
+                "concurrency": level,
+                "requests": total,
+                "throughput_rps": round(total / elapsed, 2),
+                "latency": percentiles(samples)
+            })
+    finally:
+        server.config.latency_ms = 0.0
+    return results
+
+
+async def measure_persisted_queries(server: StubGraphQLServer, schema_file: str, n_tables: int, repeats: int) -> Dict[str, Any]:
+    """Request size and latency of a generated depth-2 document with and without APQ."""
+    from tools.query_builder import build_document, find_root_field
+    
+    results = {}
+    for mode, enabled in (("apq", True), ("full", False)):
+        client = GraphQLClient(endpoint=server.url, schema_file=schema_file, persisted_queries=enabled)
+        index = await client._get_index()
+        op, field = find_root_field(index, table_names(n_tables)[0])
+        # Distinct per mode so the APQ run starts with a document the server hasn't seen
+        query = build_document(index, op, field, depth=2)["document"] + f"\n# {mode}"
+        
+        before = server.stats["request_bytes"], server.stats["requests"]
+        # The full execute-query path, as the tool runs a build-query document
+        first = await client.execute_query(query)
+        if first.startswith(("Error", "Warning:", "# GraphQL Query Error")):
+            raise RuntimeError(f"execute-query rejected a build-query document: {first.splitlines()[0]}")
+        samples = [await _timed(lambda: client.execute_query(query)) for _ in range(repeats - 1)]
+        sent_bytes = server.stats["request_bytes"] - before[0]
+        
+        results[mode] = {
+            "latency": percentiles(samples),
+            "document_bytes": len(query.encode()),
+            "requests_per_call": round((server.stats["requests"] - before[1]) / repeats, 2),
+            "request_bytes": round(sent_bytes / repeats)
+        }
+        await client.aclose()
+    return results
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    sizes = [int(s) for s in args.tables.split(",") if s]
+    levels = [int(s) for s in args.concurrency.split(",") if s]
+    results: Dict[str, Any] = {"meta": run_metadata(vars(args)), "schema_load": {}, "tools": {}}
+    
+    try:
+        import websockets  # noqa: F401
+        ws_stub = StubSubscriptionServer()
+    except ImportError:
+        print("websockets is not installed; skipping the subscription tools", file=sys.stderr)
+        ws_stub = nullcontext()
+    
+    with tempfile.TemporaryDirectory() as tmp, StubGraphQLServer(config=StubConfig(payload_bytes=1024)) as server, \
+            ws_stub as ws_server:
+        files = {n: write_schema_files(tmp, n) for n in sizes}
+        
+        print(f"cold start ({args.repeats} spawns)...", file=sys.stderr)
+        results["cold_start"] = measure_cold_start(files[sizes[0]]["json"], args.repeats)
+        results["startup"] = {
+            fmt: measure_startup(path, table_names(sizes[0])[0], args.repeats)
+            for fmt, path in files[sizes[0]].items()
+        }
+        
+        for n in sizes:
+            print(f"schema load + tools, {n} tables...", file=sys.stderr)
+            results["schema_load"][str(n)] = await measure_schema_load(files[n], server.url, args.repeats)
+            results["tools"][str(n)] = await measure_tools(
+                n, files[n]["json"], server.url, args.repeats, ws_server.http_url if ws_server else None
+            )
+        
+        print("persisted queries...", file=sys.stderr)
+        results["persisted_queries"] = await measure_persisted_queries(
+            server, files[sizes[0]]["json"], sizes[0], max(args.repeats, 10)
+        )
+        
+        print(f"concurrency {levels}...", file=sys.stderr)
+        results["concurrency"] = await measure_concurrency(
+            server, files[sizes[0]]["json"], levels, args.latency_ms, args.payload_bytes
+        )
+    
+    if args.resilience_requests:
+        print("resilience scenarios...", file=sys.stderr)
+        results["resilience"] = await measure_resilience(args.resilience_requests, 4)
+    
+    payload_sizes = [float(s) for s in args.payload_sizes_mb.split(",") if s]
+    if payload_sizes:
+        results["payloads"] = await measure_payloads(payload_sizes, args.repeats)
+    
+    try:
+        import resource
+        results["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        pass
+    
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the GraphQL MCP server tools")
+    parser.add_argument("--tables", default="10,100", help="Comma-separated schema sizes in tables (default: 10,100)")
+    parser.add_argument("--repeats", type=int, default=5, help="Iterations per measurement (default: 5)")
+    parser.add_argument("--concurrency", default="1,8,32,128", help="Concurrency levels for execute-query")
+    parser.add_argument("--resilience-requests", type=int, default=200, help="Requests per fault injection scenario (0 to skip)")
+    parser.add_argument("--payload-sizes-mb", default="1,10,50", help="Large response sizes to benchmark (empty to skip)")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Stub latency during the concurrency run")
+    parser.add_argument("--payload-bytes", type=int, default=4096, help="Stub payload size during the concurrency run")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/run-<rev>-<time>.json)")
+    args = parser.parse_args()
+    
+    results = asyncio.run(run(args))
+    print(write_results(results, args.output, "run"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""
+Synthetic Hasura-shaped schema generator.
+
+Produces introspection JSON and SDL for N tables, each with the type family
+Hasura generates per table (_bool_exp, _aggregate, _order_by, _insert_input, ...).
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+
+SCALARS = ["Boolean", "Float", "Int", "String", "numeric", "timestamptz", "uuid"]
+NUMERIC_SCALARS = {"Int", "Float", "numeric"}
+
+# Column types cycled through for the generated non-key columns
+COLUMN_TYPES = ["String", "Int", "Boolean", "numeric", "timestamptz", "String"]
+
+
+def _named(kind: str, name: str) -> Dict[str, Any]:
+    return {"kind": kind, "name": name, "ofType": None}
+
+
+def _non_null(type_ref: Dict[str, Any]) -> Dict[str, Any]:
+    return {"kind": "NON_NULL", "name": None, "ofType": type_ref}
+
+
+def _list(type_ref: Dict[str, Any]) -> Dict[str, Any]:
+    return {"kind": "LIST", "name": None, "ofType": type_ref}
+
+
+def _scalar(name: str) -> Dict[str, Any]:
+    return _named("SCALAR", name)
+
+
+def _obj(name: str) -> Dict[str, Any]:
+    return _named("OBJECT", name)
+
+
+def _input(name: str) -> Dict[str, Any]:
+    return _named("INPUT_OBJECT", name)
+
+
+def _enum(name: str) -> Dict[str, Any]:
+    return _named("ENUM", name)
+
+
+def _arg(name: str, type_ref: Dict[str, Any], description: Optional[str] = None, default: Optional[str] = None) -> Dict[str, Any]:
+    return {"name": name, "description": description, "type": type_ref, "defaultValue": default}
+
+
+def _field(name: str, type_ref: Dict[str, Any], args: Optional[List[Dict[str, Any]]] = None, description: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "description": description,
+        "args": args or [],
+        "type": type_ref,
+        "isDeprecated": False,
+        "deprecationReason": None
+    }
+
+
+def _object_type(name: str, fields: List[Dict[str, Any]], description: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "kind": "OBJECT",
+        "name": name,
+        "description": description,
+        "fields": fields,
+        "inputFields": None,
+        "interfaces": [],
+        "enumValues": None,
+        "possibleTypes": None
+    }
+
+
+def _input_type(name: str, input_fields: List[Dict[str, Any]], description: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "kind": "INPUT_OBJECT",
+        "name": name,
+        "description": description,
+        "fields": None,
+        "inputFields": input_fields,
+        "interfaces": None,
+        "enumValues": None,
+        "possibleTypes": None
+    }
+
+
+def _enum_type(name: str, values: List[Tuple[str, Optional[str]]], description: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "kind": "ENUM",
+        "name": name,
+        "description": description,
+        "fields": None,
+        "inputFields": None,
+        "interfaces": None,
+        "enumValues": [
+            {"name": value, "description": desc, "isDeprecated": False, "deprecationReason": None}
+            for value, desc in values
+        ],
+        "possibleTypes": None
+    }
+
+
+def _scalar_type(name: str) -> Dict[str, Any]:
+    return {
+        "kind": "SCALAR",
+        "name": name,
+        "description": None,
+        "fields": None,
+        "inputFields": None,
+        "interfaces": None,
+        "enumValues": None,
+        "possibleTypes": None
+    }
+
+
+def _comparison_exp(scalar: str) -> Dict[str, Any]:
+    """Build the <scalar>_comparison_exp input type."""
+    ref = _scalar(scalar)
+    list_ref = _list(_non_null(ref))
+    fields = [
+        _arg("_eq", ref),
+        _arg("_gt", ref),
+        _arg("_gte", ref),
+        _arg("_in", list_ref),
+        _arg("_is_null", _scalar("Boolean")),
+        _arg("_lt", ref),
+        _arg("_lte", ref),
+        _arg("_neq", ref),
+        _arg("_nin", list_ref),
+    ]
+    if scalar == "String":
+        fields.extend([_arg(op, ref) for op in ("_ilike", "_like", "_nilike", "_nlike", "_regex")])
+    return _input_type(f"{scalar}_comparison_exp", fields,
+                       f"Boolean expression to compare columns of type \"{scalar}\". All fields are combined with logical 'AND'.")
+
+
+def table_names(n_tables: int) -> List[str]:
+    """Deterministic table names for a schema of n_tables."""
+    return [f"entity_{i:04d}" for i in range(n_tables)]
+
+
+def _relations(n_tables: int, relations_per_table: int) -> Dict[int, List[int]]:
+    """Object relationships: table index -> list of referenced table indexes."""
+    relations: Dict[int, List[int]] = {}
+    if n_tables < 2:
+        return relations
+    for i in range(n_tables):
+        targets = []
+        for r in range(relations_per_table):
+            j = (i * 7 + r * 13 + 1) % n_tables
+            if j != i and j not in targets:
+                targets.append(j)
+        relations[i] = targets
+    return relations
+
+
+def _table_args(table: str) -> List[Dict[str, Any]]:
+    """Arguments of list/aggregate root fields and array relationships."""
+    return [
+        _arg("distinct_on", _list(_non_null(_enum(f"{table}_select_column"))), "distinct select on columns"),
+        _arg("limit", _scalar("Int"), "limit the number of rows returned"),
+        _arg("offset", _scalar("Int"), "skip the first n rows. Use only with order_by"),
+        _arg("order_by", _list(_non_null(_input(f"{table}_order_by"))), "sort the rows by one or more columns"),
+        _arg("where", _input(f"{table}_bool_exp"), "filter the rows returned"),
+    ]
+
+
+def generate_introspection(n_tables: int = 50, columns_per_table: int = 8, relations_per_table: int = 2) -> Dict[str, Any]:
+    """Generate a Hasura-shaped `__schema` introspection result."""
+    names = table_names(n_tables)
+    relations = _relations(n_tables, relations_per_table)
+    incoming: Dict[int, List[int]] = {i: [] for i in range(n_tables)}
+    for source, targets in relations.items():
+        for target in targets:
+            incoming[target].append(source)
+    
+    types: List[Dict[str, Any]] = [_scalar_type(s) for s in SCALARS]
+    types.extend(_comparison_exp(s) for s in SCALARS)
+    types.append(_enum_type("order_by", [
+        ("asc", "in ascending order, nulls last"),
+        ("asc_nulls_first", "in ascending order, nulls first"),
+        ("asc_nulls_last", "in ascending order, nulls last"),
+        ("desc", "in descending order, nulls first"),
+        ("desc_nulls_first", "in descending order, nulls first"),
+        ("desc_nulls_last", "in descending order, nulls last"),
+    ], "column ordering options"))
+    types.append(_enum_type("cursor_ordering", [
+        ("ASC", "ascending ordering of the cursor"),
+        ("DESC", "descending ordering of the cursor"),
+    ], "ordering argument of a cursor"))
+    
+    query_fields: List[Dict[str, Any]] = []
+    mutation_fields: List[Dict[str, Any]] = []
+    subscription_fields: List[Dict[str, Any]] = []
+    
+    for i, table in enumerate(names):
+        # Columns: primary key, timestamps, foreign keys and generic data columns
+        columns: List[Tuple[str, str, bool]] = [("id", "uuid", True), ("created_at", "timestamptz", True)]
+        for target in relations.get(i, []):
+            columns.append((f"{names[target]}_id", "uuid", True))
+        for c in range(columns_per_table):
+            columns.append((f"col_{c:02d}", COLUMN_TYPES[c % len(COLUMN_TYPES)], c % 3 == 0))
+        numeric_columns = [(name, scalar) for name, scalar, _ in columns if scalar in NUMERIC_SCALARS]
+        comparable_columns = [(name, scalar) for name, scalar, _ in columns if scalar != "Boolean"]
+        
+        # Row type
+        row_fields = []
+        for name, scalar, required in columns:
+            ref = _scalar(scalar)
+            row_fields.append(_field(name, _non_null(ref) if required else ref))
+        for target in relations.get(i, []):
+            row_fields.append(_field(names[target], _non_null(_obj(names[target])), description="An object relationship"))
+        for source in incoming[i]:
+            rel = f"{names[source]}s"
+            row_fields.append(_field(rel, _non_null(_list(_non_null(_obj(names[source])))), _table_args(names[source]), "An array relationship"))
+            row_fields.append(_field(f"{rel}_aggregate", _non_null(_obj(f"{names[source]}_aggregate")), _table_args(names[source]), "An aggregate relationship"))
+        types.append(_object_type(table, row_fields, f"columns and relationships of \"{table}\""))
+        
+        # Aggregate family
+        types.append(_object_type(f"{table}_aggregate", [
+            _field("aggregate", _obj(f"{table}_aggregate_fields")),
+            _field("nodes", _non_null(_list(_non_null(_obj(table))))),
+        ], f"aggregated selection of \"{table}\""))
+        aggregate_fields = [
+            _field("count", _non_null(_scalar("Int")), [
+                _arg("columns", _list(_non_null(_enum(f"{table}_select_column")))),
+                _arg("distinct", _scalar("Boolean")),
+            ]),
+            _field("max", _obj(f"{table}_max_fields")),
+            _field("min", _obj(f"{table}_min_fields")),
+        ]
+        types.append(_object_type(f"{table}_max_fields", [_field(n, _scalar(s)) for n, s in comparable_columns], "aggregate max on columns"))
+        types.append(_object_type(f"{table}_min_fields", [_field(n, _scalar(s)) for n, s in comparable_columns], "aggregate min on columns"))
+        if numeric_columns:
+            for fn, result_scalar in (("avg", "Float"), ("stddev", "Float"), ("sum", None), ("variance", "Float")):
+                types.append(_object_type(f"{table}_{fn}_fields", [
+                    _field(n, _scalar(result_scalar or s)) for n, s in numeric_columns
+                ], f"aggregate {fn} on columns"))
+                aggregate_fields.append(_field(fn, _obj(f"{table}_{fn}_fields")))
+        aggregate_fields.sort(key=lambda f: f["name"])
+        types.append(_object_type(f"{table}_aggregate_fields", aggregate_fields, f"aggregate fields of \"{table}\""))
+        
+        # Filter / ordering inputs
+        bool_exp_fields = [
+            _arg("_and", _list(_non_null(_input(f"{table}_bool_exp")))),
+            _arg("_not", _input(f"{table}_bool_exp")),
+            _arg("_or", _list(_non_null(_input(f"{table}_bool_exp")))),
+        ]
+        bool_exp_fields.extend(_arg(n, _input(f"{s}_comparison_exp")) for n, s, _ in columns)
+        bool_exp_fields.extend(_arg(names[t], _input(f"{names[t]}_bool_exp")) for t in relations.get(i, []))
+        types.append(_input_type(f"{table}_bool_exp", bool_exp_fields,
+                                 f"Boolean expression to filter rows from the table \"{table}\". All fields are combined with a logical 'AND'."))
+        order_fields = [_arg(n, _enum("order_by")) for n, _, _ in columns]
+        order_fields.extend(_arg(names[t], _input(f"{names[t]}_order_by")) for t in relations.get(i, []))
+        types.append(_input_type(f"{table}_order_by", order_fields, f"Ordering options when selecting data from \"{table}\"."))
+        
+        # Mutation inputs
+        types.append(_input_type(f"{table}_insert_input", [_arg(n, _scalar(s)) for n, s, _ in columns],
+                                 f"input type for inserting data into table \"{table}\""))
+        types.append(_input_type(f"{table}_set_input", [_arg(n, _scalar(s)) for n, s, _ in columns],
+                                 f"input type for updating data in table \"{table}\""))
+        if numeric_columns:
+            types.append(_input_type(f"{table}_inc_input", [_arg(n, _scalar(s)) for n, s in numeric_columns],
+                                     "input type for incrementing numeric columns in table"))
+        types.append(_input_type(f"{table}_pk_columns_input", [_arg("id", _non_null(_scalar("uuid")))],
+                                 f"primary key columns input for table: {table}"))
+        types.append(_input_type(f"{table}_on_conflict", [
+            _arg("constraint", _non_null(_enum(f"{table}_constraint"))),
+            _arg("update_columns", _non_null(_list(_non_null(_enum(f"{table}_update_column")))), default="[]"),
+            _arg("where", _input(f"{table}_bool_exp")),
+        ], f"on_conflict condition type for table \"{table}\""))
+        updates_fields = [_arg("_set", _input(f"{table}_set_input")), _arg("where", _non_null(_input(f"{table}_bool_exp")))]
+        if numeric_columns:
+            updates_fields.insert(0, _arg("_inc", _input(f"{table}_inc_input")))
+        types.append(_input_type(f"{table}_updates", updates_fields))
+        types.append(_input_type(f"{table}_stream_cursor_input", [
+            _arg("initial_value", _non_null(_input(f"{table}_stream_cursor_value_input"))),
+            _arg("ordering", _enum("cursor_ordering")),
+        ], f"Streaming cursor of the table \"{table}\""))
+        types.append(_input_type(f"{table}_stream_cursor_value_input", [_arg(n, _scalar(s)) for n, s, _ in columns],
+                                 "Initial value of the column from where the streaming should start"))
+        types.append(_object_type(f"{table}_mutation_response", [
+            _field("affected_rows", _non_null(_scalar("Int")), description="number of rows affected by the mutation"),
+            _field("returning", _non_null(_list(_non_null(_obj(table)))), description="data from the rows affected by the mutation"),
+        ], f"response of any mutation on the table \"{table}\""))
+        
+        # Enums
+        column_values = [(n, "column name") for n, _, _ in columns]
+        types.append(_enum_type(f"{table}_select_column", column_values, f"select columns of table \"{table}\""))
+        types.append(_enum_type(f"{table}_update_column", column_values, f"update columns of table \"{table}\""))
+        types.append(_enum_type(f"{table}_constraint", [(f"{table}_pkey", "unique or primary key constraint on columns \"id\"")],
+                                f"unique or primary key constraints on table \"{table}\""))
+        
+        # Root fields
+        list_ref = _non_null(_list(_non_null(_obj(table))))
+        aggregate_ref = _non_null(_obj(f"{table}_aggregate"))
+        pk_args = [_arg("id", _non_null(_scalar("uuid")))]
+        query_fields.extend([
+            _field(table, list_ref, _table_args(table), f"fetch data from the table: \"{table}\""),
+            _field(f"{table}_aggregate", aggregate_ref, _table_args(table), f"fetch aggregated fields from the table: \"{table}\""),
+            _field(f"{table}_by_pk", _obj(table), pk_args, f"fetch data from the table: \"{table}\" using primary key columns"),
+        ])
+        subscription_fields.extend([
+            _field(table, list_ref, _table_args(table), f"fetch data from the table: \"{table}\""),
+            _field(f"{table}_aggregate", aggregate_ref, _table_args(table), f"fetch aggregated fields from the table: \"{table}\""),
+            _field(f"{table}_by_pk", _obj(table), pk_args, f"fetch data from the table: \"{table}\" using primary key columns"),
+            _field(f"{table}_stream", list_ref, [
+                _arg("batch_size", _non_null(_scalar("Int")), "maximum number of rows returned in a single batch"),
+                _arg("cursor", _non_null(_list(_input(f"{table}_stream_cursor_input"))), "cursor to stream the results returned by the query"),
+                _arg("where", _input(f"{table}_bool_exp"), "filter the rows returned"),
+            ], f"fetch data from the table in a streaming manner: \"{table}\""),
+        ])
+        response_ref = _obj(f"{table}_mutation_response")
+        set_args = [_arg("_set", _input(f"{table}_set_input"), "sets the columns of the filtered rows to the given values")]
+        if numeric_columns:
+            set_args.insert(0, _arg("_inc", _input(f"{table}_inc_input"), "increments the numeric columns with given value of the filtered values"))
+        mutation_fields.extend([
+            _field(f"delete_{table}", response_ref, [_arg("where", _non_null(_input(f"{table}_bool_exp")), "filter the rows which have to be deleted")],
+                   f"delete data from the table: \"{table}\""),
+            _field(f"delete_{table}_by_pk", _obj(table), pk_args, f"delete single row from the table: \"{table}\""),
+            _field(f"insert_{table}", response_ref, [
+                _arg("objects", _non_null(_list(_non_null(_input(f"{table}_insert_input")))), "the rows to be inserted"),
+                _arg("on_conflict", _input(f"{table}_on_conflict"), "upsert condition"),
+            ], f"insert data into the table: \"{table}\""),
+            _field(f"insert_{table}_one", _obj(table), [
+                _arg("object", _non_null(_input(f"{table}_insert_input")), "the row to be inserted"),
+                _arg("on_conflict", _input(f"{table}_on_conflict"), "upsert condition"),
+            ], f"insert a single row into the table: \"{table}\""),
+            _field(f"update_{table}", response_ref, set_args + [
+                _arg("where", _non_null(_input(f"{table}_bool_exp")), "filter the rows which have to be updated"),
+            ], f"update data of the table: \"{table}\""),
+            _field(f"update_{table}_by_pk", _obj(table), set_args + [
+                _arg("pk_columns", _non_null(_input(f"{table}_pk_columns_input"))),
+            ], f"update single row of the table: \"{table}\""),
+            _field(f"update_{table}_many", _list(response_ref), [
+                _arg("updates", _non_null(_list(_non_null(_input(f"{table}_updates")))), "updates to execute, in order"),
+            ], f"update multiples rows of table: \"{table}\""),
+        ])
+    
+    types.append(_object_type("query_root", query_fields))
+    types.append(_object_type("mutation_root", mutation_fields))
+    types.append(_object_type("subscription_root", subscription_fields))
+    types.sort(key=lambda t: t["name"])
+    
+    return {
+        "queryType": {"name": "query_root"},
+        "mutationType": {"name": "mutation_root"},
+        "subscriptionType": {"name": "subscription_root"},
+        "types": types,
+        "directives": []
+    }
+
+
+def generate_sdl(introspection: Dict[str, Any]) -> str:
+    """Render an introspection result as SDL (requires graphql-core)."""
+    from graphql import build_client_schema, print_schema
+    
+    return print_schema(build_client_schema({"__schema": introspection}))
+
+
+def write_schema_files(directory: str, n_tables: int, columns_per_table: int = 8, relations_per_table: int = 2) -> Dict[str, str]:
+    """Write introspection.json and schema.graphql for a schema of n_tables; returns their paths."""
+    os.makedirs(directory, exist_ok=True)
+    introspection = generate_introspection(n_tables, columns_per_table, relations_per_table)
+    
+    json_path = os.path.join(directory, f"introspection_{n_tables}.json")
+    with open(json_path, "w") as f:
+        json.dump({"data": {"__schema": introspection}}, f)
+    
+    sdl_path = os.path.join(directory, f"schema_{n_tables}.graphql")
+    with open(sdl_path, "w") as f:
+        f.write(generate_sdl(introspection))
+    
+    return {"json": json_path, "sdl": sdl_path}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Hasura-shaped GraphQL schemas")
+    parser.add_argument("--tables", type=int, default=50, help="Number of tables (default: 50)")
+    parser.add_argument("--columns", type=int, default=8, help="Data columns per table (default: 8)")
+    parser.add_argument("--relations", type=int, default=2, help="Object relationships per table (default: 2)")
+    parser.add_argument("--out", default="benchmarks/schemas", help="Output directory")
+    args = parser.parse_args()
+    
+    paths = write_schema_files(args.out, args.tables, args.columns, args.relations)
+    for kind, path in paths.items():
+        print(f"{kind}: {path} ({os.path.getsize(path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Stdio startup benchmark.
+
+Spawns `python src/main.py` the way an MCP host does and measures, from spawn:
+- time to the first `tools/list` response
+- time to the first schema-backed tool result (`get-type-info`)
+
+Usage (from MCPs/graphql):
+    python -m benchmarks.startup --schema-file benchmarks/schemas/introspection_50.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from .common import SRC_DIR, percentiles, run_metadata, write_results
+
+
+PROTOCOL_VERSION = "2024-11-05"
+
+
+class StdioSession:
+    """Minimal newline-delimited JSON-RPC client for an MCP server subprocess."""
+    
+    def __init__(self, env: Dict[str, str]):
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.join(SRC_DIR, "main.py")],
+            cwd=SRC_DIR,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self._next_id = 0
+    
+    def _send(self, message: Dict[str, Any]):
+        self.process.stdin.write((json.dumps(message) + "\n").encode())
+        self.process.stdin.flush()
+    
+    def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        self._next_id += 1
+        request_id = self._next_id
+        self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}})
+        while True:
+            line = self.process.stdout.readline()
+            if not line:
+                raise RuntimeError(f"Server exited before answering {method}")
+            message = json.loads(line)
+            if message.get("id") == request_id:
+                if "error" in message:
+                    raise RuntimeError(f"{method} failed: {message['error']}")
+                return message["result"]
+    
+    def notify(self, method: str, params: Optional[Dict[str, Any]] = None):
+        self._send({"jsonrpc": "2.0", "method": method, "params": params or {}})
+    
+    def close(self):
+        self.process.stdin.close()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def measure_once(env: Dict[str, str], type_name: str) -> Dict[str, float]:
+    start = time.perf_counter()
+    session = StdioSession(env)
+    try:
+        session.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "startup-benchmark", "version": "0"}
+        })
+        initialized = time.perf_counter()
+        session.notify("notifications/initialized")
+        
+        session.request("tools/list")
+        listed = time.perf_counter()
+        
+        result = session.request("tools/call", {"name": "get-type-info", "arguments": {"type_name": type_name}})
+        called = time.perf_counter()
+        if result.get("isError"):
+            raise RuntimeError(f"get-type-info failed: {result}")
+    finally:
+        session.close()
+    
+    return {
+        "initialize_ms": (initialized - start) * 1000,
+        "first_list_tools_ms": (listed - start) * 1000,
+        "first_schema_tool_ms": (called - start) * 1000
+    }
+
+
+def measure_startup(schema_file: str, type_name: str, repeats: int) -> Dict[str, Any]:
+    """Spawn-to-response timings over several fresh server processes."""
+    env = dict(os.environ, GRAPHQL_SCHEMA_FILE=schema_file, GRAPHQL_ENDPOINT="http://127.0.0.1:9/v1/graphql")
+    samples: Dict[str, List[float]] = {}
+    for _ in range(repeats):
+        for key, value in measure_once(env, type_name).items():
+            samples.setdefault(key, []).append(value)
+    return {key: percentiles(values) for key, values in samples.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure MCP stdio server startup")
+    parser.add_argument("--schema-file", required=True, help="Schema file the server should load")
+    parser.add_argument("--type-name", default="query_root", help="Type passed to get-type-info (default: query_root)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/startup-<rev>-<time>.json)")
+    args = parser.parse_args()
+    
+    results = {"meta": run_metadata(vars(args)), "startup": measure_startup(args.schema_file, args.type_name, args.repeats)}
+    print(write_results(results, args.output, "startup"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+"""
+Local stub GraphQL HTTP server for benchmarks.
+
+Answers introspection queries from a configured schema and every other operation
+with a synthetic payload of configurable size, after a configurable latency.
+Supports automatic persisted queries (hash-only requests), which can be turned off
+to emulate a server without APQ, gzip request bodies and gzip/br response
+compression negotiated via Accept-Encoding. Faults can be injected per request:
+HTTP errors, dropped connections and slow (tail latency) responses. A capacity
+emulates the upstream database pool: requests beyond it queue, and each one in
+flight above it slows every request down. POSTs to .../explain get canned
+Hasura-style query plans, one per root field. Mutations answer affected_rows for
+the rows in their list variable, taking extra time per row, and bodies above a
+size limit are rejected with 413 like a proxy in front of Hasura would.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class StubConfig:
+    """Mutable stub behaviour; may be changed while the server is running."""
+    
+    def __init__(self, latency_ms: float = 0.0, latency_jitter_ms: float = 0.0, payload_bytes: int = 1024,
+                 schema: Optional[Dict[str, Any]] = None, persisted_queries: bool = True, compression: bool = True):
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.payload_bytes = payload_bytes
+        self.persisted_queries = persisted_queries
+        # Without persisted_queries: answer hash-only requests like a server that ignores the extension
+        # (a 200 with a generic missing-query error, as graphql-http servers send) instead of
+        # PersistedQueryNotSupported
+        self.apq_ignored = False
+        self.compression = compression
+        # Fault injection: each request independently rolls for a drop, an error status or a slow response
+        self.error_rate = 0.0
+        self.error_status = 503
+        self.drop_rate = 0.0
+        self.slow_rate = 0.0
+        self.slow_latency_ms = 0.0
+        # Upstream pool emulation: 0 = unlimited; penalty = extra latency fraction per request over capacity
+        self.capacity = 0
+        self.overload_penalty = 0.0
+        # Mutations: extra latency per row in the list variable; bodies above max_request_bytes get 413 (0 = no limit)
+        self.row_latency_ms = 0.0
+        self.max_request_bytes = 0
+        # Canned explain plans by root field; others get DEFAULT_EXPLAIN_PLAN
+        self.explain_plans: Dict[str, List[str]] = {}
+        # Custom answers: called with each GraphQL request, returns the response body or None for the default
+        self.responder: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None
+        self.schema = schema or {"queryType": {"name": "query_root"}, "mutationType": None, "subscriptionType": None, "types": [], "directives": []}
+
+
+# A sequential scan filtering on created_at, formatted like Postgres text EXPLAIN output
+DEFAULT_EXPLAIN_PLAN = [
+    "Aggregate  (cost=2289.11..2289.12 rows=1 width=32)",
+    "  ->  Seq Scan on public.{table}  (cost=0.00..2164.00 rows=50044 width=64)",
+    "        Filter: ({table}.created_at >= '2024-01-01 00:00:00+00'::timestamp with time zone)"
+]
+
+
+def root_fields(query: str) -> List[str]:
+    """Response keys (alias or name) of the first operation's root selections; enough for stub plans."""
+    start = query.find("{")
+    if start < 0:
+        return []
+    fields, depth, parens, previous, aliased = [], 0, 0, None, False
+    for token in re.findall(r"[A-Za-z_]\w*|[{}():]|\S", query[start:]):
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+            if depth == 0:
+                break
+        elif token == "(":
+            parens += 1
+        elif token == ")":
+            parens -= 1
+        elif depth == 1 and not parens:
+            if token == ":" and fields and previous == fields[-1]:
+                # `alias: field` - the alias is the response key
+                aliased = True
+            elif token[0].isalpha() or token[0] == "_":
+                if aliased:
+                    aliased = False
+                else:
+                    fields.append(token)
+        previous = token
+    return fields
+
+
+def mutation_rows(request: Dict[str, Any]) -> List[Any]:
+    """The first list variable of a request (a bulk mutation's objects/updates), else []."""
+    for value in (request.get("variables") or {}).values():
+        if isinstance(value, list):
+            return value
+    return []
+
+
+def build_payload(payload_bytes: int) -> Dict[str, Any]:
+    """Build a `data` object whose JSON encoding is roughly payload_bytes long."""
+    row = {"id": "00000000-0000-0000-0000-000000000000", "name": "x" * 64, "count": 0, "active": True}
+    row_size = len(json.dumps(row)) + 2
+    rows = max(1, payload_bytes // row_size)
+    return {"items": [dict(row, count=i) for i in range(rows)]}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler; the owning server exposes `config` and `stats`."""
+    
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY keep-alive
+    # requests stall on delayed ACKs (~40ms each)
+    disable_nagle_algorithm = True
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _send_json(self, status: int, body: bytes):
+        encoding = None
+        if self.server.config.compression:
+            encoding, body = self.server.compress(body, self.headers.get("Accept-Encoding", ""))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _sleep(self, rows: int = 0):
+        config = self.server.config
+        delay = config.latency_ms + rows * config.row_latency_ms
+        if config.latency_jitter_ms:
+            delay += random.uniform(0, config.latency_jitter_ms)
+        if config.slow_rate and random.random() < config.slow_rate:
+            self.server.count("slow")
+            delay += config.slow_latency_ms
+        if config.capacity and config.overload_penalty:
+            delay *= 1 + config.overload_penalty * max(0, self.server.in_flight - config.capacity)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+    
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", "0"))
+        raw = self.rfile.read(length)
+        self.server.record_request(len(raw))
+        if self.server.config.max_request_bytes and length > self.server.config.max_request_bytes:
+            self.server.count("too_large")
+            self._send_json(413, b'{"errors": [{"message": "request entity too large"}]}')
+            return
+        
+        try:
+            if self.headers.get("Content-Encoding") == "gzip":
+                raw = gzip.decompress(raw)
+            request = json.loads(raw)
+        except (ValueError, OSError):
+            self._send_json(400, b'{"errors": [{"message": "invalid JSON body"}]}')
+            return
+        
+        if self.path.endswith("/explain"):
+            self._send_json(200, self.server.explain(request))
+            return
+        
+        config = self.server.config
+        if config.drop_rate and random.random() < config.drop_rate:
+            # Close without answering; the client sees a transport error
+            self.server.count("dropped")
+            self.close_connection = True
+            return
+        
+        with self.server.upstream_slot():
+            self._sleep(len(mutation_rows(request)))
+        if config.error_rate and random.random() < config.error_rate:
+            self.server.count("errors")
+            self._send_json(config.error_status, b'{"errors": [{"message": "injected failure"}]}')
+            return
+        self._send_json(200, self.server.respond(request))
+
+
+class StubGraphQLServer(ThreadingHTTPServer):
+    """Threaded stub server; use as a context manager or call start()/stop()."""
+    
+    daemon_threads = True
+    # Load tests open hundreds of connections at once
+    request_queue_size = 1024
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[StubConfig] = None):
+        super().__init__((host, port), StubHandler)
+        self.config = config or StubConfig()
+        self.stats = {"requests": 0, "request_bytes": 0, "apq_hits": 0, "apq_misses": 0, "apq_registered": 0,
+                      "errors": 0, "dropped": 0, "slow": 0, "max_in_flight": 0, "explains": 0,
+                      "too_large": 0, "mutation_rows": 0}
+        self.in_flight = 0
+        self._busy = 0
+        self._capacity_lock = threading.Condition()
+        self._stats_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._payload_cache: Dict[int, bytes] = {}
+        self._persisted: Dict[str, str] = {}
+        self._compressed: Dict[Tuple[bytes, str], bytes] = {}
+    
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1/graphql"
+    
+    def handle_error(self, request, client_address):
+        # Clients abandon hedged and timed-out requests mid-response
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+    
+    def record_request(self, size: int):
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["request_bytes"] += size
+    
+    def compress(self, body: bytes, accept_encoding: str) -> Tuple[Optional[str], bytes]:
+        """Compress a response body with the best encoding the client accepts (cached per body)."""
+        accepted = {part.split(";")[0].strip() for part in accept_encoding.split(",")}
+        encoding = None
+        if "br" in accepted:
+            try:
+                import brotli
+                encoding = "br"
+            except ImportError:
+                pass
+        if encoding is None and "gzip" in accepted:
+            encoding = "gzip"
+        if encoding is None or len(body) < 1024:
+            return None, body
+        
+        key = (body, encoding)
+        compressed = self._compressed.get(key)
+        if compressed is None:
+            if encoding == "br":
+                compressed = brotli.compress(body, quality=4)
+            else:
+                compressed = gzip.compress(body, compresslevel=5)
+            if len(self._compressed) >= 8:
+                self._compressed.clear()
+            self._compressed[key] = compressed
+        return encoding, compressed
+    
+    @contextmanager
+    def upstream_slot(self):
+        """Track in-flight requests and, with a capacity set, queue those beyond it."""
+        with self._capacity_lock:
+            self.in_flight += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.in_flight)
+            while self.config.capacity and self._busy >= self.config.capacity:
+                self._capacity_lock.wait()
+            self._busy += 1
+        try:
+            yield
+        finally:
+            with self._capacity_lock:
+                self.in_flight -= 1
+                self._busy -= 1
+                self._capacity_lock.notify()
+    
+    def count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+    
+    def _error(self, message: str, code: str) -> bytes:
+        return json.dumps({"errors": [{"message": message, "extensions": {"code": code}}]}).encode()
+    
+    def explain(self, request: Dict[str, Any]) -> bytes:
+        """Hasura explain API response: generated SQL and a plan per root field."""
+        self.count("explains")
+        query = (request.get("query") or {}).get("query") or ""
+        entries = []
+        for field in root_fields(query):
+            plan = self.config.explain_plans.get(field) or [line.format(table=field) for line in DEFAULT_EXPLAIN_PLAN]
+            entries.append({"field": field, "sql": f'SELECT json_agg("root") FROM "public"."{field}" AS "root"', "plan": plan})
+        return json.dumps(entries).encode()
+    
+    def respond(self, request: Dict[str, Any]) -> bytes:
+        """Encode the response body for a GraphQL request."""
+        query = request.get("query") or ""
+        
+        persisted = (request.get("extensions") or {}).get("persistedQuery")
+        if persisted and not self.config.persisted_queries:
+            if not self.config.apq_ignored:
+                return self._error("PersistedQueryNotSupported", "PERSISTED_QUERY_NOT_SUPPORTED")
+            if not query:
+                return self._error("Must provide query string.", "BAD_REQUEST")
+        elif persisted:
+            sha256 = persisted.get("sha256Hash", "")
+            if query:
+                if hashlib.sha256(query.encode()).hexdigest() != sha256:
+                    return self._error("provided sha does not match query", "INTERNAL_SERVER_ERROR")
+                self._persisted[sha256] = query
+                self.count("apq_registered")
+            else:
+                query = self._persisted.get(sha256)
+                if query is None:
+                    self.count("apq_misses")
+                    return self._error("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+                self.count("apq_hits")
+        
+        if "__schema" in query:
+            return json.dumps({"data": {"__schema": self.config.schema}}).encode()
+        
+        if self.config.responder:
+            answer = self.config.responder(dict(request, query=query))
+            if answer is not None:
+                return json.dumps(answer).encode()
+        
+        if query.lstrip().startswith("mutation"):
+            rows = len(mutation_rows(request))
+            with self._stats_lock:
+                self.stats["mutation_rows"] += rows
+            # update_*_many answers one response per update, the others one for all rows
+            data = {
+                field: [{"affected_rows": 1}] * rows if field.endswith("_many") else {"affected_rows": rows}
+                for field in root_fields(query)
+            }
+            return json.dumps({"data": data}).encode()
+        
+        size = self.config.payload_bytes
+        body = self._payload_cache.get(size)
+        if body is None:
+            body = json.dumps({"data": build_payload(size)}).encode()
+            self._payload_cache[size] = body
+        return body
+    
+    def start(self) -> "StubGraphQLServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+    
+    def __enter__(self) -> "StubGraphQLServer":
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stub GraphQL server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed latency per request")
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0, help="Uniform random extra latency")
+    parser.add_argument("--payload-bytes", type=int, default=1024, help="Approximate size of non-introspection responses")
+    parser.add_argument("--schema-file", help="Introspection JSON to serve for introspection queries")
+    parser.add_argument("--no-persisted-queries", action="store_true", help="Reject hash-only (APQ) requests")
+    parser.add_argument("--apq-ignored", action="store_true",
+                        help="With --no-persisted-queries, answer hash-only requests with a generic error")
+    parser.add_argument("--no-compression", action="store_true", help="Ignore Accept-Encoding and send uncompressed responses")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Fraction of requests whose connection is closed unanswered")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of requests delayed by --slow-latency-ms")
+    parser.add_argument("--slow-latency-ms", type=float, default=0.0)
+    parser.add_argument("--capacity", type=int, default=0, help="Concurrent requests served before queueing (0 = unlimited)")
+    parser.add_argument("--overload-penalty", type=float, default=0.0,
+                        help="Extra latency fraction per in-flight request above --capacity")
+    parser.add_argument("--row-latency-ms", type=float, default=0.0, help="Extra mutation latency per row in its list variable")
+    parser.add_argument("--max-request-bytes", type=int, default=0, help="Reject larger request bodies with 413 (0 = no limit)")
+    args = parser.parse_args()
+    
+    schema = None
+    if args.schema_file:
+        with open(args.schema_file) as f:
+            schema = json.load(f)["data"]["__schema"]
+    
+    config = StubConfig(args.latency_ms, args.latency_jitter_ms, args.payload_bytes, schema,
+                        not args.no_persisted_queries, not args.no_compression)
+    config.apq_ignored = args.apq_ignored
+    config.error_rate = args.error_rate
+    config.error_status = args.error_status
+    config.drop_rate = args.drop_rate
+    config.slow_rate = args.slow_rate
+    config.slow_latency_ms = args.slow_latency_ms
+    config.capacity = args.capacity
+    config.overload_penalty = args.overload_penalty
+    config.row_latency_ms = args.row_latency_ms
+    config.max_request_bytes = args.max_request_bytes
+    server = StubGraphQLServer(args.host, args.port, config)
+    print(f"Stub GraphQL server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Subscription buffering benchmark.
+
+Several subscriptions share the client's websocket to the stub subscription server
+while a consumer drains each one by cursor at a fixed poll interval:
+- drain: the consumer keeps up; every event arrives, lag is the poll interval
+- slow_drop / slow_block: the consumer reads fewer events than arrive, with a small
+  buffer that drops the oldest events vs one that stops reading the socket
+
+Reports events sent and delivered, dropped events, the buffer high-water mark,
+delivery lag (server send time to poll) and websocket connections opened.
+
+Usage (from MCPs/graphql):
+    python -m benchmarks.subscriptions --subscriptions 8 --interval-ms 5
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any, Dict, List
+
+from .common import ensure_src_on_path, percentiles, run_metadata, write_results
+from .ws_stub import StubSubscriptionConfig, StubSubscriptionServer
+
+ensure_src_on_path()
+
+from graphql_client import GraphQLClient  # noqa: E402
+
+
+QUERY = "subscription Events { events { seq sent_at row } }"
+
+
+async def _scenario(subscriptions: int, interval_ms: float, duration: float, poll_ms: float, max_events: int,
+                    buffer_size: int, overflow: str) -> Dict[str, Any]:
+    config = StubSubscriptionConfig(interval_ms=interval_ms)
+    with StubSubscriptionServer(config=config) as server:
+        client = GraphQLClient(endpoint=server.http_url)
+        manager = client._get_subscriptions()
+        lag: List[float] = []
+        delivered = 0
+        out_of_order = 0
+        high_water = 0
+        try:
+            active = [await manager.subscribe(QUERY, buffer_size=buffer_size, overflow=overflow) for _ in range(subscriptions)]
+            cursors = {subscription.id: 0 for subscription in active}
+            last_seq = {subscription.id: -1 for subscription in active}
+            stop_at = time.perf_counter() + duration
+            while time.perf_counter() < stop_at:
+                await asyncio.sleep(poll_ms / 1000.0)
+                now = time.time()
+                for subscription in active:
+                    high_water = max(high_water, len(subscription.ring))
+                    events, cursors[subscription.id], _ = subscription.ring.read(cursors[subscription.id], max_events)
+                    for _, _, payload in events:
+                        row = payload["data"]["events"][0]
+                        lag.append((now - row["sent_at"]) * 1000)
+                        if row["seq"] <= last_seq[subscription.id]:
+                            out_of_order += 1
+                        last_seq[subscription.id] = row["seq"]
+                    delivered += len(events)
+            
+            dropped = sum(subscription.ring.dropped for subscription in active)
+            for subscription in active:
+                await manager.unsubscribe(subscription.id)
+        finally:
+            await client.aclose()
+        
+        return {
+            "events_sent": server.stats["events_sent"],
+            "delivered": delivered,
+            "dropped": dropped,
+            "out_of_order": out_of_order,
+            "buffer_high_water": high_water,
+            "delivery_lag": percentiles(lag),
+            "websocket_connections": server.stats["connections"]
+        }
+
+
+async def measure_subscriptions(subscriptions: int, interval_ms: float, duration: float, poll_ms: float) -> Dict[str, Any]:
+    # A slow consumer reads a tenth of what arrives per poll
+    arrivals_per_poll = max(1, int(poll_ms / interval_ms))
+    slow_reads = max(1, arrivals_per_poll // 10)
+    results: Dict[str, Any] = {}
+    print("consumer keeps up...", file=sys.stderr)
+    results["drain"] = await _scenario(subscriptions, interval_ms, duration, poll_ms, 1000, 1000, "drop_oldest")
+    print("slow consumer, drop oldest...", file=sys.stderr)
+    results["slow_drop"] = await _scenario(subscriptions, interval_ms, duration, poll_ms, slow_reads, 50, "drop_oldest")
+    print("slow consumer, block...", file=sys.stderr)
+    results["slow_block"] = await _scenario(subscriptions, interval_ms, duration, poll_ms, slow_reads, 50, "block")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark subscription buffering and draining")
+    parser.add_argument("--subscriptions", type=int, default=8, help="Subscriptions sharing the websocket")
+    parser.add_argument("--interval-ms", type=float, default=5.0, help="Time between events per subscription")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per scenario")
+    parser.add_argument("--poll-ms", type=float, default=100.0, help="Consumer poll interval")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/subscriptions-<rev>-<time>.json)")
+    args = parser.parse_args()
+    
+    results = {
+        "meta": run_metadata(vars(args)),
+        "subscriptions": asyncio.run(measure_subscriptions(args.subscriptions, args.interval_ms, args.duration, args.poll_ms))
+    }
+    print(write_results(results, args.output, "subscriptions"))
+
+
+if __name__ == "__main__":
+    main()
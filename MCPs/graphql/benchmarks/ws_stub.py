@@ -0,0 +1,171 @@
+"""
+Local stub graphql-transport-ws server for subscription benchmarks.
+
+Acknowledges connection_init, answers pings and, for every subscribe, sends `next`
+events at a fixed interval (optionally a limited number, then `complete`). Each
+event's payload carries a sequence number and the server's send time so clients
+can check ordering, gaps and delivery lag. Runs its own event loop in a thread.
+
+Needs the websockets package.
+
+Usage (from MCPs/graphql):
+    python -m benchmarks.ws_stub --interval-ms 10
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+SUBPROTOCOL = "graphql-transport-ws"
+
+
+class StubSubscriptionConfig:
+    """Mutable stub behaviour; may be changed while the server is running."""
+    
+    def __init__(self, interval_ms: float = 10.0, events: int = 0, rows: int = 1, auth_value: Optional[str] = None):
+        self.interval_ms = interval_ms
+        # Events per subscription before `complete` (0 = until unsubscribed)
+        self.events = events
+        self.rows = rows
+        # When set, connection_init must carry it in payload.headers
+        self.auth_value = auth_value
+
+
+class StubSubscriptionServer:
+    """Threaded websocket stub; use as a context manager or call start()/stop()."""
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[StubSubscriptionConfig] = None):
+        self.host = host
+        self.port = port
+        self.config = config or StubSubscriptionConfig()
+        self.stats = {"connections": 0, "subscriptions": 0, "events_sent": 0, "completed_by_client": 0}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Future] = None
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/v1/graphql"
+    
+    @property
+    def http_url(self) -> str:
+        """The endpoint a GraphQLClient is configured with; its websocket URL is self.url."""
+        return f"http://{self.host}:{self.port}/v1/graphql"
+    
+    def _payload(self, sequence: int) -> Dict[str, Any]:
+        rows = [{"seq": sequence, "sent_at": time.time(), "row": i} for i in range(self.config.rows)]
+        return {"data": {"events": rows}}
+    
+    async def _emit(self, socket, subscription_id: str):
+        sent = 0
+        try:
+            while not self.config.events or sent < self.config.events:
+                message = {"id": subscription_id, "type": "next", "payload": self._payload(sent)}
+                await socket.send(json.dumps(message))
+                sent += 1
+                self.stats["events_sent"] += 1
+                await asyncio.sleep(self.config.interval_ms / 1000.0)
+            await socket.send(json.dumps({"id": subscription_id, "type": "complete"}))
+        except Exception:
+            # Closed or cancelled
+            pass
+    
+    async def _handle(self, socket):
+        from websockets.exceptions import ConnectionClosed
+        
+        self.stats["connections"] += 1
+        tasks: Dict[str, asyncio.Task] = {}
+        try:
+            init = json.loads(await socket.recv())
+            headers = (init.get("payload") or {}).get("headers") or {}
+            if init.get("type") != "connection_init":
+                await socket.close(4400, "Expected connection_init")
+                return
+            if self.config.auth_value is not None and self.config.auth_value not in headers.values():
+                await socket.close(4403, "Forbidden")
+                return
+            await socket.send(json.dumps({"type": "connection_ack"}))
+            
+            async for raw in socket:
+                message = json.loads(raw)
+                message_type = message.get("type")
+                if message_type == "ping":
+                    await socket.send(json.dumps({"type": "pong"}))
+                elif message_type == "subscribe":
+                    self.stats["subscriptions"] += 1
+                    tasks[message["id"]] = asyncio.create_task(self._emit(socket, message["id"]))
+                elif message_type == "complete":
+                    task = tasks.pop(message.get("id"), None)
+                    if task is not None:
+                        self.stats["completed_by_client"] += 1
+                        task.cancel()
+        except ConnectionClosed:
+            pass
+        finally:
+            for task in tasks.values():
+                task.cancel()
+    
+    async def _serve(self):
+        from websockets.asyncio.server import serve
+        
+        self._stop = asyncio.get_running_loop().create_future()
+        async with serve(self._handle, self.host, self.port, subprotocols=[SUBPROTOCOL]) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop
+    
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        finally:
+            self._loop.close()
+    
+    def start(self) -> "StubSubscriptionServer":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        if not self._ready.wait(10):
+            raise RuntimeError("Stub websocket server did not start")
+        return self
+    
+    def stop(self):
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(lambda: self._stop.done() or self._stop.set_result(None))
+        if self._thread:
+            self._thread.join()
+    
+    def __enter__(self) -> "StubSubscriptionServer":
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stub graphql-transport-ws server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--interval-ms", type=float, default=10.0, help="Time between events per subscription")
+    parser.add_argument("--events", type=int, default=0, help="Events per subscription before complete (0 = unlimited)")
+    parser.add_argument("--rows", type=int, default=1, help="Rows per event payload")
+    parser.add_argument("--auth-value", help="Require this header value in connection_init")
+    args = parser.parse_args()
+    
+    config = StubSubscriptionConfig(args.interval_ms, args.events, args.rows, args.auth_value)
+    server = StubSubscriptionServer(args.host, args.port, config).start()
+    print(f"Stub subscription server listening on {server.url}")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Adaptive upstream concurrency limit with a bounded priority queue.
+
+The limit follows AIMD on latency: it grows by about one per limit's worth of
+successful calls while the endpoint is kept busy, and shrinks multiplicatively
+when latency rises well above the recent minimum (queueing upstream) or the
+endpoint fails. Calls beyond the limit wait in a bounded queue where schema and
+introspection traffic goes ahead of data queries; a call whose deadline can't be
+met given the queue ahead of it is rejected right away instead of waiting for it.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+from resilience import NotSentError, is_endpoint_failure
+
+
+# Lower runs first
+PRIORITIES = {"introspection": 0, "query": 1, "subscription": 1, "mutation": 1}
+
+
+class OverloadedError(NotSentError):
+    """The call was rejected by the limiter before reaching the endpoint."""
+
+
+def _env(prefix: str, name: str, default: Any) -> str:
+    return os.getenv(f"{prefix}{name}", os.getenv(f"GRAPHQL_{name}", str(default)))
+
+
+class LimiterPolicy:
+    """Settings for one endpoint's limiter; limits are relative to its connection pool size."""
+    
+    def __init__(self, enabled: bool = True, initial_limit: Optional[int] = None, min_limit: int = 1,
+                 max_limit: Optional[int] = None, queue_size: int = 256, latency_tolerance: float = 1.5,
+                 backoff_ratio: float = 0.9):
+        self.enabled = enabled
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.queue_size = queue_size
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+    
+    @classmethod
+    def from_env(cls, prefix: str = "GRAPHQL_") -> "LimiterPolicy":
+        """
+        Read <prefix>LIMITER, <prefix>LIMIT_INITIAL, <prefix>LIMIT_MIN, <prefix>LIMIT_MAX,
+        <prefix>LIMIT_QUEUE and <prefix>LIMIT_LATENCY_TOLERANCE, falling back to the
+        GRAPHQL_* variable and then the default.
+        """
+        initial = _env(prefix, "LIMIT_INITIAL", "")
+        maximum = _env(prefix, "LIMIT_MAX", "")
+        return cls(
+            enabled=_env(prefix, "LIMITER", "true").lower() in ("1", "true", "yes"),
+            initial_limit=int(initial) if initial else None,
+            min_limit=int(_env(prefix, "LIMIT_MIN", 1)),
+            max_limit=int(maximum) if maximum else None,
+            queue_size=int(_env(prefix, "LIMIT_QUEUE", 256)),
+            latency_tolerance=float(_env(prefix, "LIMIT_LATENCY_TOLERANCE", 1.5))
+        )
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit shared by all calls to one endpoint."""
+    
+    # Samples after which the minimum latency is re-measured, so it can follow a slower upstream
+    MIN_RTT_WINDOW = 500
+    
+    def __init__(self, policy: Optional[LimiterPolicy] = None, max_connections: int = 10):
+        self.policy = policy or LimiterPolicy()
+        self.max_limit = self.policy.max_limit or max_connections
+        self.min_limit = max(1, min(self.policy.min_limit, self.max_limit))
+        # Start low and grow, so a burst at startup can't flood the endpoint before any feedback
+        self.limit = float(self.policy.initial_limit or max(self.min_limit, min(self.max_limit // 2, 8)))
+        self.in_flight = 0
+        self._queue: List[List[Any]] = []
+        self._queued = 0
+        self._sequence = itertools.count()
+        self._rtt_min: Optional[float] = None
+        self._rtt_next_min: Optional[float] = None
+        self._rtt_samples = 0
+        self._rtt_avg: Optional[float] = None
+        self._last_decrease = 0.0
+        self.counters = {
+            "admitted": 0, "queued": 0, "rejected_queue_full": 0, "rejected_deadline": 0,
+            "evicted": 0, "decreases": 0
+        }
+        self.max_queue_wait = 0.0
+    
+    # Admission
+    
+    def _pop_live(self) -> Optional[List[Any]]:
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            if not entry[2].done():
+                return entry
+        return None
+    
+    def _wake(self):
+        while self.in_flight < int(self.limit):
+            entry = self._pop_live()
+            if entry is None:
+                return
+            self._queued -= 1
+            self.in_flight += 1
+            entry[2].set_result(None)
+    
+    def _estimated_wait(self, priority: int) -> float:
+        """Rough time until a new call at this priority gets a slot."""
+        if self._rtt_avg is None or self.in_flight < int(self.limit):
+            return 0.0
+        ahead = sum(1 for entry in self._queue if entry[0] <= priority and not entry[2].done())
+        return (ahead + 1) / max(1, int(self.limit)) * self._rtt_avg
+    
+    def _reject(self, entry: List[Any], message: str):
+        entry[2].set_exception(OverloadedError(message))
+        self._queued -= 1
+    
+    async def acquire(self, priority: int, deadline: Optional[float] = None, wait: bool = True):
+        loop = asyncio.get_running_loop()
+        if self.in_flight < int(self.limit) and not self._queued:
+            self.in_flight += 1
+            self.counters["admitted"] += 1
+            return
+        if not wait:
+            raise OverloadedError(f"No free upstream slot ({self.in_flight} in flight)")
+        
+        if deadline is not None and self._rtt_avg is not None:
+            if loop.time() + self._estimated_wait(priority) + self._rtt_avg > deadline:
+                self.counters["rejected_deadline"] += 1
+                raise OverloadedError(
+                    f"Upstream concurrency limit reached ({self.in_flight} in flight, {self._queued} queued); "
+                    f"the call would miss its deadline"
+                )
+        
+        if self._queued >= self.policy.queue_size:
+            # Full: a more important call displaces the least important queued one
+            worst = max((entry for entry in self._queue if not entry[2].done()), default=None)
+            if worst is None or worst[0] <= priority:
+                self.counters["rejected_queue_full"] += 1
+                raise OverloadedError(f"Upstream request queue is full ({self._queued} waiting)")
+            self.counters["evicted"] += 1
+            self._reject(worst, "Displaced from the upstream request queue by higher-priority traffic")
+        
+        future = loop.create_future()
+        entry = [priority, next(self._sequence), future]
+        heapq.heappush(self._queue, entry)
+        self._queued += 1
+        self.counters["queued"] += 1
+        start = loop.time()
+        
+        try:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            # A slot granted just as the deadline passed is kept
+            if not future.done() or future.exception():
+                if not future.done():
+                    future.cancel()
+                    self._queued -= 1
+                self.counters["rejected_deadline"] += 1
+                raise OverloadedError("Timed out waiting for an upstream concurrency slot")
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and not future.exception():
+                self.release()
+            elif not future.done():
+                future.cancel()
+                self._queued -= 1
+            raise
+        
+        self.max_queue_wait = max(self.max_queue_wait, loop.time() - start)
+        self.counters["admitted"] += 1
+    
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+    
+    # Feedback
+    
+    def _record_rtt(self, rtt: float):
+        self._rtt_avg = rtt if self._rtt_avg is None else self._rtt_avg * 0.9 + rtt * 0.1
+        self._rtt_samples += 1
+        self._rtt_next_min = rtt if self._rtt_next_min is None else min(self._rtt_next_min, rtt)
+        if self._rtt_min is None or rtt < self._rtt_min:
+            self._rtt_min = rtt
+        if self._rtt_samples >= self.MIN_RTT_WINDOW:
+            self._rtt_min, self._rtt_next_min, self._rtt_samples = self._rtt_next_min, None, 0
+    
+    def _decrease(self):
+        # At most once per round trip, so one burst of slow responses counts as one signal
+        now = time.monotonic()
+        if now - self._last_decrease < (self._rtt_min or 0.0):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * self.policy.backoff_ratio)
+        self.counters["decreases"] += 1
+    
+    def on_result(self, rtt: float, overloaded: bool, in_flight_at_start: int):
+        """Adjust the limit after a call: `overloaded` for endpoint failures/throttling."""
+        if overloaded:
+            self._decrease()
+            return
+        self._record_rtt(rtt)
+        if rtt > self.policy.latency_tolerance * self._rtt_min:
+            self._decrease()
+        elif in_flight_at_start >= self.limit / 2:
+            # Only grow while the current limit is actually being used
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        self._wake()
+    
+    @asynccontextmanager
+    async def slot(self, op_type: str, deadline: Optional[float] = None, wait: bool = True):
+        """
+        Hold one upstream slot for the duration of the block, which should be a single
+        request so its latency is what the limit adapts to. Without `wait`, raise
+        OverloadedError at once unless a slot is free.
+        """
+        if not self.policy.enabled:
+            yield
+            return
+        
+        await self.acquire(PRIORITIES.get(op_type, 1), deadline, wait)
+        in_flight = self.in_flight
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            self.on_result(time.perf_counter() - start, is_endpoint_failure(e) or status == 429, in_flight)
+            raise
+        else:
+            self.on_result(time.perf_counter() - start, False, in_flight)
+        finally:
+            self.release()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.policy.enabled,
+            "limit": int(self.limit),
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "queued": self._queued,
+            "min_rtt_ms": round(self._rtt_min * 1000, 1) if self._rtt_min is not None else None,
+            "max_queue_wait_ms": round(self.max_queue_wait * 1000, 1),
+            "counters": dict(self.counters)
+        }
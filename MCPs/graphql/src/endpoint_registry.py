@@ -0,0 +1,193 @@
+"""
+Registry of named GraphQL endpoints (e.g. dev, staging, prod Hasura).
+
+Each endpoint gets its own lazily created GraphQLClient, and with it its own
+schema index and connection pool. Loaded schema indexes share a memory budget;
+when it is exceeded the least recently used indexes are dropped and reloaded
+on their next use.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from concurrency_limiter import LimiterPolicy
+from graphql_client import GraphQLClient
+from resilience import ResiliencePolicy
+
+
+DEFAULT_ENDPOINT_URL = "https://graphql.testimonial.brownforge.com/v1/graphql"
+DEFAULT_ENDPOINT_NAME = "default"
+
+
+class EndpointConfig:
+    """Connection settings for one named endpoint."""
+    
+    def __init__(self, name: str, endpoint: str, auth_header: str = "x-hasura-admin-secret", auth_value: str = "",
+                 schema_file: Optional[str] = None, max_connections: int = 10, persisted_queries: bool = False,
+                 compress_requests: bool = False, resilience: Optional[ResiliencePolicy] = None,
+                 limiter: Optional[LimiterPolicy] = None):
+        self.name = name
+        self.endpoint = endpoint
+        self.auth_header = auth_header
+        self.auth_value = auth_value
+        self.schema_file = schema_file
+        self.max_connections = max_connections
+        self.persisted_queries = persisted_queries
+        self.compress_requests = compress_requests
+        self.resilience = resilience
+        self.limiter = limiter
+
+
+class EndpointRegistry:
+    """Named endpoints with per-endpoint clients and an LRU-bounded schema cache."""
+    
+    def __init__(self, configs: List[EndpointConfig], default_name: Optional[str] = None, schema_cache_budget_bytes: int = 256 * 1024 * 1024):
+        if not configs:
+            raise ValueError("At least one endpoint must be configured")
+        self.configs: Dict[str, EndpointConfig] = {config.name: config for config in configs}
+        self.default_name = default_name or configs[0].name
+        if self.default_name not in self.configs:
+            raise ValueError(f"Default endpoint '{self.default_name}' is not configured")
+        self.schema_cache_budget_bytes = schema_cache_budget_bytes
+        # Least recently used first
+        self._clients: "OrderedDict[str, GraphQLClient]" = OrderedDict()
+        self.evictions = 0
+    
+    @classmethod
+    def from_env(cls) -> "EndpointRegistry":
+        """
+        Build the registry from environment variables.
+        
+        GRAPHQL_ENDPOINT / GRAPHQL_AUTH_HEADER / GRAPHQL_AUTH_VALUE / GRAPHQL_SCHEMA_FILE
+        configure the "default" endpoint. GRAPHQL_ENDPOINTS=dev,staging,prod adds named
+        endpoints configured by GRAPHQL_<NAME>_ENDPOINT, GRAPHQL_<NAME>_AUTH_HEADER,
+        GRAPHQL_<NAME>_AUTH_VALUE, GRAPHQL_<NAME>_SCHEMA_FILE, GRAPHQL_<NAME>_MAX_CONNECTIONS,
+        GRAPHQL_<NAME>_PERSISTED_QUERIES and GRAPHQL_<NAME>_COMPRESS_REQUESTS; timeout, retry,
+        hedging and circuit breaker settings are read per endpoint by ResiliencePolicy.from_env
+        and concurrency limiter settings by LimiterPolicy.from_env.
+        GRAPHQL_DEFAULT_ENDPOINT picks the endpoint used when a tool call names none, and
+        GRAPHQL_SCHEMA_CACHE_MB sets the schema cache budget.
+        """
+        max_connections = int(os.getenv("GRAPHQL_MAX_CONNECTIONS", "10"))
+        persisted_queries = os.getenv("GRAPHQL_PERSISTED_QUERIES", "false").lower() in ("1", "true", "yes")
+        compress_requests = os.getenv("GRAPHQL_COMPRESS_REQUESTS", "false").lower() in ("1", "true", "yes")
+        configs = [EndpointConfig(
+            name=DEFAULT_ENDPOINT_NAME,
+            endpoint=os.getenv("GRAPHQL_ENDPOINT", DEFAULT_ENDPOINT_URL),
+            auth_header=os.getenv("GRAPHQL_AUTH_HEADER", "x-hasura-admin-secret"),
+            auth_value=os.getenv("GRAPHQL_AUTH_VALUE", ""),
+            schema_file=os.getenv("GRAPHQL_SCHEMA_FILE"),
+            max_connections=max_connections,
+            persisted_queries=persisted_queries,
+            compress_requests=compress_requests,
+            resilience=ResiliencePolicy.from_env(),
+            limiter=LimiterPolicy.from_env()
+        )]
+        
+        for name in [n.strip() for n in os.getenv("GRAPHQL_ENDPOINTS", "").split(",") if n.strip()]:
+            prefix = f"GRAPHQL_{name.upper().replace('-', '_')}_"
+            endpoint = os.getenv(f"{prefix}ENDPOINT")
+            if not endpoint:
+                raise ValueError(f"Endpoint '{name}' is listed in GRAPHQL_ENDPOINTS but {prefix}ENDPOINT is not set")
+            configs.append(EndpointConfig(
+                name=name,
+                endpoint=endpoint,
+                auth_header=os.getenv(f"{prefix}AUTH_HEADER", "x-hasura-admin-secret"),
+                auth_value=os.getenv(f"{prefix}AUTH_VALUE", ""),
+                schema_file=os.getenv(f"{prefix}SCHEMA_FILE"),
+                max_connections=int(os.getenv(f"{prefix}MAX_CONNECTIONS", str(max_connections))),
+                persisted_queries=os.getenv(f"{prefix}PERSISTED_QUERIES", str(persisted_queries)).lower() in ("1", "true", "yes"),
+                compress_requests=os.getenv(f"{prefix}COMPRESS_REQUESTS", str(compress_requests)).lower() in ("1", "true", "yes"),
+                resilience=ResiliencePolicy.from_env(prefix),
+                limiter=LimiterPolicy.from_env(prefix)
+            ))
+        
+        budget_mb = float(os.getenv("GRAPHQL_SCHEMA_CACHE_MB", "256"))
+        return cls(configs, os.getenv("GRAPHQL_DEFAULT_ENDPOINT", DEFAULT_ENDPOINT_NAME), int(budget_mb * 1024 * 1024))
+    
+    def names(self) -> List[str]:
+        return list(self.configs.keys())
+    
+    def get_client(self, name: Optional[str] = None) -> GraphQLClient:
+        """Return the client for an endpoint (default if name is None), creating it on first use."""
+        name = name or self.default_name
+        config = self.configs.get(name)
+        if config is None:
+            raise KeyError(f"Unknown endpoint '{name}'. Available endpoints: {', '.join(self.names())}")
+        
+        client = self._clients.get(name)
+        if client is None:
+            client = GraphQLClient(
+                endpoint=config.endpoint,
+                auth_header=config.auth_header,
+                auth_value=config.auth_value,
+                schema_file=config.schema_file,
+                max_connections=config.max_connections,
+                persisted_queries=config.persisted_queries,
+                compress_requests=config.compress_requests,
+                resilience=config.resilience,
+                limiter=config.limiter,
+                on_schema_loaded=self._on_schema_loaded
+            )
+            self._clients[name] = client
+        self._clients.move_to_end(name)
+        return client
+    
+    def schema_cache_bytes(self) -> int:
+        """Estimated memory held by all loaded schema indexes."""
+        return sum(client.schema_cache_bytes for client in self._clients.values())
+    
+    def _on_schema_loaded(self, loaded: GraphQLClient):
+        """Evict least recently used schema indexes until the budget is met."""
+        total = self.schema_cache_bytes()
+        for client in list(self._clients.values()):
+            if total <= self.schema_cache_budget_bytes:
+                break
+            if client is loaded or not client.schema_cache_bytes:
+                continue
+            total -= client.schema_cache_bytes
+            client.drop_schema_cache()
+            self.evictions += 1
+    
+    def describe(self) -> List[Dict[str, Any]]:
+        """Status of every configured endpoint."""
+        status = []
+        for name, config in self.configs.items():
+            client = self._clients.get(name)
+            status.append({
+                "name": name,
+                "endpoint": config.endpoint,
+                "schema_file": config.schema_file,
+                "default": name == self.default_name,
+                "schema_loaded": bool(client and client.schema_cache_bytes),
+                "schema_cache_bytes": client.schema_cache_bytes if client else 0
+            })
+        return status
+    
+    async def aclose(self):
+        """Close every endpoint's connection pool."""
+        for client in self._clients.values():
+            await client.aclose()
+    
+    def format_status(self) -> str:
+        """Markdown summary of the configured endpoints."""
+        output = [f"# GraphQL Endpoints ({len(self.configs)} configured)\n"]
+        for status in self.describe():
+            line = f"## {status['name']}"
+            if status["default"]:
+                line += " (default)"
+            output.append(line)
+            output.append(f"**Endpoint:** {status['endpoint']}")
+            if status["schema_file"]:
+                output.append(f"**Schema File:** {status['schema_file']}")
+            if status["schema_loaded"]:
+                output.append(f"**Schema Cache:** loaded (~{status['schema_cache_bytes'] / (1024 * 1024):.1f} MB)")
+            else:
+                output.append("**Schema Cache:** not loaded")
+            output.append("")
+        
+        budget_mb = self.schema_cache_budget_bytes / (1024 * 1024)
+        used_mb = self.schema_cache_bytes() / (1024 * 1024)
+        output.append(f"**Schema Cache Budget:** {used_mb:.1f} / {budget_mb:.0f} MB ({self.evictions} evictions)")
+        return "\n".join(output)
@@ -2,55 +2,211 @@
 GraphQL Client for schema introspection and analysis.
 """
 
-import json
-from typing import Any, Dict, List, Optional, Union
+import asyncio
+import itertools
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
-import httpx
+import json_codec
+from concurrency_limiter import AdaptiveLimiter, LimiterPolicy
+from resilience import ResiliencePolicy, ResilientCaller, operation_type
+from schema_index import SchemaIndex, base_type_name, compute_type_hashes, format_type_ref
+from tools.rendering import render
+
+
+# Request bodies smaller than this aren't worth compressing
+COMPRESS_MIN_BYTES = 4096
+
+# Root fields starting with these words modify data and belong in a mutation
+DANGEROUS_KEYWORDS = ("drop", "delete", "truncate", "alter", "create")
+
+
+def dangerous_keyword(query: str) -> Optional[str]:
+    """
+    The keyword of the first data-modifying root field (delete_users, ...) in a
+    query or subscription operation, else None. Only whole root field names count,
+    so columns such as created_at or deleted_at never match.
+    """
+    from graphql import FieldNode, GraphQLError, OperationDefinitionNode, parse
+    
+    try:
+        document = parse(query, no_location=True)
+    except GraphQLError:
+        # Syntax errors are left for the server to report
+        return None
+    for definition in document.definitions:
+        if not isinstance(definition, OperationDefinitionNode) or definition.operation.value == "mutation":
+            continue
+        for selection in definition.selection_set.selections:
+            if isinstance(selection, FieldNode):
+                word = selection.name.value.lower().split("_")[0]
+                if word in DANGEROUS_KEYWORDS:
+                    return word
+    return None
 
 
 class GraphQLClient:
     """Client for performing GraphQL introspection queries."""
     
-    def __init__(self, endpoint: str, auth_header: str = "Authorization", auth_value: str = "", schema_file: Optional[str] = None):
+    def __init__(self, endpoint: str, auth_header: str = "Authorization", auth_value: str = "", schema_file: Optional[str] = None,
+                 max_connections: int = 10, on_schema_loaded: Optional[Callable[["GraphQLClient"], None]] = None,
+                 persisted_queries: bool = False, compress_requests: bool = False,
+                 resilience: Optional[ResiliencePolicy] = None, limiter: Optional[LimiterPolicy] = None):
         self.endpoint = endpoint
         self.auth_header = auth_header
         self.auth_value = auth_value
         self.schema_file = schema_file
+        self.max_connections = max_connections
+        self.on_schema_loaded = on_schema_loaded
         self._schema_cache: Optional[Dict[str, Any]] = None
+        self._index: Optional[SchemaIndex] = None
+        self._schema_lock: Optional[asyncio.Lock] = None
+        self._http_client = None
+        # Automatic persisted queries (opt-in: Hasura CE has no APQ support): None until the server has
+        # answered a hash-only request with a result or PersistedQueryNotFound
+        self.persisted_queries = persisted_queries
+        self._apq_supported: Optional[bool] = None
+        self.apq_stats = {"hash_only": 0, "registered": 0, "full": 0, "bytes_saved": 0}
+        # gzip request bodies; opt-in because Hasura and most servers only compress responses
+        self.compress_requests = compress_requests
+        # Per-operation-type timeouts, retries, hedged reads and circuit breaker
+        self.resilience = ResilientCaller(resilience)
+        # Adaptive cap on concurrent upstream calls, with schema traffic ahead of data queries
+        self.limiter = AdaptiveLimiter(limiter, max_connections)
+        # Websocket subscriptions, created with the first one
+        self._subscriptions = None
     
     def _get_headers(self) -> Dict[str, str]:
         """Get headers for GraphQL requests."""
         headers = {
             "Content-Type": "application/json",
-            "Accept": "application/json"
+            "Accept": "application/json",
+            "Accept-Encoding": json_codec.accept_encoding()
         }
         if self.auth_value:
             headers[self.auth_header] = self.auth_value
         return headers
     
+    async def _post(self, payload: Dict[str, Any], timeout: float = 30.0, url: Optional[str] = None) -> Tuple[Any, Any]:
+        """
+        POST a GraphQL request (to the endpoint unless `url` is given) and return (response, decoded body).
+        
+        The body is decoded as it streams in rather than buffered and re-read as text.
+        Non-JSON error responses decode to None so callers can raise on the status instead.
+        """
+        body = json_codec.dumps_bytes(payload)
+        headers = self._get_headers()
+        if self.compress_requests and len(body) >= COMPRESS_MIN_BYTES:
+            import gzip
+            
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        
+        client = self._get_http_client()
+        async with client.stream("POST", url or self.endpoint, content=body, headers=headers, timeout=timeout) as response:
+            decoder = json_codec.StreamDecoder()
+            async for chunk in response.aiter_bytes():
+                decoder.feed(chunk)
+            try:
+                result = decoder.close()
+            except ValueError:
+                if response.is_success:
+                    raise
+                result = None
+        return response, result
+    
     async def _execute_query(self, query: str, variables: Optional[Dict[str, Any]] = None, operation_name: Optional[str] = None) -> Dict[str, Any]:
         """Execute a GraphQL query and return the response."""
-        payload = {"query": query}
+        payload: Dict[str, Any] = {}
         if variables:
             payload["variables"] = variables
         if operation_name:
             payload["operationName"] = operation_name
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.endpoint,
-                json=payload,
-                headers=self._get_headers(),
-                timeout=30.0
-            )
-            response.raise_for_status()
-            result = response.json()
+        op_type = operation_type(query)
+        deadline = asyncio.get_running_loop().time() + self.resilience.policy.timeout_for(op_type)
+        # Each attempt (retries and hedges too) takes its own limiter slot
+        return await self.resilience.call(
+            op_type,
+            lambda timeout: self._send_operation(query, dict(payload), timeout),
+            deadline,
+            slot=lambda wait: self.limiter.slot(op_type, deadline, wait)
+        )
+    
+    async def _send_operation(self, query: str, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """One attempt: the persisted query exchange (if enabled) followed by the full document if needed."""
+        if self.persisted_queries and self._apq_supported is not False:
+            from persisted_queries import APQ_VERSION, get_default_registry, persisted_query_error
+            
+            # Hash-only first; the full text follows only if the server doesn't know the document yet
+            sha256 = get_default_registry().hash_for(query)
+            payload["extensions"] = {"persistedQuery": {"version": APQ_VERSION, "sha256Hash": sha256}}
+            try:
+                response, result = await self._post(payload, timeout)
+            except ValueError:
+                response, result = None, None
+            outcome = persisted_query_error(result or {})
             
-            if "errors" in result:
-                error_messages = [error.get("message", str(error)) for error in result["errors"]]
-                raise Exception(f"GraphQL errors: {', '.join(error_messages)}")
+            if outcome is None and response is not None and (response.status_code != 400 or self._apq_supported):
+                response.raise_for_status()
+                # Only a clean answer proves the server ran the document from its hash; until then an
+                # error may be a server without APQ complaining about the missing query text
+                if self._apq_supported or "errors" not in result:
+                    self._apq_supported = True
+                    self.apq_stats["hash_only"] += 1
+                    self.apq_stats["bytes_saved"] += len(query.encode())
+                    return self._unwrap_result(result)
             
-            return result.get("data", {})
+            if outcome == "not_found":
+                self._apq_supported = True
+                self.apq_stats["registered"] += 1
+            else:
+                # Not supported (or an unusable or unexplained answer to the hash-only body): stop sending hashes
+                self._apq_supported = False
+                del payload["extensions"]
+        
+        payload["query"] = query
+        if "extensions" not in payload:
+            self.apq_stats["full"] += 1
+        response, result = await self._post(payload, timeout)
+        response.raise_for_status()
+        return self._unwrap_result(result)
+    
+    def _unwrap_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        if "errors" in result:
+            error_messages = [error.get("message", str(error)) for error in result["errors"]]
+            raise Exception(f"GraphQL errors: {', '.join(error_messages)}")
+        
+        return result.get("data", {})
+    
+    def _get_http_client(self):
+        """Get the pooled HTTP client for this endpoint, creating it on first use."""
+        if self._http_client is None:
+            # Imported on first use. The server already has httpx loaded through mcp; this
+            # keeps importing graphql_client on its own (benchmarks, tests) ~100 ms cheaper.
+            import httpx
+            
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+            )
+        return self._http_client
+    
+    async def aclose(self):
+        """Close pooled connections and the subscription websocket."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+        if self._subscriptions is not None:
+            await self._subscriptions.close()
+    
+    def _get_subscriptions(self):
+        """Get this endpoint's subscription manager, creating it on first use."""
+        if self._subscriptions is None:
+            from subscriptions import SubscriptionManager
+            
+            self._subscriptions = SubscriptionManager(
+                self.endpoint, lambda: {self.auth_header: self.auth_value} if self.auth_value else {}
+            )
+        return self._subscriptions
     
     async def _get_schema(self) -> Dict[str, Any]:
         """Get the full schema via introspection or local file (with caching)."""
@@ -60,34 +216,49 @@ class GraphQLClient:
         # Try to load from local file first (for performance and size limits)
         if self.schema_file:
             try:
-                import json
-                import os
-                
-                if os.path.exists(self.schema_file):
-                    with open(self.schema_file, 'r') as f:
-                        if self.schema_file.endswith('.json'):
-                            # Load introspection JSON
-                            introspection_result = json.load(f)
-                            if 'data' in introspection_result and '__schema' in introspection_result['data']:
-                                self._schema_cache = introspection_result['data']['__schema']
-                                return self._schema_cache
-                        elif self.schema_file.endswith('.graphql'):
-                            # Parse GraphQL SDL file
-                            from graphql import build_schema, get_introspection_query, graphql_sync
-                            
-                            schema_sdl = f.read()
-                            schema = build_schema(schema_sdl)
-                            introspection_query = get_introspection_query()
-                            result = graphql_sync(schema, introspection_query)
-                            
-                            if result.data and '__schema' in result.data:
-                                self._schema_cache = result.data['__schema']
-                                return self._schema_cache
+                schema = self._load_schema_file()
+                if schema is not None:
+                    self._schema_cache = schema
+                    return self._schema_cache
             except Exception as e:
                 print(f"Warning: Could not load schema from file {self.schema_file}: {e}")
                 print("Falling back to live introspection...")
         
         # Fallback to live introspection
+        self._schema_cache = await self._introspect_live()
+        return self._schema_cache
+    
+    def _load_schema_file(self) -> Optional[Dict[str, Any]]:
+        """Load the schema from the configured introspection JSON or SDL file (None if unusable)."""
+        import os
+        
+        if not self.schema_file or not os.path.exists(self.schema_file):
+            return None
+        
+        if self.schema_file.endswith('.json'):
+            # Load introspection JSON (decoded from bytes, no intermediate str)
+            with open(self.schema_file, 'rb') as f:
+                introspection_result = json_codec.loads(f.read())
+            if 'data' in introspection_result and '__schema' in introspection_result['data']:
+                return introspection_result['data']['__schema']
+            return None
+        
+        with open(self.schema_file, 'r') as f:
+            if self.schema_file.endswith('.graphql'):
+                # Parse GraphQL SDL file
+                from graphql import build_schema, get_introspection_query, graphql_sync
+                
+                schema_sdl = f.read()
+                schema = build_schema(schema_sdl)
+                introspection_query = get_introspection_query()
+                result = graphql_sync(schema, introspection_query)
+                
+                if result.data and '__schema' in result.data:
+                    return result.data['__schema']
+        return None
+    
+    async def _introspect_live(self) -> Dict[str, Any]:
+        """Fetch the schema from the endpoint with an introspection query."""
         introspection_query = """
         query IntrospectionQuery {
           __schema {
@@ -183,247 +354,276 @@ class GraphQLClient:
         """
         
         result = await self._execute_query(introspection_query)
-        self._schema_cache = result.get("__schema", {})
-        return self._schema_cache
+        return result.get("__schema", {})
+    
+    async def _get_index(self) -> SchemaIndex:
+        """Get the lookup index for the schema, loading the schema on first use."""
+        if self._index is not None:
+            return self._index
+        
+        if self._schema_lock is None:
+            self._schema_lock = asyncio.Lock()
+        async with self._schema_lock:
+            if self._index is None:
+                self._index = SchemaIndex(await self._get_schema())
+                if self.on_schema_loaded:
+                    self.on_schema_loaded(self)
+        return self._index
+    
+    @property
+    def schema_cache_bytes(self) -> int:
+        """Estimated memory held by the cached schema and its index."""
+        return self._index.estimated_bytes if self._index else 0
+    
+    def drop_schema_cache(self):
+        """Forget the cached schema and index; the next call reloads them."""
+        self._schema_cache = None
+        self._index = None
     
     def _format_type_ref(self, type_ref: Dict[str, Any]) -> str:
         """Format a type reference into a readable string."""
-        if not type_ref:
-            return "Unknown"
-        
-        kind = type_ref.get("kind")
-        name = type_ref.get("name")
-        of_type = type_ref.get("ofType")
-        
-        if kind == "NON_NULL":
-            return f"{self._format_type_ref(of_type)}!"
-        elif kind == "LIST":
-            return f"[{self._format_type_ref(of_type)}]"
-        elif name:
-            return name
-        else:
-            return "Unknown"
+        return format_type_ref(type_ref)
     
     async def introspect_schema(self, page: int = 1, per_page: int = 20, filter_kind: Optional[str] = None) -> str:
         """Get schema introspection with pagination to handle large schemas."""
+        return render(await self.iter_introspect_schema(page, per_page, filter_kind))
+    
+    async def iter_introspect_schema(self, page: int = 1, per_page: int = 20, filter_kind: Optional[str] = None) -> Iterator[str]:
+        """introspect_schema() output as lines, rendered as they are consumed."""
         try:
-            from .tools.pagination import paginate_schema_types, format_pagination_info
-            
-            schema = await self._get_schema()
-            
-            output = ["# GraphQL Schema Introspection\n"]
+            from tools.pagination import paginate_schema_types
             
-            # Root types
-            if schema.get("queryType"):
-                output.append(f"**Query Type:** {schema['queryType']['name']}")
-            if schema.get("mutationType"):
-                output.append(f"**Mutation Type:** {schema['mutationType']['name']}")
-            if schema.get("subscriptionType"):
-                output.append(f"**Subscription Type:** {schema['subscriptionType']['name']}")
-            
-            output.append("")
-            
-            # Types with pagination
+            schema = (await self._get_index()).schema
             types = schema.get("types", [])
             paginated_types, pagination_info = paginate_schema_types(types, page, per_page, filter_kind)
-            
-            # Overall summary
-            user_types = [t for t in types if not t.get("name", "").startswith("__")]
-            by_kind = {}
-            for type_info in user_types:
-                kind = type_info.get("kind", "UNKNOWN")
-                by_kind[kind] = by_kind.get(kind, 0) + 1
-            
-            output.append("## Schema Summary")
-            output.append(f"**Total Types:** {len(user_types)}")
-            for kind, count in sorted(by_kind.items()):
-                output.append(f"- **{kind}:** {count} types")
-            
-            output.append("")
-            
-            # Pagination info
-            output.append("## Types")
-            output.append(format_pagination_info(pagination_info))
-            output.append("")
-            
-            # Current page types
-            if filter_kind:
-                output.append(f"### {filter_kind} Types")
-            else:
-                output.append("### All Types")
-            
-            for type_info in paginated_types:
-                name = type_info.get("name", "")
-                kind = type_info.get("kind", "")
-                desc = type_info.get("description", "")
-                
-                type_line = f"**{name}** ({kind})"
-                if desc:
-                    type_line += f" - {desc}"
-                output.append(type_line)
-            
-            if not paginated_types:
-                output.append("No types found for the current page/filter.")
-            
-            return "\n".join(output)
+            return self._render_introspection(schema, types, paginated_types, pagination_info, filter_kind)
             
         except Exception as e:
-            return f"Error introspecting schema: {str(e)}"
+            return iter([f"Error introspecting schema: {str(e)}"])
+    
+    def _render_introspection(self, schema: Dict[str, Any], types: List[Dict[str, Any]],
+                              paginated_types: List[Dict[str, Any]], pagination_info: Dict[str, Any],
+                              filter_kind: Optional[str]) -> Iterator[str]:
+        from tools.pagination import format_pagination_info
+        
+        yield "# GraphQL Schema Introspection\n"
+        
+        # Root types
+        if schema.get("queryType"):
+            yield f"**Query Type:** {schema['queryType']['name']}"
+        if schema.get("mutationType"):
+            yield f"**Mutation Type:** {schema['mutationType']['name']}"
+        if schema.get("subscriptionType"):
+            yield f"**Subscription Type:** {schema['subscriptionType']['name']}"
+        
+        yield ""
+        
+        # Overall summary
+        user_types = [t for t in types if not t.get("name", "").startswith("__")]
+        by_kind = {}
+        for type_info in user_types:
+            kind = type_info.get("kind", "UNKNOWN")
+            by_kind[kind] = by_kind.get(kind, 0) + 1
+        
+        yield "## Schema Summary"
+        yield f"**Total Types:** {len(user_types)}"
+        for kind, count in sorted(by_kind.items()):
+            yield f"- **{kind}:** {count} types"
+        
+        yield ""
+        
+        # Pagination info
+        yield "## Types"
+        yield format_pagination_info(pagination_info)
+        yield ""
+        
+        # Current page types
+        if filter_kind:
+            yield f"### {filter_kind} Types"
+        else:
+            yield "### All Types"
+        
+        for type_info in paginated_types:
+            name = type_info.get("name", "")
+            kind = type_info.get("kind", "")
+            desc = type_info.get("description", "")
+            
+            type_line = f"**{name}** ({kind})"
+            if desc:
+                type_line += f" - {desc}"
+            yield type_line
+        
+        if not paginated_types:
+            yield "No types found for the current page/filter."
     
     async def get_type_info(self, type_name: str) -> str:
         """Get detailed information about a specific type."""
+        return render(await self.iter_get_type_info(type_name))
+    
+    async def iter_get_type_info(self, type_name: str) -> Iterator[str]:
+        """get_type_info() output as lines, rendered as they are consumed."""
         try:
-            schema = await self._get_schema()
-            types = schema.get("types", [])
+            index = await self._get_index()
             
-            type_info = next((t for t in types if t.get("name") == type_name), None)
+            type_info = index.get_type(type_name)
             if not type_info:
-                return f"Type '{type_name}' not found in schema"
-            
-            output = [f"# Type: {type_name}\n"]
-            
-            # Basic info
-            output.append(f"**Kind:** {type_info.get('kind', 'Unknown')}")
-            if type_info.get("description"):
-                output.append(f"**Description:** {type_info['description']}")
-            
-            # Fields (for OBJECT and INTERFACE types)
-            if type_info.get("fields"):
-                output.append("\n## Fields")
-                for field in type_info["fields"]:
-                    field_name = field.get("name", "")
-                    field_type = self._format_type_ref(field.get("type", {}))
-                    field_desc = field.get("description", "")
-                    
-                    output.append(f"### {field_name}: {field_type}")
-                    if field_desc:
-                        output.append(f"*{field_desc}*")
-                    
-                    # Arguments
-                    if field.get("args"):
-                        output.append("**Arguments:**")
-                        for arg in field["args"]:
-                            arg_name = arg.get("name", "")
-                            arg_type = self._format_type_ref(arg.get("type", {}))
-                            arg_desc = arg.get("description", "")
-                            arg_default = arg.get("defaultValue")
-                            
-                            arg_text = f"- {arg_name}: {arg_type}"
-                            if arg_default:
-                                arg_text += f" = {arg_default}"
-                            if arg_desc:
-                                arg_text += f" - {arg_desc}"
-                            output.append(arg_text)
-                    
-                    if field.get("isDeprecated"):
-                        reason = field.get("deprecationReason", "No reason provided")
-                        output.append(f"**⚠️ Deprecated:** {reason}")
-                    
-                    output.append("")
-            
-            # Input fields (for INPUT types)
-            if type_info.get("inputFields"):
-                output.append("\n## Input Fields")
-                for field in type_info["inputFields"]:
-                    field_name = field.get("name", "")
-                    field_type = self._format_type_ref(field.get("type", {}))
-                    field_desc = field.get("description", "")
-                    default_value = field.get("defaultValue")
-                    
-                    field_text = f"- **{field_name}**: {field_type}"
-                    if default_value:
-                        field_text += f" = {default_value}"
-                    if field_desc:
-                        field_text += f" - {field_desc}"
-                    output.append(field_text)
-            
-            # Enum values
-            if type_info.get("enumValues"):
-                output.append("\n## Enum Values")
-                for value in type_info["enumValues"]:
-                    value_name = value.get("name", "")
-                    value_desc = value.get("description", "")
-                    
-                    value_text = f"- **{value_name}**"
-                    if value_desc:
-                        value_text += f" - {value_desc}"
-                    output.append(value_text)
-                    
-                    if value.get("isDeprecated"):
-                        reason = value.get("deprecationReason", "No reason provided")
-                        output.append(f"  ⚠️ Deprecated: {reason}")
-            
-            # Interfaces
-            if type_info.get("interfaces"):
-                output.append("\n## Implements Interfaces")
-                for interface in type_info["interfaces"]:
-                    output.append(f"- {interface.get('name', 'Unknown')}")
-            
-            # Possible types (for UNION and INTERFACE)
-            if type_info.get("possibleTypes"):
-                output.append("\n## Possible Types")
-                for possible_type in type_info["possibleTypes"]:
-                    output.append(f"- {possible_type.get('name', 'Unknown')}")
+                return iter([f"Type '{type_name}' not found in schema"])
             
-            return "\n".join(output)
+            return self._render_type_info(type_name, type_info)
             
         except Exception as e:
-            return f"Error getting type info for '{type_name}': {str(e)}"
+            return iter([f"Error getting type info for '{type_name}': {str(e)}"])
+    
+    def _render_type_info(self, type_name: str, type_info: Dict[str, Any]) -> Iterator[str]:
+        yield f"# Type: {type_name}\n"
+        
+        # Basic info
+        yield f"**Kind:** {type_info.get('kind', 'Unknown')}"
+        if type_info.get("description"):
+            yield f"**Description:** {type_info['description']}"
+        
+        # Fields (for OBJECT and INTERFACE types)
+        if type_info.get("fields"):
+            yield "\n## Fields"
+            for field in type_info["fields"]:
+                field_name = field.get("name", "")
+                field_type = self._format_type_ref(field.get("type", {}))
+                field_desc = field.get("description", "")
+                
+                yield f"### {field_name}: {field_type}"
+                if field_desc:
+                    yield f"*{field_desc}*"
+                
+                # Arguments
+                if field.get("args"):
+                    yield "**Arguments:**"
+                    for arg in field["args"]:
+                        arg_name = arg.get("name", "")
+                        arg_type = self._format_type_ref(arg.get("type", {}))
+                        arg_desc = arg.get("description", "")
+                        arg_default = arg.get("defaultValue")
+                        
+                        arg_text = f"- {arg_name}: {arg_type}"
+                        if arg_default:
+                            arg_text += f" = {arg_default}"
+                        if arg_desc:
+                            arg_text += f" - {arg_desc}"
+                        yield arg_text
+                
+                if field.get("isDeprecated"):
+                    reason = field.get("deprecationReason", "No reason provided")
+                    yield f"**⚠️ Deprecated:** {reason}"
+                
+                yield ""
+        
+        # Input fields (for INPUT types)
+        if type_info.get("inputFields"):
+            yield "\n## Input Fields"
+            for field in type_info["inputFields"]:
+                field_name = field.get("name", "")
+                field_type = self._format_type_ref(field.get("type", {}))
+                field_desc = field.get("description", "")
+                default_value = field.get("defaultValue")
+                
+                field_text = f"- **{field_name}**: {field_type}"
+                if default_value:
+                    field_text += f" = {default_value}"
+                if field_desc:
+                    field_text += f" - {field_desc}"
+                yield field_text
+        
+        # Enum values
+        if type_info.get("enumValues"):
+            yield "\n## Enum Values"
+            for value in type_info["enumValues"]:
+                value_name = value.get("name", "")
+                value_desc = value.get("description", "")
+                
+                value_text = f"- **{value_name}**"
+                if value_desc:
+                    value_text += f" - {value_desc}"
+                yield value_text
+                
+                if value.get("isDeprecated"):
+                    reason = value.get("deprecationReason", "No reason provided")
+                    yield f"  ⚠️ Deprecated: {reason}"
+        
+        # Interfaces
+        if type_info.get("interfaces"):
+            yield "\n## Implements Interfaces"
+            for interface in type_info["interfaces"]:
+                yield f"- {interface.get('name', 'Unknown')}"
+        
+        # Possible types (for UNION and INTERFACE)
+        if type_info.get("possibleTypes"):
+            yield "\n## Possible Types"
+            for possible_type in type_info["possibleTypes"]:
+                yield f"- {possible_type.get('name', 'Unknown')}"
     
     async def list_queries(self) -> str:
         """List all available Query operations."""
+        return render(await self.iter_list_queries())
+    
+    async def iter_list_queries(self) -> Iterator[str]:
+        """list_queries() output as lines, rendered as they are consumed."""
         try:
-            schema = await self._get_schema()
+            schema = (await self._get_index()).schema
             query_type_name = schema.get("queryType", {}).get("name")
             if not query_type_name:
-                return "No Query type found in schema"
+                return iter(["No Query type found in schema"])
             
             return await self._list_operations(query_type_name, "Query")
             
         except Exception as e:
-            return f"Error listing queries: {str(e)}"
+            return iter([f"Error listing queries: {str(e)}"])
     
     async def list_mutations(self) -> str:
         """List all available Mutation operations."""
+        return render(await self.iter_list_mutations())
+    
+    async def iter_list_mutations(self) -> Iterator[str]:
+        """list_mutations() output as lines, rendered as they are consumed."""
         try:
-            schema = await self._get_schema()
+            schema = (await self._get_index()).schema
             mutation_type_name = schema.get("mutationType", {}).get("name")
             if not mutation_type_name:
-                return "No Mutation type found in schema"
+                return iter(["No Mutation type found in schema"])
             
             return await self._list_operations(mutation_type_name, "Mutation")
             
         except Exception as e:
-            return f"Error listing mutations: {str(e)}"
+            return iter([f"Error listing mutations: {str(e)}"])
     
-    async def _list_operations(self, type_name: str, operation_type: str) -> str:
+    async def _list_operations(self, type_name: str, operation_type: str) -> Iterator[str]:
         """List operations for a given root type."""
-        schema = await self._get_schema()
-        types = schema.get("types", [])
+        index = await self._get_index()
         
-        type_info = next((t for t in types if t.get("name") == type_name), None)
+        type_info = index.get_type(type_name)
         if not type_info:
-            return f"{operation_type} type '{type_name}' not found"
+            return iter([f"{operation_type} type '{type_name}' not found"])
         
         fields = type_info.get("fields", [])
         if not fields:
-            return f"No {operation_type.lower()} operations found"
+            return iter([f"No {operation_type.lower()} operations found"])
         
-        output = [f"# {operation_type} Operations ({len(fields)} total)\n"]
+        return self._render_operations(fields, operation_type)
+    
+    def _render_operations(self, fields: List[Dict[str, Any]], operation_type: str) -> Iterator[str]:
+        yield f"# {operation_type} Operations ({len(fields)} total)\n"
         
         for field in sorted(fields, key=lambda x: x.get("name", "")):
             field_name = field.get("name", "")
             field_type = self._format_type_ref(field.get("type", {}))
             field_desc = field.get("description", "")
             
-            output.append(f"## {field_name}")
-            output.append(f"**Returns:** {field_type}")
+            yield f"## {field_name}"
+            yield f"**Returns:** {field_type}"
             if field_desc:
-                output.append(f"**Description:** {field_desc}")
+                yield f"**Description:** {field_desc}"
             
             # Arguments
             if field.get("args"):
-                output.append("**Arguments:**")
+                yield "**Arguments:**"
                 for arg in field["args"]:
                     arg_name = arg.get("name", "")
                     arg_type = self._format_type_ref(arg.get("type", {}))
@@ -435,238 +635,650 @@ class GraphQLClient:
                         arg_text += f" = {default_value}"
                     if arg_desc:
                         arg_text += f" - {arg_desc}"
-                    output.append(arg_text)
+                    yield arg_text
             
             if field.get("isDeprecated"):
                 reason = field.get("deprecationReason", "No reason provided")
-                output.append(f"**⚠️ Deprecated:** {reason}")
+                yield f"**⚠️ Deprecated:** {reason}"
             
-            output.append("")
-        
-        return "\n".join(output)
+            yield ""
     
     async def analyze_relations(self, type_name: Optional[str] = None) -> str:
         """Analyze relationships between types."""
+        return render(await self.iter_analyze_relations(type_name))
+    
+    async def iter_analyze_relations(self, type_name: Optional[str] = None) -> Iterator[str]:
+        """analyze_relations() output as lines, rendered as they are consumed."""
         try:
-            schema = await self._get_schema()
-            types = schema.get("types", [])
-            user_types = [t for t in types if not t.get("name", "").startswith("__")]
+            index = await self._get_index()
             
             if type_name:
                 # Analyze relations for a specific type
-                return await self._analyze_type_relations(type_name, user_types)
+                return iter(self._analyze_type_relations(type_name, index))
             else:
                 # Analyze all relations
-                return await self._analyze_all_relations(user_types)
+                return self._analyze_all_relations(index)
                 
         except Exception as e:
-            return f"Error analyzing relations: {str(e)}"
+            return iter([f"Error analyzing relations: {str(e)}"])
     
-    async def _analyze_type_relations(self, type_name: str, types: List[Dict[str, Any]]) -> str:
+    def _analyze_type_relations(self, type_name: str, index: SchemaIndex) -> List[str]:
         """Analyze relations for a specific type."""
-        type_info = next((t for t in types if t.get("name") == type_name), None)
+        type_info = index.get_user_type(type_name)
         if not type_info:
-            return f"Type '{type_name}' not found"
+            return [f"Type '{type_name}' not found"]
         
         output = [f"# Relations for Type: {type_name}\n"]
         
         # Fields that reference other types
         if type_info.get("fields"):
             output.append("## Fields Referencing Other Types")
-            for field in type_info["fields"]:
-                field_name = field.get("name", "")
-                field_type = field.get("type", {})
-                referenced_type = self._extract_base_type_name(field_type)
-                
-                if referenced_type and referenced_type != type_name and not referenced_type.startswith("__"):
-                    output.append(f"- **{field_name}** → {referenced_type}")
+            for field_name, referenced_type in index.outgoing.get(type_name, []):
+                output.append(f"- **{field_name}** → {referenced_type}")
         
         # Types that reference this type
         output.append(f"\n## Types Referencing {type_name}")
-        referencing_types = []
-        
-        for other_type in types:
-            if other_type.get("name") == type_name:
-                continue
-            
-            if other_type.get("fields"):
-                for field in other_type["fields"]:
-                    field_type = field.get("type", {})
-                    referenced_type = self._extract_base_type_name(field_type)
-                    
-                    if referenced_type == type_name:
-                        referencing_types.append({
-                            "type": other_type.get("name"),
-                            "field": field.get("name")
-                        })
+        referencing_types = index.incoming.get(type_name, [])
         
         if referencing_types:
-            for ref in referencing_types:
-                output.append(f"- **{ref['type']}.{ref['field']}** → {type_name}")
+            for ref_type, ref_field in referencing_types:
+                output.append(f"- **{ref_type}.{ref_field}** → {type_name}")
         else:
             output.append("No types reference this type")
         
-        return "\n".join(output)
+        return output
     
-    async def _analyze_all_relations(self, types: List[Dict[str, Any]]) -> str:
+    def _analyze_all_relations(self, index: SchemaIndex) -> Iterator[str]:
         """Analyze all type relations in the schema."""
-        output = ["# Schema Type Relations\n"]
-        
-        relations = {}
-        
-        for type_info in types:
-            type_name = type_info.get("name", "")
-            if not type_info.get("fields"):
-                continue
-            
-            for field in type_info["fields"]:
-                field_type = field.get("type", {})
-                referenced_type = self._extract_base_type_name(field_type)
-                
-                if referenced_type and referenced_type != type_name and not referenced_type.startswith("__"):
-                    if type_name not in relations:
-                        relations[type_name] = set()
-                    relations[type_name].add(referenced_type)
+        yield "# Schema Type Relations\n"
         
         # Output relations
-        for type_name, referenced_types in sorted(relations.items()):
-            output.append(f"## {type_name}")
-            for ref_type in sorted(referenced_types):
-                output.append(f"- → {ref_type}")
-            output.append("")
-        
-        return "\n".join(output)
+        for type_name, references in sorted(index.outgoing.items()):
+            yield f"## {type_name}"
+            for ref_type in sorted({referenced_type for _, referenced_type in references}):
+                yield f"- → {ref_type}"
+            yield ""
     
     def _extract_base_type_name(self, type_ref: Dict[str, Any]) -> Optional[str]:
         """Extract the base type name from a type reference."""
-        if not type_ref:
-            return None
-        
-        # Navigate through NON_NULL and LIST wrappers
-        current = type_ref
-        while current and current.get("kind") in ["NON_NULL", "LIST"]:
-            current = current.get("ofType")
-        
-        return current.get("name") if current else None
+        return base_type_name(type_ref)
     
     async def search_schema(self, query: str) -> str:
         """Search for types and fields matching a query pattern."""
+        return render(await self.iter_search_schema(query))
+    
+    async def iter_search_schema(self, query: str) -> Iterator[str]:
+        """search_schema() output as lines, rendered as they are consumed."""
         try:
-            schema = await self._get_schema()
-            types = schema.get("types", [])
-            user_types = [t for t in types if not t.get("name", "").startswith("__")]
-            
-            query_lower = query.lower()
-            results = []
-            
-            # Search type names
-            for type_info in user_types:
-                type_name = type_info.get("name", "")
-                if query_lower in type_name.lower():
-                    results.append({
-                        "type": "Type",
-                        "name": type_name,
-                        "description": type_info.get("description", ""),
-                        "kind": type_info.get("kind", "")
-                    })
-                
-                # Search field names
-                if type_info.get("fields"):
-                    for field in type_info["fields"]:
-                        field_name = field.get("name", "")
-                        if query_lower in field_name.lower():
-                            results.append({
-                                "type": "Field",
-                                "name": f"{type_name}.{field_name}",
-                                "description": field.get("description", ""),
-                                "return_type": self._format_type_ref(field.get("type", {}))
-                            })
-            
+            index = await self._get_index()
+            results = index.search(query)
             if not results:
-                return f"No results found for query: '{query}'"
-            
-            output = [f"# Search Results for: '{query}' ({len(results)} found)\n"]
-            
-            # Group by type
-            by_type = {}
-            for result in results:
-                result_type = result["type"]
-                if result_type not in by_type:
-                    by_type[result_type] = []
-                by_type[result_type].append(result)
-            
-            for result_type, items in by_type.items():
-                output.append(f"## {result_type}s ({len(items)})")
-                for item in sorted(items, key=lambda x: x["name"]):
-                    if result_type == "Type":
-                        output.append(f"- **{item['name']}** ({item['kind']})")
-                        if item['description']:
-                            output.append(f"  {item['description']}")
-                    else:  # Field
-                        output.append(f"- **{item['name']}**: {item['return_type']}")
-                        if item['description']:
-                            output.append(f"  {item['description']}")
-                output.append("")
+                return iter([f"No results found for query: '{query}'"])
+            
+            return self._render_search_results(query, results)
+            
+        except Exception as e:
+            return iter([f"Error searching schema: {str(e)}"])
+    
+    def _render_search_results(self, query: str, results: List[Tuple[str, str, Dict[str, Any]]]) -> Iterator[str]:
+        yield f"# Search Results for: '{query}' ({len(results)} found)\n"
+        
+        # Group by type
+        by_type: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        for kind, name, info in results:
+            by_type.setdefault(kind, []).append((name, info))
+        
+        for result_type, items in by_type.items():
+            yield f"## {result_type}s ({len(items)})"
+            for name, info in sorted(items, key=lambda x: x[0]):
+                description = info.get("description", "")
+                if result_type == "Type":
+                    yield f"- **{name}** ({info.get('kind', '')})"
+                else:  # Field
+                    yield f"- **{name}**: {self._format_type_ref(info.get('type', {}))}"
+                if description:
+                    yield f"  {description}"
+            yield ""
+    
+    async def _load_schema_source(self, source: str) -> Dict[str, Any]:
+        """Load one version of the schema: the cached copy, the schema file or the live endpoint."""
+        if source == "cached":
+            return (await self._get_index()).schema
+        elif source == "file":
+            if not self.schema_file:
+                raise ValueError("No schema file is configured for this endpoint")
+            schema = self._load_schema_file()
+            if schema is None:
+                raise ValueError(f"Could not load schema from file {self.schema_file}")
+            return schema
+        elif source == "live":
+            return await self._introspect_live()
+        raise ValueError(f"Unknown schema source '{source}' (expected cached, file or live)")
+    
+    async def diff_schema(self, base: str = "cached", target: Optional[str] = None, update_cache: bool = True) -> str:
+        """Compare two schema versions and, when diffing against the cache, update the index incrementally."""
+        try:
+            from tools.schema_diff import diff_schemas, format_schema_diff
+            
+            target = target or ("file" if self.schema_file else "live")
+            if base == target:
+                return f"Error: base and target are both '{base}'"
+            
+            # Hold on to the cached index: it can be dropped or reloaded while the other side loads
+            index = await self._get_index() if "cached" in (base, target) else None
+            base_schema = index.schema if base == "cached" else await self._load_schema_source(base)
+            target_schema = index.schema if target == "cached" else await self._load_schema_source(target)
+            
+            base_hashes = index.type_hashes if base == "cached" else compute_type_hashes(base_schema)
+            target_hashes = index.type_hashes if target == "cached" else compute_type_hashes(target_schema)
+            base_types = {t.get("name", ""): t for t in base_schema.get("types", [])}
+            target_types = {t.get("name", ""): t for t in target_schema.get("types", [])}
+            
+            diff = diff_schemas(base_types, base_hashes, target_types, target_hashes)
+            output = [format_schema_diff(diff, base, target)]
+            
+            # Bring the cached index up to date by re-indexing only the changed types
+            if base == "cached" and update_cache and base_hashes != target_hashes:
+                output.append("## Cache Update")
+                if self._index is not index:
+                    output.append("The cached schema was dropped or reloaded during the diff and was left as is.")
+                else:
+                    updated = index.update(target_schema, target_hashes)
+                    self._schema_cache = index.schema
+                    if self.on_schema_loaded:
+                        self.on_schema_loaded(self)
+                    output.append(
+                        f"Re-indexed {len(updated['changed']) + len(updated['added'])} type(s) "
+                        f"and dropped {len(updated['removed'])}; "
+                        f"{len(target_hashes) - len(updated['changed']) - len(updated['added'])} unchanged type(s) kept their index entries."
+                    )
             
             return "\n".join(output)
             
         except Exception as e:
-            return f"Error searching schema: {str(e)}"
+            return f"Error diffing schema: {str(e)}"
     
-    async def execute_query(self, query: str, variables: Optional[Dict[str, Any]] = None, operation_name: Optional[str] = None) -> str:
-        """Execute a GraphQL query or mutation and return formatted results."""
+    async def build_query(self, root_field: str, depth: int = 1, include: Optional[List[str]] = None,
+                          exclude: Optional[List[str]] = None, operation: Optional[str] = None,
+                          include_optional_args: bool = True) -> str:
+        """Generate a query/mutation document for a root field, ready for execute-query."""
         try:
-            # Validate query structure
-            query = query.strip()
-            if not query:
-                return "Error: Query cannot be empty"
+            from tools.query_builder import MAX_DEPTH, build_document, find_root_field
             
-            # Check for potentially dangerous operations (basic safety check)
-            dangerous_keywords = ['drop', 'delete', 'truncate', 'alter', 'create']
-            query_lower = query.lower()
-            for keyword in dangerous_keywords:
-                if keyword in query_lower and 'mutation' not in query_lower:
-                    return f"Warning: Query contains potentially dangerous keyword '{keyword}'. Please use GraphQL mutations for data modifications."
+            if depth < 0 or depth > MAX_DEPTH:
+                return f"Error: depth must be between 0 and {MAX_DEPTH}"
             
-            # Execute the query
-            result = await self._execute_query(query, variables, operation_name)
+            index = await self._get_index()
+            found = find_root_field(index, root_field, operation)
+            if not found:
+                scope = f"{operation} " if operation else ""
+                return f"Root field '{root_field}' not found on the {scope}root types"
             
-            # Format the response
-            output = ["# GraphQL Query Results\n"]
+            op, field = found
+            result = build_document(index, op, field, depth, include, exclude, include_optional_args)
             
-            # Show the executed query
-            output.append("## Query")
-            output.append(f"```graphql")
-            output.append(query)
+            output = [f"# Generated {op.capitalize()}: {root_field}\n"]
+            output.append("```graphql")
+            output.append(result["document"])
             output.append("```")
             
-            if variables:
+            if result["variables"]:
                 output.append("\n## Variables")
-                output.append(f"```json")
-                output.append(json.dumps(variables, indent=2))
-                output.append("```")
+                for arg in result["variables"]:
+                    arg_text = f"- ${arg.get('name', '')}: {self._format_type_ref(arg.get('type', {}))}"
+                    if arg.get("description"):
+                        arg_text += f" - {arg['description']}"
+                    output.append(arg_text)
+            
+            output.append(
+                f"\n**Selection:** {result['field_count']} fields, depth {depth} "
+                f"(expansion cache: {result['memo_hits']} hits, {result['memo_misses']} misses)"
+            )
+            output.append(f"**Operation Name:** {result['operation_name']}")
+            
+            return "\n".join(output)
+            
+        except Exception as e:
+            return f"Error building query for '{root_field}': {str(e)}"
+    
+    async def aggregate(self, table: str, functions: Optional[Dict[str, List[str]]] = None,
+                        where: Optional[Dict[str, Any]] = None, group_by: Optional[List[str]] = None,
+                        count_distinct: Optional[List[str]] = None, max_groups: Optional[int] = None) -> str:
+        """Run count/sum/avg/min/max through the table's _aggregate field, optionally per group."""
+        try:
+            from tools.aggregation import (
+                DEFAULT_MAX_GROUPS, batches, build_aggregate_document, build_groups_document,
+                describe_aggregate, flatten_aggregate, group_filter, metric_names, split_groups, validate_request
+            )
+            
+            functions = {name: list(columns) for name, columns in (functions or {}).items()}
+            group_by = list(group_by or [])
+            count_distinct = list(count_distinct or [])
+            max_groups = max_groups or DEFAULT_MAX_GROUPS
+            
+            index = await self._get_index()
+            info = describe_aggregate(index, table)
+            if not info:
+                return f"No aggregate field for '{table}' (expected {table}_aggregate on the query root)"
+            
+            error = validate_request(info, functions, group_by, count_distinct)
+            if error:
+                return f"Error: {error}"
+            
+            metrics = metric_names(functions, count_distinct)
+            output = [f"# Aggregate: {info['table']}\n"]
+            if where:
+                output.append(f"**Filter:** `{json_codec.dumps_canonical(where).decode()}`")
+            
+            if not group_by:
+                document = build_aggregate_document(info, functions, count_distinct)
+                result = await self._execute_query(document, {"w0": where or {}})
+                values = flatten_aggregate((result.get(info["root_field"]) or {}).get("aggregate"))
+                output.append("")
+                output.append("| Metric | Value |")
+                output.append("|--------|-------|")
+                for metric in metrics:
+                    value = values.get(metric)
+                    output.append(f"| {metric} | {'null' if value is None else value} |")
+                return "\n".join(output)
+            
+            # Group-by: distinct group values, then one aliased _aggregate per group
+            rows = (await self._execute_query(
+                build_groups_document(info, group_by), {"where": where or {}, "limit": max_groups + 1}
+            )).get(info["select_field"]) or []
+            groups, truncated = split_groups([{column: row.get(column) for column in group_by} for row in rows], max_groups)
             
+            async def run_batch(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+                document = build_aggregate_document(info, functions, count_distinct, len(batch))
+                variables = {f"w{i}": group_filter(where, group) for i, group in enumerate(batch)}
+                result = await self._execute_query(document, variables)
+                if len(batch) == 1:
+                    return [flatten_aggregate((result.get(info["root_field"]) or {}).get("aggregate"))]
+                return [flatten_aggregate((result.get(f"g{i}") or {}).get("aggregate")) for i in range(len(batch))]
+            
+            group_batches = batches(groups)
+            results = await asyncio.gather(*(run_batch(batch) for batch in group_batches))
+            values = [value for batch in results for value in batch]
+            
+            output.append(f"**Grouped by:** {', '.join(group_by)} ({len(groups)} groups, {len(group_batches)} aggregate requests)\n")
+            if not groups:
+                output.append("No rows match")
+                return "\n".join(output)
+            
+            columns = group_by + metrics
+            output.append("| " + " | ".join(columns) + " |")
+            output.append("|" + "|".join("---" for _ in columns) + "|")
+            for group, value in zip(groups, values):
+                cells = [group.get(column) for column in group_by] + [value.get(metric) for metric in metrics]
+                output.append("| " + " | ".join("null" if cell is None else str(cell) for cell in cells) + " |")
+            if truncated:
+                output.append(f"\n**Note:** Only the first {max_groups} groups are shown; narrow the filter or raise max_groups")
+            
+            return "\n".join(output)
+        
+        except Exception as e:
+            return f"Error aggregating '{table}': {str(e)}"
+    
+    async def bulk_mutation(self, mutation: str, rows: Optional[List[Any]] = None, rows_file: Optional[str] = None,
+                            on_conflict: Optional[Dict[str, Any]] = None, chunk_rows: Optional[int] = None,
+                            chunk_bytes: Optional[int] = None, concurrency: Optional[int] = None) -> str:
+        """Run insert_<table> or update_<table>_many over many rows as size-bounded chunks, a few in flight at a time."""
+        try:
+            from tools.bulk_mutation import (
+                DEFAULT_CHUNK_BYTES, DEFAULT_CHUNK_ROWS, DEFAULT_WINDOW, describe_bulk_mutation, load_rows
+            )
+            
+            index = await self._get_index()
+            info = describe_bulk_mutation(index, mutation)
+            if not info:
+                return f"Error: '{mutation}' is not an insert_<table> or update_<table>_many field on the mutation root"
+            if on_conflict and not info["on_conflict_type"]:
+                return f"Error: {mutation} does not take on_conflict"
+            
+            if rows_file:
+                rows = load_rows(rows_file)
+            if not rows:
+                return f"Error: No rows to send (pass {info['rows_arg']} as rows or rows_file)"
+            
+            window = max(1, min(concurrency or DEFAULT_WINDOW, self.max_connections))
+            totals = await self._bulk_mutation(
+                info, rows, on_conflict, chunk_rows or DEFAULT_CHUNK_ROWS, chunk_bytes or DEFAULT_CHUNK_BYTES, window
+            )
+            failures, elapsed = totals["failures"], totals["elapsed"]
+            
+            failed_rows = sum(last - first + 1 for first, last, _ in failures)
+            output = [f"# Bulk {info['root_field']}\n"]
+            output.append(f"- **rows:** {len(rows)} in {totals['chunks']} chunks, up to {window} in flight")
+            output.append(f"- **affected_rows:** {totals['affected_rows']}")
+            output.append(f"- **failed chunks:** {len(failures)} ({failed_rows} rows)")
+            output.append(f"- **time:** {elapsed:.2f}s ({len(rows) / elapsed:.0f} rows/s)" if elapsed else "- **time:** 0s")
+            if failures:
+                output.append("\nEach chunk is its own transaction; only the rows below were not applied.\n")
+                output.append("| Rows | Error |")
+                output.append("|------|-------|")
+                for first, last, error in sorted(failures)[:20]:
+                    output.append(f"| {first}-{last} | {error} |")
+                if len(failures) > 20:
+                    output.append(f"\n**Note:** {len(failures) - 20} more failed chunks not shown")
+            
+            return "\n".join(output)
+        
+        except Exception as e:
+            return f"Error running bulk {mutation}: {str(e)}"
+    
+    async def _bulk_mutation(self, info: Dict[str, Any], rows: List[Any], on_conflict: Optional[Dict[str, Any]],
+                             chunk_rows: int, chunk_bytes: int, window: int) -> Dict[str, Any]:
+        """Send the chunks with at most `window` in flight; returns chunk and affected_rows totals and (first, last, error) failures."""
+        from tools.bulk_mutation import affected_rows, build_bulk_document, split_rows
+        
+        document = build_bulk_document(info, bool(on_conflict))
+        chunks = split_rows(rows, chunk_rows, chunk_bytes)
+        totals: Dict[str, Any] = {"chunks": 0, "affected_rows": 0, "failures": []}
+        
+        async def send_chunks():
+            # The workers share one chunk iterator, so at most `window` chunks are in flight
+            for start, chunk in chunks:
+                totals["chunks"] += 1
+                variables: Dict[str, Any] = {"rows": chunk}
+                if on_conflict:
+                    variables["on_conflict"] = on_conflict
+                try:
+                    # Await before touching the total; `+=` would read it first and lose concurrent updates
+                    data = await self._execute_query(document, variables)
+                except Exception as e:
+                    # httpx status errors carry a second "for more information" line
+                    message = (str(e) or type(e).__name__).splitlines()[0]
+                    totals["failures"].append((start, start + len(chunk) - 1, message))
+                    continue
+                totals["affected_rows"] += affected_rows(info, data)
+        
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await asyncio.gather(*(send_chunks() for _ in range(window)))
+        totals["elapsed"] = loop.time() - started
+        return totals
+    
+    async def explain_query(self, query: str, variables: Optional[Dict[str, Any]] = None, operation_name: Optional[str] = None,
+                            role: Optional[str] = None, row_threshold: Optional[int] = None) -> str:
+        """Generated SQL and Postgres plan per root field from Hasura's explain API, with plan warnings."""
+        try:
+            from tools.query_plan import DEFAULT_ROW_THRESHOLD, explain_url, parse_plan, plan_warnings, where_columns
+            
+            query = (query or "").strip()
+            if not query:
+                return "Error: Query cannot be empty"
+            
+            filter_columns = where_columns(query, variables)
+            payload: Dict[str, Any] = {"query": {"query": query, "variables": variables or {}}}
             if operation_name:
-                output.append(f"\n**Operation Name:** {operation_name}")
+                payload["query"]["operationName"] = operation_name
+            if role:
+                payload["user"] = {"x-hasura-role": role}
             
-            # Show the results
-            output.append("\n## Results")
-            if result:
-                output.append("```json")
-                output.append(json.dumps(result, indent=2))
-                output.append("```")
+            url = explain_url(self.endpoint)
+            
+            async def send(timeout: float) -> Any:
+                response, result = await self._post(payload, timeout, url)
+                # Hasura reports a bad query in the body (with a 4xx); that is an answer, not a failure to retry
+                if isinstance(result, dict) and ("error" in result or "errors" in result):
+                    return result
+                response.raise_for_status()
+                return result
+            
+            # Read-only, so it runs under the query policy (timeout, retries, breaker), a limiter slot per attempt
+            deadline = asyncio.get_running_loop().time() + self.resilience.policy.timeout_for("query")
+            result = await self.resilience.call(
+                "query", send, deadline, slot=lambda wait: self.limiter.slot("query", deadline, wait)
+            )
+            if isinstance(result, dict) and ("error" in result or "errors" in result):
+                message = result.get("error") or ", ".join(error.get("message", str(error)) for error in result["errors"])
+                return f"Error explaining query: {message}"
+            
+            output = ["# Query Plan\n"]
+            output.append(f"**Explain Endpoint:** {url}")
+            if role:
+                output.append(f"**Role:** {role}")
+            
+            for entry in result or []:
+                field = entry.get("field", "")
+                plan_lines = entry.get("plan") or []
+                nodes = parse_plan(plan_lines)
+                warnings = plan_warnings(nodes, filter_columns.get(field, []), row_threshold or DEFAULT_ROW_THRESHOLD)
                 
-                # Add summary
-                if isinstance(result, dict):
-                    keys = list(result.keys())
-                    output.append(f"\n**Summary:** Retrieved {len(keys)} root field(s): {', '.join(keys)}")
-                elif isinstance(result, list):
-                    output.append(f"\n**Summary:** Retrieved {len(result)} items")
-            else:
-                output.append("No data returned")
+                output.append(f"\n## {field}")
+                if nodes:
+                    output.append(f"**Estimated Cost:** {nodes[0]['total_cost']:g} ({nodes[0]['rows']} rows)")
+                if warnings:
+                    output.append("\n### Warnings")
+                    output.extend(f"- {warning}" for warning in warnings)
+                output.append("\n### SQL")
+                output.append("```sql")
+                output.append(entry.get("sql", ""))
+                output.append("```")
+                output.append("\n### Plan")
+                output.append("```")
+                output.extend(plan_lines)
+                output.append("```")
+            
+            if not result:
+                output.append("\nNo plans returned")
             
             return "\n".join(output)
             
+        except Exception as e:
+            return f"Error explaining query: {str(e)}"
+    
+    def get_metrics(self) -> str:
+        """Request counters, circuit breaker state and recent latency for this endpoint."""
+        snapshot = self.resilience.snapshot()
+        policy = self.resilience.policy
+        output = ["# GraphQL Endpoint Metrics\n"]
+        output.append(f"**Endpoint:** {self.endpoint}")
+        
+        breaker = snapshot["breaker"]
+        output.append(
+            f"**Circuit Breaker:** {breaker['state']} ({breaker['consecutive_failures']} consecutive failures, "
+            f"opened {breaker['opens']} times)\n"
+        )
+        
+        output.append("## Requests")
+        for name, value in snapshot["counters"].items():
+            output.append(f"- **{name}:** {value}")
+        stats = self.apq_stats
+        output.append(f"- **persisted queries:** {stats['hash_only']} hash-only, {stats['registered']} registered, {stats['full']} full")
+        
+        output.append("\n## Latency (recent successful attempts)")
+        if snapshot["latency"]:
+            for op, latency in snapshot["latency"].items():
+                hedge_delay = self.resilience.hedge_delay(op)
+                line = f"- **{op}:** p50 {latency['p50_ms']}ms, p95 {latency['p95_ms']}ms, p99 {latency['p99_ms']}ms ({latency['samples']} samples)"
+                if hedge_delay is not None:
+                    line += f", hedging after {hedge_delay * 1000:.0f}ms"
+                output.append(line)
+        else:
+            output.append("No requests yet")
+        
+        limiter = self.limiter.snapshot()
+        output.append("\n## Concurrency Limiter")
+        if limiter["enabled"]:
+            output.append(f"- **Limit:** {limiter['limit']} (max {limiter['max_limit']}), {limiter['in_flight']} in flight, {limiter['queued']} queued")
+            if limiter["min_rtt_ms"] is not None:
+                output.append(f"- **Minimum latency:** {limiter['min_rtt_ms']}ms (longest queue wait {limiter['max_queue_wait_ms']}ms)")
+            for name, value in limiter["counters"].items():
+                output.append(f"- **{name}:** {value}")
+        else:
+            output.append("Disabled")
+        
+        if self._subscriptions is not None:
+            subscriptions = self._subscriptions.snapshot()
+            output.append("\n## Subscriptions")
+            output.append(
+                f"- **Websocket:** {'connected' if subscriptions['connected'] else 'not connected'} "
+                f"({subscriptions['counters']['connections']} opened)"
+            )
+            output.append(
+                f"- **Subscriptions:** {subscriptions['active']} running, {subscriptions['counters']['subscriptions']} started, "
+                f"{subscriptions['counters']['events']} events received"
+            )
+            output.append(f"- **Buffers:** {subscriptions['buffered']} events waiting, {subscriptions['dropped']} dropped")
+        
+        output.append("\n## Policy")
+        output.append("- **Timeouts:** " + ", ".join(f"{op} {seconds:g}s" for op, seconds in policy.timeouts.items()))
+        output.append(f"- **Retries:** up to {policy.max_retries} (full jitter backoff from {policy.backoff_base * 1000:.0f}ms, capped at {policy.backoff_max * 1000:.0f}ms; mutations only when the request was never sent)")
+        output.append(f"- **Hedged reads:** {'on' if policy.hedge else 'off'} (after p95, at least {policy.hedge_min_delay * 1000:.0f}ms)")
+        output.append(f"- **Circuit breaker:** opens after {policy.breaker_failures} consecutive failures for {policy.breaker_reset:g}s")
+        
+        return "\n".join(output)
+    
+    async def subscribe(self, query: str, variables: Optional[Dict[str, Any]] = None, operation_name: Optional[str] = None,
+                        buffer_size: Optional[int] = None, overflow: str = "drop_oldest") -> str:
+        """Start a subscription whose events are buffered for poll_subscription."""
+        try:
+            from subscriptions import DEFAULT_BUFFER_SIZE
+            
+            query = (query or "").strip()
+            if operation_type(query) != "subscription":
+                return "Error: The document is not a subscription; use execute-query for queries and mutations"
+            
+            manager = self._get_subscriptions()
+            subscription = await manager.subscribe(query, variables, operation_name, buffer_size or DEFAULT_BUFFER_SIZE, overflow)
+            
+            output = ["# Subscription Started\n"]
+            output.append(f"**Subscription ID:** {subscription.id}")
+            output.append(f"**Websocket:** {manager.url}")
+            output.append(f"**Buffer:** {subscription.ring.capacity} events, {overflow.replace('_', ' ')} when full")
+            output.append("\nUse poll-subscription with this ID, starting from cursor 0, to read events; unsubscribe when done.")
+            return "\n".join(output)
+            
+        except Exception as e:
+            return f"Error starting subscription: {str(e)}"
+    
+    async def poll_subscription(self, subscription_id: str, cursor: int = 0, max_events: int = 100, wait_seconds: float = 0.0) -> str:
+        """Read buffered subscription events from a cursor."""
+        return render(await self.iter_poll_subscription(subscription_id, cursor, max_events, wait_seconds))
+    
+    async def iter_poll_subscription(self, subscription_id: str, cursor: int = 0, max_events: int = 100,
+                                     wait_seconds: float = 0.0) -> Iterator[str]:
+        """poll_subscription() output as lines; waits up to wait_seconds for the first event."""
+        from datetime import datetime, timezone
+        
+        subscription = self._get_subscriptions().subscriptions.get(subscription_id)
+        if subscription is None:
+            return iter([f"Error: Unknown subscription '{subscription_id}'"])
+        
+        ring = subscription.ring
+        if wait_seconds > 0 and subscription.running:
+            await ring.wait(cursor, wait_seconds)
+        events, next_cursor, missed = ring.read(cursor, max_events)
+        
+        output = [f"# Subscription {subscription.id}\n"]
+        status = f"**Status:** {subscription.status}"
+        if subscription.error:
+            status += f" ({subscription.error})"
+        output.append(status)
+        output.append(f"**Events:** {len(events)} returned, {len(ring) - len(events)} more buffered, {ring.dropped} dropped in total")
+        output.append(f"**Next Cursor:** {next_cursor}")
+        if missed:
+            output.append(
+                f"\n**Note:** {missed} event(s) after cursor {cursor} were dropped because the buffer was full; "
+                f"poll more often or use a larger buffer_size"
+            )
+        
+        if not events:
+            output.append("\nNo new events")
+            return iter(output)
+        
+        rows = [
+            {
+                "cursor": event_cursor,
+                "received_at": datetime.fromtimestamp(received_at, timezone.utc).isoformat(timespec="milliseconds"),
+                "payload": payload
+            }
+            for event_cursor, received_at, payload in events
+        ]
+        output.append("\n## Events")
+        output.append("```json")
+        return itertools.chain(output, json_codec.iter_pretty(rows, 1), ["```"])
+    
+    async def unsubscribe(self, subscription_id: str) -> str:
+        """Stop a subscription and discard its buffered events."""
+        if self._subscriptions is None:
+            return f"Error: Unknown subscription '{subscription_id}'"
+        subscription = await self._subscriptions.unsubscribe(subscription_id)
+        if subscription is None:
+            return f"Error: Unknown subscription '{subscription_id}'"
+        return (
+            f"Unsubscribed {subscription.id}: {subscription.ring.next_cursor} events received, "
+            f"{len(subscription.ring)} buffered discarded, {subscription.ring.dropped} dropped"
+        )
+    
+    def list_persisted_queries(self) -> str:
+        """List registered operation documents and this endpoint's persisted query status."""
+        import os
+        from persisted_queries import REPO_ROOT, get_default_registry
+        
+        registry = get_default_registry()
+        documents = registry.documents()
+        output = [f"# Persisted Queries ({len(documents)} registered)\n"]
+        
+        if not self.persisted_queries:
+            status = "disabled"
+        elif self._apq_supported is None:
+            status = "not yet negotiated"
+        else:
+            status = "supported" if self._apq_supported else "not supported by server (sending full documents)"
+        output.append(f"**Endpoint:** {self.endpoint}")
+        output.append(f"**Automatic Persisted Queries:** {status}")
+        stats = self.apq_stats
+        output.append(
+            f"**Requests:** {stats['hash_only']} hash-only, {stats['registered']} registered, {stats['full']} full "
+            f"({stats['bytes_saved']} document bytes not sent)\n"
+        )
+        
+        if documents:
+            output.append("## Documents")
+            for document in documents:
+                line = f"- **{document.name}** `{document.sha256[:16]}`"
+                if document.source:
+                    line += f" - {os.path.relpath(document.source, REPO_ROOT)}"
+                output.append(line)
+        else:
+            output.append("No documents registered")
+        
+        return "\n".join(output)
+    
+    async def execute_query(self, query: Optional[str], variables: Optional[Dict[str, Any]] = None, operation_name: Optional[str] = None,
+                            persisted_query: Optional[str] = None) -> str:
+        """Execute a GraphQL query or mutation and return formatted results."""
+        return render(await self.iter_execute_query(query, variables, operation_name, persisted_query))
+    
+    async def iter_execute_query(self, query: Optional[str], variables: Optional[Dict[str, Any]] = None,
+                                 operation_name: Optional[str] = None, persisted_query: Optional[str] = None) -> Iterator[str]:
+        """execute_query() output as lines; the result JSON is pretty-printed one row at a time as it is consumed."""
+        try:
+            if persisted_query and not query:
+                from persisted_queries import get_default_registry
+                
+                registry = get_default_registry()
+                document = registry.get(persisted_query)
+                if document is None:
+                    return iter([f"Error: Unknown persisted query '{persisted_query}'. Registered: {', '.join(registry.names()) or 'none'}"])
+                query = document.document
+            
+            # Validate query structure
+            query = (query or "").strip()
+            if not query:
+                return iter(["Error: Query cannot be empty"])
+            
+            # Check for potentially dangerous operations (basic safety check)
+            keyword = dangerous_keyword(query)
+            if keyword:
+                return iter([f"Warning: Query contains potentially dangerous keyword '{keyword}'. Please use GraphQL mutations for data modifications."])
+            
+            # Execute the query
+            result = await self._execute_query(query, variables, operation_name)
+            return self._render_query_result(query, variables, operation_name, result)
+            
         except Exception as e:
             error_output = [
                 "# GraphQL Query Error\n",
@@ -681,8 +1293,44 @@ class GraphQLClient:
                 error_output.extend([
                     "\n## Variables",
                     "```json",
-                    json.dumps(variables, indent=2),
+                    json_codec.dumps_pretty(variables),
                     "```"
                 ])
             
-            return "\n".join(error_output)
\ No newline at end of file
+            return iter(error_output)
+    
+    def _render_query_result(self, query: str, variables: Optional[Dict[str, Any]], operation_name: Optional[str],
+                             result: Any) -> Iterator[str]:
+        # Format the response
+        yield "# GraphQL Query Results\n"
+        
+        # Show the executed query
+        yield "## Query"
+        yield "```graphql"
+        yield query
+        yield "```"
+        
+        if variables:
+            yield "\n## Variables"
+            yield "```json"
+            yield json_codec.dumps_pretty(variables)
+            yield "```"
+        
+        if operation_name:
+            yield f"\n**Operation Name:** {operation_name}"
+        
+        # Show the results
+        yield "\n## Results"
+        if result:
+            yield "```json"
+            yield from json_codec.iter_pretty(result)
+            yield "```"
+            
+            # Add summary
+            if isinstance(result, dict):
+                keys = list(result.keys())
+                yield f"\n**Summary:** Retrieved {len(keys)} root field(s): {', '.join(keys)}"
+            elif isinstance(result, list):
+                yield f"\n**Summary:** Retrieved {len(result)} items"
+        else:
+            yield "No data returned"
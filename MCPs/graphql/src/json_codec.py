@@ -0,0 +1,184 @@
+"""
+JSON encoding/decoding with an optional fast backend.
+
+orjson is used when installed, the stdlib json module otherwise; GRAPHQL_JSON_CODEC
+(auto, orjson or stdlib) forces a choice. Response bodies are fed to a StreamDecoder
+chunk by chunk as they arrive: with ijson's C backend they are parsed incrementally,
+otherwise chunks are collected into one buffer and parsed straight from bytes
+(no intermediate str).
+"""
+
+import json
+import os
+from typing import Any, Iterator, Optional
+
+
+def _select_backend():
+    choice = os.getenv("GRAPHQL_JSON_CODEC", "auto").lower()
+    if choice in ("auto", "orjson"):
+        try:
+            import orjson
+            return "orjson", orjson
+        except ImportError:
+            if choice == "orjson":
+                raise
+    return "stdlib", None
+
+
+BACKEND, _orjson = _select_backend()
+
+
+def _select_stream_backend():
+    """ijson only pays off with its C (yajl2_c) backend; the pure Python one is slower than buffering."""
+    try:
+        import ijson
+    except ImportError:
+        return None
+    return ijson if getattr(ijson, "backend", "") == "yajl2_c" else None
+
+
+_ijson = _select_stream_backend()
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON from bytes or str."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Compact UTF-8 encoding, used for request bodies."""
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def dumps_canonical(obj: Any) -> bytes:
+    """Compact encoding with sorted keys, stable enough for content hashing."""
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj, option=_orjson.OPT_SORT_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def dumps_pretty(obj: Any) -> str:
+    """Two-space indented text for tool output."""
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2).decode()
+        except TypeError:
+            pass
+    # UTF-8 text like orjson, so tool output doesn't depend on the installed backend
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+# List elements encoded per iter_pretty() segment
+PRETTY_BATCH = 256
+
+
+def iter_pretty(obj: Any, depth: int = 2) -> Iterator[str]:
+    """
+    dumps_pretty() in pieces: joining the yielded segments with newlines gives the same text.
+    
+    Containers are opened up `depth` levels deep (e.g. data -> root field -> rows), so
+    each segment is one nested value or a run of rows rather than the whole document.
+    """
+    if depth <= 0 or not isinstance(obj, (dict, list)) or not obj:
+        yield dumps_pretty(obj)
+        return
+    
+    if isinstance(obj, list) and depth == 1:
+        # Innermost level: encode runs of elements in one call each; "[\n  a,\n  b\n]"[2:-2]
+        # is their lines, already indented
+        yield "["
+        for i in range(0, len(obj), PRETTY_BATCH):
+            yield dumps_pretty(obj[i:i + PRETTY_BATCH])[2:-2] + ("," if i + PRETTY_BATCH < len(obj) else "")
+        yield "]"
+        return
+    
+    is_dict = isinstance(obj, dict)
+    items = obj.items() if is_dict else ((None, value) for value in obj)
+    last = len(obj) - 1
+    yield "{" if is_dict else "["
+    for i, (key, value) in enumerate(items):
+        prefix = "  " + (dumps_pretty(key) + ": " if is_dict else "")
+        pending = None
+        for n, segment in enumerate(iter_pretty(value, depth - 1)):
+            if pending is not None:
+                yield pending
+            pending = (prefix if n == 0 else "  ") + segment.replace("\n", "\n  ")
+        yield pending + ("," if i < last else "")
+    yield "}" if is_dict else "]"
+
+
+def accept_encoding() -> str:
+    """Accept-Encoding for the response decoders httpx has available."""
+    encodings = ["gzip", "deflate"]
+    try:
+        import brotli  # noqa: F401
+        encodings.append("br")
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.append("br")
+        except ImportError:
+            pass
+    return ", ".join(encodings)
+
+
+class StreamDecoder:
+    """Decodes one JSON document fed in chunks; close() returns the value (ValueError if invalid)."""
+    
+    def __init__(self):
+        self._buffer: Optional[bytearray] = None
+        self._events: Optional[list] = None
+        self._coro = None
+        if _ijson is not None:
+            self._events = []
+            self._coro = _ijson.items_coro(_ListSink(self._events), "", use_float=True)
+        else:
+            self._buffer = bytearray()
+        self.bytes_received = 0
+    
+    def feed(self, chunk: bytes):
+        self.bytes_received += len(chunk)
+        if self._coro is not None:
+            try:
+                self._coro.send(chunk)
+            except _ijson.JSONError as e:
+                raise ValueError(str(e))
+        else:
+            self._buffer += chunk
+    
+    def close(self) -> Any:
+        if self._coro is not None:
+            try:
+                self._coro.close()
+            except _ijson.JSONError as e:
+                raise ValueError(str(e))
+            if not self._events:
+                raise ValueError("Empty JSON body")
+            return self._events[0]
+        
+        data, self._buffer = self._buffer, None
+        if not data:
+            raise ValueError("Empty JSON body")
+        if _orjson is not None:
+            return _orjson.loads(data)
+        return json.loads(data)
+
+
+class _ListSink:
+    """Target for ijson push parsing."""
+    
+    def __init__(self, items: list):
+        self.items = items
+    
+    def send(self, value: Any):
+        self.items.append(value)
@@ -6,9 +6,9 @@ GraphQL MCP Server - A Model Context Protocol server for GraphQL schema introspe
 import asyncio
 import os
 import sys
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, Iterable, List, Optional
 
-from dotenv import load_dotenv
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
@@ -18,187 +18,236 @@ from mcp.types import (
     TextContent,
 )
 
-from graphql_client import GraphQLClient
+from tools.definitions import TOOL_DEFINITIONS
+from tools.rendering import chunk_lines
 
-# Load environment variables
-load_dotenv()
-
-# Initialize GraphQL client
-graphql_client = GraphQLClient(
-    endpoint=os.getenv("GRAPHQL_ENDPOINT", "https://graphql.testimonial.brownforge.com/v1/graphql"),
-    auth_header=os.getenv("GRAPHQL_AUTH_HEADER", "x-hasura-admin-secret"),
-    auth_value=os.getenv("GRAPHQL_AUTH_VALUE", ""),
-    schema_file=os.getenv("GRAPHQL_SCHEMA_FILE")
-)
+# The endpoint registry and client modules are imported on the first tool call so that
+# spawning the server and answering list_tools stays cheap. dotenv and httpx are already
+# loaded by mcp itself; what this defers is our own modules (~10 ms) and graphql-core.
+_registry = None
+# Set from GRAPHQL_WORKLOAD_LOG alongside the registry (None when recording is off)
+_recorder = None
+_tools: Optional[List[Tool]] = None
 
 # Initialize MCP server
 app = Server("graphql-introspection")
 
+def get_registry():
+    """Return the shared endpoint registry, creating it on first use."""
+    global _registry, _recorder
+    if _registry is None:
+        from dotenv import load_dotenv
+
+        # Load environment variables before importing any server module: some read
+        # settings at import time (json_codec reads GRAPHQL_JSON_CODEC)
+        load_dotenv()
+
+        from endpoint_registry import EndpointRegistry
+        from workload import WorkloadRecorder
+
+        _registry = EndpointRegistry.from_env()
+        _recorder = WorkloadRecorder.from_env()
+    return _registry
+
+async def stream_result(lines: Iterable[str]) -> List[TextContent]:
+    """Render output lines into bounded content parts, reporting progress per part if the client asked for it."""
+    try:
+        context = app.request_context
+    except LookupError:
+        # dispatch_tool() called directly rather than through an MCP request
+        context = None
+    progress_token = context.meta.progressToken if context and context.meta else None
+    contents = []
+    rendered = 0
+    for part in chunk_lines(lines):
+        contents.append(TextContent(type="text", text=part))
+        rendered += len(part)
+        if progress_token is not None:
+            await context.session.send_progress_notification(
+                progress_token=progress_token,
+                progress=len(contents),
+                message=f"Rendered {rendered} characters",
+                related_request_id=context.request_id
+            )
+        else:
+            # Let other requests run between parts of a long render
+            await asyncio.sleep(0)
+    return contents
+
 @app.list_tools()
 async def list_tools() -> List[Tool]:
     """List all available GraphQL introspection tools."""
-    return [
-        Tool(
-            name="introspect-schema",
-            description="Get GraphQL schema introspection with pagination for large schemas",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "page": {
-                        "type": "integer",
-                        "description": "Page number (default: 1)",
-                        "minimum": 1
-                    },
-                    "per_page": {
-                        "type": "integer",
-                        "description": "Items per page (default: 20, max: 50)",
-                        "minimum": 1,
-                        "maximum": 50
-                    },
-                    "filter_kind": {
-                        "type": "string",
-                        "description": "Filter by type kind (OBJECT, SCALAR, ENUM, INPUT_OBJECT, INTERFACE, UNION)",
-                        "enum": ["OBJECT", "SCALAR", "ENUM", "INPUT_OBJECT", "INTERFACE", "UNION"]
-                    }
-                },
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="get-type-info",
-            description="Get detailed information about a specific GraphQL type",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "type_name": {
-                        "type": "string",
-                        "description": "The name of the GraphQL type to inspect"
-                    }
-                },
-                "required": ["type_name"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="list-queries",
-            description="List all available Query operations with descriptions and arguments",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="list-mutations",
-            description="List all available Mutation operations with descriptions and arguments",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="analyze-relations",
-            description="Analyze relationships between GraphQL types",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "type_name": {
-                        "type": "string",
-                        "description": "The name of the type to analyze relations for (optional)"
-                    }
-                },
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="search-schema",
-            description="Search for types and fields by name pattern",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Search query to match against type and field names"
-                    }
-                },
-                "required": ["query"],
-                "additionalProperties": False
-            }
-        ),
-        Tool(
-            name="execute-query",
-            description="Execute a GraphQL query or mutation against the endpoint",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "The GraphQL query or mutation to execute"
-                    },
-                    "variables": {
-                        "type": "object",
-                        "description": "Variables for the GraphQL query (optional)",
-                        "additionalProperties": True
-                    },
-                    "operation_name": {
-                        "type": "string",
-                        "description": "Operation name if the query contains multiple operations (optional)"
-                    }
-                },
-                "required": ["query"],
-                "additionalProperties": False
-            }
-        )
-    ]
+    global _tools
+    if _tools is None:
+        _tools = [Tool(**definition) for definition in TOOL_DEFINITIONS]
+    return _tools
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
-    """Handle tool calls for GraphQL introspection."""
+    """Handle tool calls for GraphQL introspection, recording them when GRAPHQL_WORKLOAD_LOG is set."""
+    get_registry()
+    if _recorder is None:
+        return await dispatch_tool(name, arguments)
+
+    started_at = time.time()
+    start = time.perf_counter()
+    contents = await dispatch_tool(name, arguments)
+    _recorder.record(name, arguments, started_at, time.perf_counter() - start, [content.text for content in contents])
+    return contents
+
+async def dispatch_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+    """Run one tool call."""
+    registry = get_registry()
+
+    if name == "list-endpoints":
+        return [TextContent(type="text", text=registry.format_status())]
+
+    try:
+        graphql_client = registry.get_client(arguments.get("endpoint"))
+    except KeyError as e:
+        return [TextContent(type="text", text=f"Error: {e.args[0]}")]
 
     if name == "introspect-schema":
         page = arguments.get("page", 1)
         per_page = min(arguments.get("per_page", 20), 50)  # Cap at 50
         filter_kind = arguments.get("filter_kind")
-        result = await graphql_client.introspect_schema(page, per_page, filter_kind)
-        return [TextContent(type="text", text=result)]
+        return await stream_result(await graphql_client.iter_introspect_schema(page, per_page, filter_kind))
 
     elif name == "get-type-info":
         type_name = arguments.get("type_name")
         if not type_name:
             return [TextContent(type="text", text="Error: type_name is required")]
-        result = await graphql_client.get_type_info(type_name)
-        return [TextContent(type="text", text=result)]
+        return await stream_result(await graphql_client.iter_get_type_info(type_name))
 
     elif name == "list-queries":
-        result = await graphql_client.list_queries()
-        return [TextContent(type="text", text=result)]
+        return await stream_result(await graphql_client.iter_list_queries())
 
     elif name == "list-mutations":
-        result = await graphql_client.list_mutations()
-        return [TextContent(type="text", text=result)]
+        return await stream_result(await graphql_client.iter_list_mutations())
 
     elif name == "analyze-relations":
         type_name = arguments.get("type_name")
-        result = await graphql_client.analyze_relations(type_name)
-        return [TextContent(type="text", text=result)]
+        return await stream_result(await graphql_client.iter_analyze_relations(type_name))
 
     elif name == "search-schema":
         query = arguments.get("query")
         if not query:
             return [TextContent(type="text", text="Error: query is required")]
-        result = await graphql_client.search_schema(query)
-        return [TextContent(type="text", text=result)]
+        return await stream_result(await graphql_client.iter_search_schema(query))
 
     elif name == "execute-query":
         query = arguments.get("query")
-        if not query:
-            return [TextContent(type="text", text="Error: query is required")]
+        persisted_query = arguments.get("persisted_query")
+        if not query and not persisted_query:
+            return [TextContent(type="text", text="Error: query or persisted_query is required")]
 
         variables = arguments.get("variables")
         operation_name = arguments.get("operation_name")
 
-        result = await graphql_client.execute_query(query, variables, operation_name)
+        return await stream_result(await graphql_client.iter_execute_query(query, variables, operation_name, persisted_query))
+
+    elif name == "diff-schema":
+        base = arguments.get("base", "cached")
+        target = arguments.get("target")
+        update_cache = arguments.get("update_cache", True)
+        result = await graphql_client.diff_schema(base, target, update_cache)
+        return [TextContent(type="text", text=result)]
+
+    elif name == "get-metrics":
+        result = graphql_client.get_metrics()
+        return [TextContent(type="text", text=result)]
+
+    elif name == "list-persisted-queries":
+        result = graphql_client.list_persisted_queries()
+        return [TextContent(type="text", text=result)]
+
+    elif name == "build-query":
+        root_field = arguments.get("root_field")
+        if not root_field:
+            return [TextContent(type="text", text="Error: root_field is required")]
+        result = await graphql_client.build_query(
+            root_field,
+            depth=arguments.get("depth", 1),
+            include=arguments.get("include"),
+            exclude=arguments.get("exclude"),
+            operation=arguments.get("operation"),
+            include_optional_args=arguments.get("include_optional_args", True)
+        )
+        return [TextContent(type="text", text=result)]
+
+    elif name == "aggregate":
+        table = arguments.get("table")
+        if not table:
+            return [TextContent(type="text", text="Error: table is required")]
+        result = await graphql_client.aggregate(
+            table,
+            functions=arguments.get("functions"),
+            where=arguments.get("where"),
+            group_by=arguments.get("group_by"),
+            count_distinct=arguments.get("count_distinct"),
+            max_groups=min(arguments.get("max_groups", 50), 500)
+        )
+        return [TextContent(type="text", text=result)]
+
+    elif name == "explain-query":
+        query = arguments.get("query")
+        if not query:
+            return [TextContent(type="text", text="Error: query is required")]
+        result = await graphql_client.explain_query(
+            query,
+            variables=arguments.get("variables"),
+            operation_name=arguments.get("operation_name"),
+            role=arguments.get("role"),
+            row_threshold=arguments.get("row_threshold")
+        )
+        return [TextContent(type="text", text=result)]
+
+    elif name == "bulk-mutation":
+        mutation = arguments.get("mutation")
+        if not mutation:
+            return [TextContent(type="text", text="Error: mutation is required")]
+        if not arguments.get("rows") and not arguments.get("rows_file"):
+            return [TextContent(type="text", text="Error: rows or rows_file is required")]
+        result = await graphql_client.bulk_mutation(
+            mutation,
+            rows=arguments.get("rows"),
+            rows_file=arguments.get("rows_file"),
+            on_conflict=arguments.get("on_conflict"),
+            chunk_rows=arguments.get("chunk_rows"),
+            chunk_bytes=arguments.get("chunk_bytes"),
+            concurrency=min(arguments.get("concurrency", 4), 16)
+        )
+        return [TextContent(type="text", text=result)]
+
+    elif name == "subscribe":
+        query = arguments.get("query")
+        if not query:
+            return [TextContent(type="text", text="Error: query is required")]
+        result = await graphql_client.subscribe(
+            query,
+            variables=arguments.get("variables"),
+            operation_name=arguments.get("operation_name"),
+            buffer_size=arguments.get("buffer_size"),
+            overflow=arguments.get("overflow", "drop_oldest")
+        )
+        return [TextContent(type="text", text=result)]
+
+    elif name == "poll-subscription":
+        subscription_id = arguments.get("subscription_id")
+        if not subscription_id:
+            return [TextContent(type="text", text="Error: subscription_id is required")]
+        return await stream_result(await graphql_client.iter_poll_subscription(
+            subscription_id,
+            cursor=arguments.get("cursor", 0),
+            max_events=min(arguments.get("max_events", 100), 1000),
+            wait_seconds=min(arguments.get("wait_seconds", 0), 30)
+        ))
+
+    elif name == "unsubscribe":
+        subscription_id = arguments.get("subscription_id")
+        if not subscription_id:
+            return [TextContent(type="text", text="Error: subscription_id is required")]
+        result = await graphql_client.unsubscribe(subscription_id)
         return [TextContent(type="text", text=result)]
 
     else:
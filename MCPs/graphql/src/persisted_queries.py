@@ -0,0 +1,140 @@
+"""
+Automatic persisted queries (APQ).
+
+Requests first carry only the sha256 of the document in `extensions.persistedQuery`.
+When the server answers PersistedQueryNotFound the full text is sent once alongside
+the hash so the server registers it; later requests for the same document stay
+hash-only. Servers without APQ support are detected on the first attempt and get
+full documents from then on.
+
+The local registry is pre-loaded with the operation documents kept in the repo
+(`api/src/entities/*/graphql/*.gql`), so they can be executed by operation name.
+"""
+
+import glob
+import hashlib
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+
+APQ_VERSION = 1
+
+# Error codes/messages that mean "send the full document with the hash"
+NOT_FOUND_CODES = ("PERSISTED_QUERY_NOT_FOUND", "PersistedQueryNotFound")
+# ... and those that mean the server will never accept hash-only requests. Hasura
+# without APQ rejects a body lacking "query" with parse-failed.
+NOT_SUPPORTED_CODES = ("PERSISTED_QUERY_NOT_SUPPORTED", "PersistedQueryNotSupported", "parse-failed")
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+DEFAULT_DOCUMENT_GLOBS = [os.path.join(REPO_ROOT, "api", "src", "entities", "*", "graphql", "*.gql")]
+
+_OPERATION_NAME = re.compile(r"^\s*(?:query|mutation|subscription)\s+([_A-Za-z][_0-9A-Za-z]*)", re.MULTILINE)
+
+# Bound on remembered hashes of ad-hoc (unregistered) documents
+MAX_HASH_CACHE = 1024
+
+
+def document_hash(document: str) -> str:
+    """APQ hash: hex sha256 of the exact document text sent."""
+    return hashlib.sha256(document.encode()).hexdigest()
+
+
+def operation_name_of(document: str) -> Optional[str]:
+    """Name of the first named operation in a document."""
+    match = _OPERATION_NAME.search(document)
+    return match.group(1) if match else None
+
+
+def persisted_query_error(result: Dict[str, Any]) -> Optional[str]:
+    """Classify a response to a hash-only request: "not_found", "not_supported" or None."""
+    for error in result.get("errors") or []:
+        code = (error.get("extensions") or {}).get("code")
+        message = error.get("message", "")
+        if code in NOT_FOUND_CODES or message in NOT_FOUND_CODES:
+            return "not_found"
+        if code in NOT_SUPPORTED_CODES or message in NOT_SUPPORTED_CODES:
+            return "not_supported"
+    return None
+
+
+class PersistedDocument:
+    """One known operation document."""
+    
+    def __init__(self, name: str, document: str, source: Optional[str] = None):
+        self.name = name
+        self.document = document
+        self.source = source
+        self.sha256 = document_hash(document)
+
+
+class PersistedQueryRegistry:
+    """Known documents by operation name and text, plus a hash cache for ad-hoc documents."""
+    
+    def __init__(self):
+        self._by_name: Dict[str, PersistedDocument] = {}
+        self._by_document: Dict[str, PersistedDocument] = {}
+        self._hash_cache: Dict[str, str] = {}
+    
+    def register(self, document: str, name: Optional[str] = None, source: Optional[str] = None) -> PersistedDocument:
+        document = document.strip()
+        name = name or operation_name_of(document) or document_hash(document)[:12]
+        entry = PersistedDocument(name, document, source)
+        self._by_name[name] = entry
+        self._by_document[document] = entry
+        return entry
+    
+    def load_files(self, patterns: List[str]) -> int:
+        """Register every document matching the glob patterns; returns the number loaded."""
+        loaded = 0
+        for pattern in patterns:
+            for path in sorted(glob.glob(pattern)):
+                try:
+                    with open(path, "r") as f:
+                        document = f.read()
+                except OSError:
+                    continue
+                if document.strip():
+                    self.register(document, source=path)
+                    loaded += 1
+        return loaded
+    
+    def get(self, name: str) -> Optional[PersistedDocument]:
+        return self._by_name.get(name)
+    
+    def names(self) -> List[str]:
+        return sorted(self._by_name)
+    
+    def documents(self) -> List[PersistedDocument]:
+        return [self._by_name[name] for name in self.names()]
+    
+    def hash_for(self, document: str) -> str:
+        """Hash of a document, reusing registered and recently seen hashes."""
+        entry = self._by_document.get(document)
+        if entry is not None:
+            return entry.sha256
+        sha256 = self._hash_cache.get(document)
+        if sha256 is None:
+            sha256 = document_hash(document)
+            if len(self._hash_cache) >= MAX_HASH_CACHE:
+                self._hash_cache.clear()
+            self._hash_cache[document] = sha256
+        return sha256
+
+
+_default_registry: Optional[PersistedQueryRegistry] = None
+
+
+def get_default_registry() -> PersistedQueryRegistry:
+    """
+    Process-wide registry, loaded on first use.
+    
+    GRAPHQL_PERSISTED_QUERY_FILES (comma-separated globs) replaces the default
+    `api/src/entities/*/graphql/*.gql` location.
+    """
+    global _default_registry
+    if _default_registry is None:
+        patterns = [p.strip() for p in os.getenv("GRAPHQL_PERSISTED_QUERY_FILES", "").split(",") if p.strip()]
+        _default_registry = PersistedQueryRegistry()
+        _default_registry.load_files(patterns or DEFAULT_DOCUMENT_GLOBS)
+    return _default_registry
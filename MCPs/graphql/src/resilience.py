@@ -0,0 +1,355 @@
+"""
+Tail-latency controls for GraphQL requests.
+
+Each operation type (query, mutation, subscription, introspection) gets a total
+time budget shared by all of its attempts. Failed attempts are retried with full
+jitter backoff, but only when that can't apply a write twice: reads retry on any
+transport error, timeout or 429/502/503/504, while mutations only retry when the
+request never reached the server. Reads can optionally be hedged (off by
+default, since every hedge is extra upstream load): if the first attempt is
+still running after the recent p95 latency, a duplicate is sent and the first
+answer wins. A circuit breaker opens after consecutive endpoint failures and
+fails calls fast until a probe succeeds.
+
+Every attempt, hedges included, runs inside its own concurrency slot when the
+caller passes one, so backoff sleeps hold no slot and every request upstream is
+counted. A hedge that finds no free slot is skipped rather than queued.
+"""
+
+import asyncio
+import os
+import random
+import re
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Any, AsyncContextManager, Awaitable, Callable, Deque, Dict, Optional
+
+
+OPERATION_TYPES = ("query", "mutation", "subscription", "introspection")
+IDEMPOTENT_TYPES = ("query", "introspection")
+RETRYABLE_STATUS = (429, 502, 503, 504)
+
+_COMMENT = re.compile(r"#[^\n]*")
+_OPERATION_KEYWORD = re.compile(r"(?:^|\})\s*(query|mutation|subscription)\b")
+
+
+def operation_type(document: str) -> str:
+    """Classify a document by its first operation; unknown documents are treated as mutations (never retried)."""
+    text = _COMMENT.sub("", document).strip()
+    if "__schema" in text and not text.startswith("mutation"):
+        return "introspection"
+    if text.startswith("{"):
+        return "query"
+    match = _OPERATION_KEYWORD.search(text)
+    return match.group(1) if match else "mutation"
+
+
+class CircuitOpenError(Exception):
+    """Raised without contacting the endpoint while its circuit breaker is open."""
+
+
+class RequestTimeoutError(Exception):
+    """An operation exceeded its time budget."""
+
+
+class NotSentError(Exception):
+    """An attempt was refused locally (e.g. no concurrency slot) and never reached the endpoint."""
+
+
+def _env_float(prefix: str, name: str, default: float) -> float:
+    return float(os.getenv(f"{prefix}{name}", os.getenv(f"GRAPHQL_{name}", str(default))))
+
+
+def _env_bool(prefix: str, name: str, default: bool) -> bool:
+    value = os.getenv(f"{prefix}{name}", os.getenv(f"GRAPHQL_{name}", str(default)))
+    return value.lower() in ("1", "true", "yes")
+
+
+class ResiliencePolicy:
+    """Timeout, retry, hedging and circuit breaker settings for one endpoint."""
+    
+    def __init__(self, timeouts: Optional[Dict[str, float]] = None, max_retries: int = 2,
+                 backoff_base: float = 0.1, backoff_max: float = 2.0, hedge: bool = False,
+                 hedge_min_delay: float = 0.05, hedge_min_samples: int = 20,
+                 breaker_failures: int = 5, breaker_reset: float = 30.0):
+        self.timeouts = {"query": 15.0, "mutation": 30.0, "subscription": 15.0, "introspection": 60.0}
+        self.timeouts.update(timeouts or {})
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker_failures = breaker_failures
+        self.breaker_reset = breaker_reset
+    
+    @classmethod
+    def from_env(cls, prefix: str = "GRAPHQL_") -> "ResiliencePolicy":
+        """
+        Read <prefix>TIMEOUT_<TYPE>_S, <prefix>MAX_RETRIES, <prefix>RETRY_BACKOFF_MS,
+        <prefix>RETRY_BACKOFF_MAX_MS, <prefix>HEDGE, <prefix>HEDGE_MIN_DELAY_MS,
+        <prefix>BREAKER_FAILURES and <prefix>BREAKER_RESET_S, falling back to the
+        GRAPHQL_* variable and then the default.
+        """
+        defaults = cls()
+        return cls(
+            timeouts={
+                op: _env_float(prefix, f"TIMEOUT_{op.upper()}_S", defaults.timeouts[op]) for op in OPERATION_TYPES
+            },
+            max_retries=int(_env_float(prefix, "MAX_RETRIES", defaults.max_retries)),
+            backoff_base=_env_float(prefix, "RETRY_BACKOFF_MS", defaults.backoff_base * 1000) / 1000,
+            backoff_max=_env_float(prefix, "RETRY_BACKOFF_MAX_MS", defaults.backoff_max * 1000) / 1000,
+            hedge=_env_bool(prefix, "HEDGE", defaults.hedge),
+            hedge_min_delay=_env_float(prefix, "HEDGE_MIN_DELAY_MS", defaults.hedge_min_delay * 1000) / 1000,
+            breaker_failures=int(_env_float(prefix, "BREAKER_FAILURES", defaults.breaker_failures)),
+            breaker_reset=_env_float(prefix, "BREAKER_RESET_S", defaults.breaker_reset)
+        )
+    
+    def timeout_for(self, op_type: str) -> float:
+        return self.timeouts.get(op_type, self.timeouts["mutation"])
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open (fail fast) -> half-open (one probe) -> closed."""
+    
+    def __init__(self, failure_threshold: int, reset_timeout: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._probe_in_flight = False
+    
+    def check(self):
+        """Raise CircuitOpenError unless a request may go out now."""
+        if self.state == "open":
+            remaining = self.opened_at + self.reset_timeout - self.clock()
+            if remaining > 0:
+                raise CircuitOpenError(f"Circuit open after {self.consecutive_failures} consecutive failures; retrying in {remaining:.1f}s")
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._probe_in_flight:
+                raise CircuitOpenError("Circuit half-open; waiting for the probe request")
+            self._probe_in_flight = True
+    
+    def release_probe(self):
+        """Let another request probe after the current probe was abandoned (e.g. cancelled)."""
+        self._probe_in_flight = False
+    
+    def record_success(self):
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+    
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold > 0:
+            if self.state != "open":
+                self.opens += 1
+            self.state = "open"
+            self.opened_at = self.clock()
+        self._probe_in_flight = False
+
+
+class LatencyWindow:
+    """Recent successful attempt latencies (seconds)."""
+    
+    def __init__(self, size: int = 256):
+        self.samples: Deque[float] = deque(maxlen=size)
+    
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+    
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def _never_sent(error: BaseException) -> bool:
+    """Connection could not be established, so the request never reached the server."""
+    import httpx
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+
+def is_endpoint_failure(error: BaseException) -> bool:
+    """Errors that say the endpoint is unhealthy (as opposed to a bad query)."""
+    import httpx
+    if isinstance(error, (RequestTimeoutError, httpx.TransportError)):
+        return True
+    status = _status_code(error)
+    return status is not None and status >= 500
+
+
+def is_retryable(error: BaseException, op_type: str) -> bool:
+    if isinstance(error, CircuitOpenError):
+        return False
+    if op_type not in IDEMPOTENT_TYPES:
+        return _never_sent(error)
+    import httpx
+    if isinstance(error, (RequestTimeoutError, httpx.TransportError)):
+        return True
+    return _status_code(error) in RETRYABLE_STATUS
+
+
+class ResilientCaller:
+    """Runs request attempts under one endpoint's policy and keeps its metrics."""
+    
+    def __init__(self, policy: Optional[ResiliencePolicy] = None):
+        self.policy = policy or ResiliencePolicy()
+        self.breaker = CircuitBreaker(self.policy.breaker_failures, self.policy.breaker_reset)
+        self.latency: Dict[str, LatencyWindow] = {op: LatencyWindow() for op in OPERATION_TYPES}
+        self.counters = {
+            "requests": 0, "attempts": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "hedges_skipped": 0,
+            "timeouts": 0, "failures": 0, "breaker_rejections": 0
+        }
+    
+    def hedge_delay(self, op_type: str) -> Optional[float]:
+        """Delay before a duplicate read is sent, or None when hedging doesn't apply."""
+        if not self.policy.hedge or op_type not in IDEMPOTENT_TYPES or self.breaker.state != "closed":
+            return None
+        window = self.latency[op_type]
+        if len(window.samples) < self.policy.hedge_min_samples:
+            return None
+        return max(self.policy.hedge_min_delay, window.percentile(95))
+    
+    async def _attempt(self, op_type: str, send: Callable[[float], Awaitable[Any]], deadline: float,
+                       slot: Callable[[bool], AsyncContextManager], hedge: bool = False) -> Any:
+        # A hedge doesn't wait for a slot; NotSentError from slot() means it is skipped
+        async with slot(not hedge):
+            budget = deadline - asyncio.get_running_loop().time()
+            if budget <= 0:
+                raise RequestTimeoutError(f"{op_type} exceeded its {self.policy.timeout_for(op_type):.1f}s budget")
+            self.counters["attempts"] += 1
+            if hedge:
+                self.counters["hedges"] += 1
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(send(budget), budget)
+            except asyncio.TimeoutError:
+                self.counters["timeouts"] += 1
+                raise RequestTimeoutError(f"{op_type} timed out after {budget:.1f}s")
+            self.latency[op_type].add(time.perf_counter() - start)
+            return result
+    
+    async def _hedged(self, op_type: str, send: Callable[[float], Awaitable[Any]], deadline: float, delay: float,
+                      slot: Callable[[bool], AsyncContextManager]) -> Any:
+        primary = asyncio.ensure_future(self._attempt(op_type, send, deadline, slot))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+        
+        secondary = asyncio.ensure_future(self._attempt(op_type, send, deadline, slot, hedge=True))
+        pending = {primary, secondary}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is secondary:
+                            self.counters["hedge_wins"] += 1
+                        return task.result()
+                    if task is secondary and isinstance(task.exception(), NotSentError):
+                        # No free slot: the primary carries on alone
+                        self.counters["hedges_skipped"] += 1
+                        continue
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def call(self, op_type: str, send: Callable[[float], Awaitable[Any]], deadline: Optional[float] = None,
+                   slot: Optional[Callable[[bool], AsyncContextManager]] = None) -> Any:
+        """
+        Run `send(timeout)` under the policy for `op_type`.
+        
+        `send` performs one complete attempt and receives the time left in the budget.
+        `deadline` (event loop time) overrides the budget, e.g. to include time spent
+        before the call. `slot(wait)` is entered around each attempt; it raises
+        NotSentError when the attempt may not go out (at once, if wait is False).
+        """
+        self.counters["requests"] += 1
+        loop = asyncio.get_running_loop()
+        if deadline is None:
+            deadline = loop.time() + self.policy.timeout_for(op_type)
+        if slot is None:
+            slot = lambda wait: nullcontext()
+        attempt = 0
+        
+        while True:
+            try:
+                self.breaker.check()
+            except CircuitOpenError:
+                self.counters["breaker_rejections"] += 1
+                raise
+            
+            budget = deadline - loop.time()
+            delay = self.hedge_delay(op_type)
+            try:
+                if budget <= 0:
+                    raise RequestTimeoutError(f"{op_type} exceeded its {self.policy.timeout_for(op_type):.1f}s budget")
+                if delay is not None and delay < budget:
+                    result = await self._hedged(op_type, send, deadline, delay, slot)
+                else:
+                    result = await self._attempt(op_type, send, deadline, slot)
+            except asyncio.CancelledError:
+                self.breaker.release_probe()
+                raise
+            except NotSentError:
+                # Refused before reaching the endpoint: says nothing about its health
+                self.breaker.release_probe()
+                self.counters["failures"] += 1
+                raise
+            except Exception as e:
+                if is_endpoint_failure(e):
+                    self.breaker.record_failure()
+                else:
+                    # The endpoint answered; the request itself was rejected
+                    self.breaker.record_success()
+                
+                backoff = random.uniform(0, min(self.policy.backoff_max, self.policy.backoff_base * (2 ** attempt)))
+                if (attempt >= self.policy.max_retries or not is_retryable(e, op_type)
+                        or loop.time() + backoff >= deadline):
+                    self.counters["failures"] += 1
+                    raise
+                attempt += 1
+                self.counters["retries"] += 1
+                await asyncio.sleep(backoff)
+                continue
+            
+            self.breaker.record_success()
+            return result
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters, breaker state and recent latency percentiles (ms) per operation type."""
+        latency = {}
+        for op, window in self.latency.items():
+            if window.samples:
+                latency[op] = {
+                    "samples": len(window.samples),
+                    "p50_ms": round(window.percentile(50) * 1000, 1),
+                    "p95_ms": round(window.percentile(95) * 1000, 1),
+                    "p99_ms": round(window.percentile(99) * 1000, 1)
+                }
+        return {
+            "counters": dict(self.counters),
+            "breaker": {
+                "state": self.breaker.state,
+                "consecutive_failures": self.breaker.consecutive_failures,
+                "opens": self.breaker.opens
+            },
+            "latency": latency
+        }
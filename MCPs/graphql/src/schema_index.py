@@ -0,0 +1,220 @@
+"""
+Lookup indexes built once per loaded schema.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import json_codec
+
+
+# Rough per-node costs (bytes) of the introspection dicts once loaded into Python,
+# used to keep the registry's schema caches inside the configured memory budget.
+TYPE_COST = 1700
+FIELD_COST = 1000
+VALUE_COST = 580
+
+
+def base_type_name(type_ref: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Extract the base type name from a type reference."""
+    if not type_ref:
+        return None
+    
+    # Navigate through NON_NULL and LIST wrappers
+    current = type_ref
+    while current and current.get("kind") in ["NON_NULL", "LIST"]:
+        current = current.get("ofType")
+    
+    return current.get("name") if current else None
+
+
+def format_type_ref(type_ref: Optional[Dict[str, Any]]) -> str:
+    """Format a type reference into a readable string."""
+    if not type_ref:
+        return "Unknown"
+    
+    kind = type_ref.get("kind")
+    name = type_ref.get("name")
+    of_type = type_ref.get("ofType")
+    
+    if kind == "NON_NULL":
+        return f"{format_type_ref(of_type)}!"
+    elif kind == "LIST":
+        return f"[{format_type_ref(of_type)}]"
+    elif name:
+        return name
+    else:
+        return "Unknown"
+
+
+def type_content_hash(type_info: Dict[str, Any]) -> str:
+    """Stable content hash of one introspection type."""
+    return hashlib.sha256(json_codec.dumps_canonical(type_info)).hexdigest()
+
+
+def compute_type_hashes(schema: Dict[str, Any]) -> Dict[str, str]:
+    """Content hash per type name for an introspection `__schema` result."""
+    return {t.get("name", ""): type_content_hash(t) for t in schema.get("types", [])}
+
+
+class SchemaIndex:
+    """Name, relation and search indexes over an introspection `__schema` result."""
+    
+    def __init__(self, schema: Dict[str, Any], type_hashes: Optional[Dict[str, str]] = None):
+        self.schema = schema
+        self.types_by_name: Dict[str, Dict[str, Any]] = {}
+        self.user_types: List[Dict[str, Any]] = []
+        # type name -> [(field name, referenced type)] for fields pointing at other types
+        self.outgoing: Dict[str, List[Tuple[str, str]]] = {}
+        # type name -> [(referencing type, field name)], in schema order
+        self.incoming: Dict[str, List[Tuple[str, str]]] = {}
+        self.estimated_bytes = 0
+        # type name -> [(lowercase name, "Type" | "Field", display name, type or field dict)]
+        self._search_entries: Dict[str, List[Tuple[str, str, str, Dict[str, Any]]]] = {}
+        # type name -> [(field name, referenced type)] including introspection targets
+        self._references: Dict[str, List[Tuple[str, str]]] = {}
+        self._type_bytes: Dict[str, int] = {}
+        self._type_hashes = type_hashes
+        # Derived results (e.g. generated selection sets) keyed by their producer; cleared on update
+        self.memo: Dict[Any, Any] = {}
+        self._build()
+    
+    def _build(self):
+        self._index_names()
+        for type_info in self.user_types:
+            self._index_type(type_info)
+    
+    def _index_names(self):
+        self.types_by_name = {}
+        self.user_types = []
+        for type_info in self.schema.get("types", []):
+            name = type_info.get("name", "")
+            self.types_by_name.setdefault(name, type_info)
+            if not name.startswith("__"):
+                self.user_types.append(type_info)
+    
+    def _index_type(self, type_info: Dict[str, Any]) -> Set[str]:
+        """Add one type to the relation and search indexes; returns the types it references."""
+        type_name = type_info.get("name", "")
+        cost = TYPE_COST
+        entries = [(type_name.lower(), "Type", type_name, type_info)]
+        references = []
+        
+        for field in type_info.get("fields") or []:
+            field_name = field.get("name", "")
+            cost += FIELD_COST + VALUE_COST * len(field.get("args") or [])
+            entries.append((field_name.lower(), "Field", f"{type_name}.{field_name}", field))
+            
+            referenced_type = base_type_name(field.get("type", {}))
+            if not referenced_type or referenced_type == type_name:
+                continue
+            references.append((field_name, referenced_type))
+            self.incoming.setdefault(referenced_type, []).append((type_name, field_name))
+        
+        cost += VALUE_COST * (len(type_info.get("inputFields") or []) + len(type_info.get("enumValues") or []))
+        
+        outgoing = [(field_name, target) for field_name, target in references if not target.startswith("__")]
+        if outgoing:
+            self.outgoing[type_name] = outgoing
+        self._references[type_name] = references
+        self._search_entries[type_name] = entries
+        self._type_bytes[type_name] = cost
+        self.estimated_bytes += cost
+        return {target for _, target in references}
+    
+    def _unindex_type(self, type_name: str) -> Set[str]:
+        """Remove one type from the relation and search indexes; returns the types it referenced."""
+        targets = set()
+        for field_name, target in self._references.pop(type_name, []):
+            targets.add(target)
+            referencing = self.incoming.get(target)
+            if referencing:
+                referencing.remove((type_name, field_name))
+                if not referencing:
+                    del self.incoming[target]
+        self.outgoing.pop(type_name, None)
+        self._search_entries.pop(type_name, None)
+        self.estimated_bytes -= self._type_bytes.pop(type_name, 0)
+        return targets
+    
+    def _sort_incoming(self, targets: Set[str]):
+        """Restore schema order (type, then field position) for the given incoming lists."""
+        type_positions = {t.get("name", ""): i for i, t in enumerate(self.user_types)}
+        field_positions: Dict[str, Dict[str, int]] = {}
+        
+        def position(entry: Tuple[str, str]) -> Tuple[int, int]:
+            source, field_name = entry
+            if source not in field_positions:
+                fields = self.types_by_name.get(source, {}).get("fields") or []
+                field_positions[source] = {f.get("name", ""): i for i, f in enumerate(fields)}
+            return type_positions.get(source, len(type_positions)), field_positions[source].get(field_name, 0)
+        
+        for target in targets:
+            if target in self.incoming:
+                self.incoming[target].sort(key=position)
+    
+    @property
+    def type_hashes(self) -> Dict[str, str]:
+        """Content hash per type name (computed on first use)."""
+        if self._type_hashes is None:
+            self._type_hashes = compute_type_hashes(self.schema)
+        return self._type_hashes
+    
+    def update(self, schema: Dict[str, Any], type_hashes: Optional[Dict[str, str]] = None) -> Dict[str, List[str]]:
+        """
+        Move the index to a new version of the schema, re-indexing only changed types.
+        
+        Types whose content hash is unchanged keep their existing index entries (and the
+        new schema reuses their already loaded dicts). Returns the added, removed and
+        changed type names.
+        """
+        new_hashes = type_hashes or compute_type_hashes(schema)
+        old_hashes = self.type_hashes
+        old_types = self.types_by_name
+        
+        added = [name for name in new_hashes if name not in old_hashes]
+        removed = [name for name in old_hashes if name not in new_hashes]
+        changed = [name for name in new_hashes if name in old_hashes and old_hashes[name] != new_hashes[name]]
+        
+        # Share unchanged type dicts with the previous version so only one copy stays loaded
+        types = schema.get("types", [])
+        for position, type_info in enumerate(types):
+            name = type_info.get("name", "")
+            if name in old_types and old_hashes.get(name) == new_hashes.get(name):
+                types[position] = old_types[name]
+        
+        self.schema = schema
+        self._index_names()
+        
+        affected = set()
+        for name in removed + changed:
+            affected |= self._unindex_type(name)
+        for name in added + changed:
+            type_info = self.types_by_name.get(name)
+            if type_info is not None and not name.startswith("__"):
+                affected |= self._index_type(type_info)
+        self._sort_incoming(affected)
+        
+        self._type_hashes = new_hashes
+        self.memo.clear()
+        return {"added": added, "removed": removed, "changed": changed}
+    
+    def get_type(self, type_name: str) -> Optional[Dict[str, Any]]:
+        """Look up any type (including introspection types) by name."""
+        return self.types_by_name.get(type_name)
+    
+    def get_user_type(self, type_name: str) -> Optional[Dict[str, Any]]:
+        """Look up a non-introspection type by name."""
+        if type_name.startswith("__"):
+            return None
+        return self.types_by_name.get(type_name)
+    
+    def search(self, query: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Return (kind, display name, info) for type and field names containing query."""
+        query_lower = query.lower()
+        results = []
+        for type_info in self.user_types:
+            for key, kind, display, info in self._search_entries.get(type_info.get("name", ""), []):
+                if query_lower in key:
+                    results.append((kind, display, info))
+        return results
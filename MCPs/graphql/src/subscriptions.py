@@ -0,0 +1,295 @@
+"""
+GraphQL subscriptions over the graphql-transport-ws protocol.
+
+All subscriptions to one endpoint share a single websocket. Each subscription buffers
+its events in a bounded ring that the caller drains by cursor; reading from cursor N
+acknowledges every event before N, so a poll can be repeated safely until the caller
+moves on. When a ring is full it either drops its oldest unacknowledged event (the
+default; the next read reports the gap) or stops reading from the socket until the
+caller catches up. Blocking pushes back on the server, but stalls every subscription
+sharing the connection, so it suits one high-value stream rather than many.
+"""
+
+import asyncio
+import itertools
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import json_codec
+
+
+SUBPROTOCOL = "graphql-transport-ws"
+OVERFLOW_POLICIES = ("drop_oldest", "block")
+DEFAULT_BUFFER_SIZE = 1000
+MAX_SUBSCRIPTIONS = 32
+CONNECTION_ACK_TIMEOUT = 10.0
+
+
+class SubscriptionError(Exception):
+    """A subscription could not be started, or its connection failed."""
+
+
+def websocket_url(endpoint: str) -> str:
+    """http(s)://host/v1/graphql -> ws(s)://host/v1/graphql"""
+    parts = urlsplit(endpoint)
+    scheme = {"http": "ws", "https": "wss"}.get(parts.scheme, parts.scheme)
+    return urlunsplit((scheme, parts.netloc, parts.path, parts.query, ""))
+
+
+class EventRing:
+    """Bounded buffer of (cursor, received_at, payload) with cursor-based reads."""
+    
+    def __init__(self, capacity: int = DEFAULT_BUFFER_SIZE, overflow: str = "drop_oldest"):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}' (expected {' or '.join(OVERFLOW_POLICIES)})")
+        self.capacity = max(1, capacity)
+        self.overflow = overflow
+        self._events: Deque[Tuple[int, float, Any]] = deque()
+        # Cursor of the next event to arrive, and everything below `_acknowledged` has been read past
+        self.next_cursor = 0
+        self._acknowledged = 0
+        self.dropped = 0
+        # Set once the subscription ends; later events are discarded instead of buffered
+        self.closed = False
+        self._space = asyncio.Event()
+        self._space.set()
+        self._changed = asyncio.Event()
+    
+    def __len__(self) -> int:
+        return len(self._events)
+    
+    async def put(self, payload: Any):
+        while len(self._events) >= self.capacity:
+            if self.closed:
+                return
+            if self.overflow == "drop_oldest":
+                self._events.popleft()
+                self.dropped += 1
+            else:
+                self._space.clear()
+                await self._space.wait()
+        if self.closed:
+            return
+        self._events.append((self.next_cursor, time.time(), payload))
+        self.next_cursor += 1
+        self.notify()
+    
+    def notify(self):
+        """Wake readers waiting for events (also used when the subscription ends)."""
+        self._changed.set()
+    
+    def close(self):
+        """Stop buffering: a put() blocked on a full ring returns, so the shared socket reader moves on."""
+        self.closed = True
+        self._space.set()
+        self.notify()
+    
+    def read(self, cursor: int, max_events: int) -> Tuple[List[Tuple[int, float, Any]], int, int]:
+        """
+        Events from `cursor` on, acknowledging (and freeing) everything before it.
+        
+        Returns (events, next cursor, number of events between the cursor and the
+        oldest buffered one that were dropped).
+        """
+        cursor = min(max(cursor, 0), self.next_cursor)
+        while self._events and self._events[0][0] < cursor:
+            self._events.popleft()
+        start = max(cursor, self._acknowledged)
+        self._acknowledged = start
+        if len(self._events) < self.capacity:
+            self._space.set()
+        
+        oldest = self._events[0][0] if self._events else self.next_cursor
+        missed = max(0, oldest - start)
+        events = list(itertools.islice(self._events, max_events))
+        next_cursor = events[-1][0] + 1 if events else max(start, oldest)
+        return events, next_cursor, missed
+    
+    async def wait(self, cursor: int, timeout: float):
+        """Wait up to `timeout` seconds for an event at or after `cursor` (or any notify)."""
+        if self.next_cursor > cursor:
+            return
+        self._changed.clear()
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+class Subscription:
+    """One running (or finished, but not yet drained) subscription."""
+    
+    def __init__(self, subscription_id: str, query: str, variables: Optional[Dict[str, Any]],
+                 operation_name: Optional[str], ring: EventRing):
+        self.id = subscription_id
+        self.query = query
+        self.variables = variables
+        self.operation_name = operation_name
+        self.ring = ring
+        # starting -> active -> complete | error
+        self.status = "starting"
+        self.error: Optional[str] = None
+        self.started_at = time.time()
+    
+    @property
+    def running(self) -> bool:
+        return self.status in ("starting", "active")
+    
+    def finish(self, status: str, error: Optional[str] = None):
+        if self.running:
+            self.status = status
+            self.error = error
+        # Buffered events stay readable, but a blocking ring must not hold up the connection
+        self.ring.close()
+
+
+class SubscriptionManager:
+    """Subscriptions for one endpoint, multiplexed on one lazily opened websocket."""
+    
+    def __init__(self, endpoint: str, headers: Callable[[], Dict[str, str]]):
+        self.url = websocket_url(endpoint)
+        self._headers = headers
+        self.subscriptions: Dict[str, Subscription] = {}
+        self._socket = None
+        self._reader: Optional[asyncio.Task] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self.stats = {"connections": 0, "subscriptions": 0, "events": 0}
+    
+    @property
+    def connected(self) -> bool:
+        return self._socket is not None
+    
+    async def _connection(self):
+        if self._socket is not None:
+            return self._socket
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._socket is not None:
+                return self._socket
+            try:
+                # Imported on first use: websockets is only needed for subscriptions
+                from websockets.asyncio.client import connect
+            except ImportError:
+                raise SubscriptionError("Subscriptions need the websockets package (pip install websockets)")
+            
+            headers = self._headers()
+            try:
+                socket = await connect(self.url, subprotocols=[SUBPROTOCOL], additional_headers=headers,
+                                       open_timeout=CONNECTION_ACK_TIMEOUT)
+            except Exception as e:
+                raise SubscriptionError(f"Could not open a websocket to {self.url}: {e}")
+            try:
+                # Hasura reads the auth headers from the connection_init payload
+                await socket.send(self._encode({"type": "connection_init", "payload": {"headers": headers}}))
+                ack = json_codec.loads(await asyncio.wait_for(socket.recv(), CONNECTION_ACK_TIMEOUT))
+            except Exception as e:
+                await socket.close()
+                raise SubscriptionError(f"No connection_ack from {self.url}: {e}")
+            if ack.get("type") != "connection_ack":
+                await socket.close()
+                raise SubscriptionError(f"Connection rejected by {self.url}: {ack.get('payload') or ack.get('type')}")
+            
+            self._socket = socket
+            self._reader = asyncio.create_task(self._read(socket))
+            self.stats["connections"] += 1
+            return socket
+    
+    def _encode(self, message: Dict[str, Any]) -> str:
+        # graphql-transport-ws messages are text frames
+        return json_codec.dumps_bytes(message).decode()
+    
+    async def _read(self, socket):
+        reason = "closed by server"
+        try:
+            async for raw in socket:
+                message = json_codec.loads(raw)
+                message_type = message.get("type")
+                if message_type == "ping":
+                    await socket.send(self._encode({"type": "pong"}))
+                    continue
+                
+                subscription = self.subscriptions.get(message.get("id"))
+                if subscription is None or not subscription.running:
+                    continue
+                if message_type == "next":
+                    subscription.status = "active"
+                    self.stats["events"] += 1
+                    # Waits here when a blocking ring is full, which stops reading the socket
+                    await subscription.ring.put(message.get("payload"))
+                elif message_type == "error":
+                    errors = message.get("payload") or []
+                    subscription.finish("error", "; ".join(error.get("message", str(error)) for error in errors))
+                elif message_type == "complete":
+                    subscription.finish("complete")
+        except asyncio.CancelledError:
+            reason = "closed"
+            raise
+        except Exception as e:
+            reason = str(e) or type(e).__name__
+        finally:
+            if self._socket is socket:
+                self._socket = None
+                self._reader = None
+            for subscription in self.subscriptions.values():
+                subscription.finish("error", f"Connection {reason}")
+    
+    async def subscribe(self, query: str, variables: Optional[Dict[str, Any]] = None, operation_name: Optional[str] = None,
+                        buffer_size: int = DEFAULT_BUFFER_SIZE, overflow: str = "drop_oldest") -> Subscription:
+        if len(self.subscriptions) >= MAX_SUBSCRIPTIONS:
+            raise SubscriptionError(
+                f"Too many subscriptions ({len(self.subscriptions)}); unsubscribe finished or unused ones first"
+            )
+        ring = EventRing(buffer_size, overflow)
+        socket = await self._connection()
+        
+        subscription = Subscription(uuid.uuid4().hex[:12], query, variables, operation_name, ring)
+        payload: Dict[str, Any] = {"query": query}
+        if variables:
+            payload["variables"] = variables
+        if operation_name:
+            payload["operationName"] = operation_name
+        self.subscriptions[subscription.id] = subscription
+        try:
+            await socket.send(self._encode({"id": subscription.id, "type": "subscribe", "payload": payload}))
+        except Exception as e:
+            del self.subscriptions[subscription.id]
+            raise SubscriptionError(f"Could not start the subscription: {e}")
+        subscription.status = "active"
+        self.stats["subscriptions"] += 1
+        return subscription
+    
+    async def unsubscribe(self, subscription_id: str) -> Optional[Subscription]:
+        """Stop a subscription and drop its buffer; the websocket closes with the last one."""
+        subscription = self.subscriptions.pop(subscription_id, None)
+        if subscription is None:
+            return None
+        if subscription.running and self._socket is not None:
+            try:
+                await self._socket.send(self._encode({"id": subscription.id, "type": "complete"}))
+            except Exception:
+                pass
+        subscription.finish("complete")
+        if not self.subscriptions:
+            await self.close()
+        return subscription
+    
+    async def close(self):
+        socket, reader = self._socket, self._reader
+        self._socket = self._reader = None
+        if reader is not None:
+            reader.cancel()
+        if socket is not None:
+            await socket.close()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "active": sum(1 for subscription in self.subscriptions.values() if subscription.running),
+            "buffered": sum(len(subscription.ring) for subscription in self.subscriptions.values()),
+            "dropped": sum(subscription.ring.dropped for subscription in self.subscriptions.values()),
+            "counters": dict(self.stats)
+        }
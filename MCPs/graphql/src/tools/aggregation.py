@@ -0,0 +1,164 @@
+"""
+Hasura aggregate query generation.
+
+A table's `<table>_aggregate` root field exposes count plus per-function column
+sets (sum/avg/min/max/stddev/variance). Group-by is emulated in two steps: the
+distinct group values come from the table's select field with `distinct_on`, then
+one aliased `_aggregate` per group is sent in batches, each filtered to its group.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from schema_index import SchemaIndex, base_type_name
+from tools.query_builder import find_root_field, operation_name_for
+
+
+AGGREGATE_SUFFIX = "_aggregate"
+DEFAULT_MAX_GROUPS = 50
+GROUP_BATCH_SIZE = 20
+
+
+def _type_fields(index: SchemaIndex, type_name: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    type_info = index.get_type(type_name) if type_name else None
+    return {field.get("name", ""): field for field in (type_info or {}).get("fields") or []}
+
+
+def _arg_type_name(field: Dict[str, Any], arg_name: str) -> Optional[str]:
+    for arg in field.get("args") or []:
+        if arg.get("name") == arg_name:
+            return base_type_name(arg.get("type"))
+    return None
+
+
+def describe_aggregate(index: SchemaIndex, table: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up `<table>_aggregate` on the query root.
+    
+    Returns the root field names, the bool_exp/select_column type names and the
+    columns available to each aggregate function, or None when there is none.
+    """
+    table = table[:-len(AGGREGATE_SUFFIX)] if table.endswith(AGGREGATE_SUFFIX) else table
+    found = find_root_field(index, table + AGGREGATE_SUFFIX, "query")
+    if not found:
+        return None
+    _, field = found
+    
+    aggregate_fields = _type_fields(index, base_type_name(field.get("type")))
+    functions: Dict[str, List[str]] = {}
+    count_distinct = False
+    if "aggregate" in aggregate_fields:
+        for name, function in _type_fields(index, base_type_name(aggregate_fields["aggregate"].get("type"))).items():
+            if name == "count":
+                count_distinct = any(arg.get("name") == "distinct" for arg in function.get("args") or [])
+                continue
+            functions[name] = list(_type_fields(index, base_type_name(function.get("type"))))
+    
+    select_column = _arg_type_name(field, "distinct_on")
+    select_field = find_root_field(index, table, "query")
+    return {
+        "table": table,
+        "root_field": table + AGGREGATE_SUFFIX,
+        "select_field": table if select_field else None,
+        "bool_exp": _arg_type_name(field, "where"),
+        "columns": [value.get("name", "") for value in (index.get_type(select_column) or {}).get("enumValues") or []],
+        "functions": functions,
+        "count_distinct": count_distinct
+    }
+
+
+def validate_request(info: Dict[str, Any], functions: Dict[str, List[str]], group_by: List[str],
+                     count_distinct: List[str]) -> Optional[str]:
+    """Error message for functions or columns the table doesn't expose, else None."""
+    for name, columns in functions.items():
+        if name not in info["functions"]:
+            return f"Unknown aggregate function '{name}'. Available: {', '.join(info['functions']) or 'none'}"
+        unknown = [column for column in columns if column not in info["functions"][name]]
+        if unknown:
+            return (
+                f"Column(s) {', '.join(unknown)} not available for {name}. "
+                f"Available: {', '.join(info['functions'][name]) or 'none'}"
+            )
+    for column in group_by + count_distinct:
+        if column not in info["columns"]:
+            return f"Unknown column '{column}'. Available: {', '.join(info['columns'])}"
+    if count_distinct and not info["count_distinct"]:
+        return "This table's count doesn't support distinct columns"
+    if group_by and not info["select_field"]:
+        return f"Group-by needs the '{info['table']}' select field, which is not on the query root"
+    return None
+
+
+def aggregate_selection(functions: Dict[str, List[str]], count_distinct: List[str]) -> str:
+    """The `aggregate { ... }` selection for count plus the requested functions."""
+    parts = ["count"]
+    if count_distinct:
+        parts.append(f"count_distinct: count(columns: [{', '.join(count_distinct)}], distinct: true)")
+    for name, columns in functions.items():
+        if columns:
+            parts.append(f"{name} {{ {' '.join(columns)} }}")
+    return f"aggregate {{ {' '.join(parts)} }}"
+
+
+def build_aggregate_document(info: Dict[str, Any], functions: Dict[str, List[str]],
+                             count_distinct: List[str], filters: int = 1) -> str:
+    """
+    One `_aggregate` per filter variable ($w0, $w1, ...), aliased g0, g1, ... when
+    there is more than one.
+    """
+    selection = aggregate_selection(functions, count_distinct)
+    variables = ", ".join(f"$w{i}: {info['bool_exp']}" for i in range(filters))
+    lines = [f"query {operation_name_for(info['root_field'])}({variables}) {{"]
+    for i in range(filters):
+        alias = f"g{i}: " if filters > 1 else ""
+        lines.append(f"  {alias}{info['root_field']}(where: $w{i}) {{ {selection} }}")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def build_groups_document(info: Dict[str, Any], group_by: List[str]) -> str:
+    """Distinct combinations of the group-by columns matching $where."""
+    columns = ", ".join(group_by)
+    order_by = ", ".join(f"{{{column}: asc}}" for column in group_by)
+    return (
+        f"query {operation_name_for(info['table'])}Groups($where: {info['bool_exp']}, $limit: Int) {{\n"
+        f"  {info['select_field']}(distinct_on: [{columns}], order_by: [{order_by}], where: $where, limit: $limit) {{ {' '.join(group_by)} }}\n"
+        f"}}"
+    )
+
+
+def group_filter(where: Optional[Dict[str, Any]], group: Dict[str, Any]) -> Dict[str, Any]:
+    """`where` narrowed to one group; null group values match with _is_null."""
+    conditions = [
+        {column: {"_is_null": True} if value is None else {"_eq": value}}
+        for column, value in group.items()
+    ]
+    if where:
+        conditions.insert(0, where)
+    return conditions[0] if len(conditions) == 1 else {"_and": conditions}
+
+
+def batches(groups: List[Dict[str, Any]], size: int = GROUP_BATCH_SIZE) -> List[List[Dict[str, Any]]]:
+    return [groups[i:i + size] for i in range(0, len(groups), size)]
+
+
+def flatten_aggregate(aggregate: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """{"count": 3, "sum": {"amount": 10}} -> {"count": 3, "sum.amount": 10}"""
+    values: Dict[str, Any] = {}
+    for name, value in (aggregate or {}).items():
+        if isinstance(value, dict):
+            for column, column_value in value.items():
+                values[f"{name}.{column}"] = column_value
+        else:
+            values[name] = value
+    return values
+
+
+def metric_names(functions: Dict[str, List[str]], count_distinct: List[str]) -> List[str]:
+    names = ["count"] + (["count_distinct"] if count_distinct else [])
+    names.extend(f"{name}.{column}" for name, columns in functions.items() for column in columns)
+    return names
+
+
+def split_groups(rows: List[Dict[str, Any]], max_groups: int) -> Tuple[List[Dict[str, Any]], bool]:
+    """Trim the distinct rows to max_groups; the flag says whether there were more."""
+    return rows[:max_groups], len(rows) > max_groups
@@ -0,0 +1,109 @@
+"""
+Chunked bulk inserts and updates.
+
+Hasura's `insert_<table>(objects: [...])` and `update_<table>_many(updates: [...])`
+take their rows as one list argument. Large lists are split into chunks bounded
+by row count and encoded size, so no single request runs into the request
+timeout or the server's body size limit; the chunks are then sent a few at a
+time. Every chunk is its own transaction, so a failed chunk leaves the others
+applied and is reported by its row range for a retry.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import json_codec
+from schema_index import SchemaIndex, base_type_name, format_type_ref
+from tools.query_builder import find_root_field, operation_name_for
+
+
+# Root field prefix/suffix -> the list argument carrying the rows
+BULK_ARGUMENTS = (("insert_", "", "objects"), ("update_", "_many", "updates"))
+DEFAULT_CHUNK_ROWS = 1000
+DEFAULT_CHUNK_BYTES = 512 * 1024
+DEFAULT_WINDOW = 4
+
+
+def describe_bulk_mutation(index: SchemaIndex, mutation: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up an insert_<table> or update_<table>_many field on the mutation root.
+    
+    Returns the root field, the name and declared type of its rows argument, the
+    on_conflict type (inserts only) and whether it returns a list of mutation
+    responses, or None when the field is not a bulk mutation.
+    """
+    found = find_root_field(index, mutation, "mutation")
+    if not found:
+        return None
+    _, field = found
+    
+    args = {arg.get("name", ""): arg for arg in field.get("args") or []}
+    for prefix, suffix, rows_arg in BULK_ARGUMENTS:
+        if not (mutation.startswith(prefix) and mutation.endswith(suffix)) or rows_arg not in args:
+            continue
+        on_conflict = args.get("on_conflict")
+        return {
+            "root_field": mutation,
+            "table": mutation[len(prefix):len(mutation) - len(suffix)],
+            "rows_arg": rows_arg,
+            "rows_type": format_type_ref(args[rows_arg].get("type")),
+            "on_conflict_type": base_type_name(on_conflict.get("type")) if on_conflict else None,
+            "returns_list": _is_list(field.get("type"))
+        }
+    return None
+
+
+def _is_list(type_ref: Optional[Dict[str, Any]]) -> bool:
+    current = type_ref
+    while current and current.get("kind") == "NON_NULL":
+        current = current.get("ofType")
+    return bool(current) and current.get("kind") == "LIST"
+
+
+def build_bulk_document(info: Dict[str, Any], on_conflict: bool = False) -> str:
+    """The mutation for one chunk: the rows in $rows, selecting only affected_rows."""
+    variables = [f"$rows: {info['rows_type']}"]
+    arguments = [f"{info['rows_arg']}: $rows"]
+    if on_conflict:
+        variables.append(f"$on_conflict: {info['on_conflict_type']}")
+        arguments.append("on_conflict: $on_conflict")
+    return (
+        f"mutation Bulk{operation_name_for(info['root_field'])}({', '.join(variables)}) {{\n"
+        f"  {info['root_field']}({', '.join(arguments)}) {{ affected_rows }}\n"
+        "}"
+    )
+
+
+def split_rows(rows: List[Any], max_rows: int = DEFAULT_CHUNK_ROWS,
+              max_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[Tuple[int, List[Any]]]:
+    """
+    (first row index, rows) chunks of at most max_rows rows and about max_bytes of
+    encoded JSON; a row larger than max_bytes goes alone in its own chunk.
+    """
+    start = 0
+    size = 0
+    for i, row in enumerate(rows):
+        # The row plus its separating comma
+        row_size = len(json_codec.dumps_bytes(row)) + 1
+        if i > start and (i - start >= max_rows or size + row_size > max_bytes):
+            yield start, rows[start:i]
+            start, size = i, 0
+        size += row_size
+    if start < len(rows):
+        yield start, rows[start:]
+
+
+def affected_rows(info: Dict[str, Any], data: Dict[str, Any]) -> int:
+    """affected_rows from a chunk's response (summed over update_*_many's per-update responses)."""
+    result = data.get(info["root_field"])
+    if info["returns_list"]:
+        return sum((response or {}).get("affected_rows") or 0 for response in result or [])
+    return (result or {}).get("affected_rows") or 0
+
+
+def load_rows(path: str) -> List[Any]:
+    """Rows from a JSON array file or a JSON Lines file (one row per line)."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw.lstrip()[:1] == b"[":
+        return json_codec.loads(raw)
+    return [json_codec.loads(line) for line in raw.splitlines() if line.strip()]
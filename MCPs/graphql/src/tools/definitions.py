@@ -0,0 +1,443 @@
+"""
+Static MCP tool definitions.
+
+Kept free of heavy imports so list_tools can be answered before the GraphQL
+client, httpx or graphql-core are loaded.
+"""
+
+from typing import Any, Dict, List
+
+
+# Optional on every tool; selects an endpoint from the registry
+ENDPOINT_PROPERTY = {
+    "type": "string",
+    "description": "Name of the configured endpoint to use (optional, defaults to the default endpoint)"
+}
+
+TOOL_DEFINITIONS: List[Dict[str, Any]] = [
+    {
+        "name": "introspect-schema",
+        "description": "Get GraphQL schema introspection with pagination for large schemas",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "page": {
+                    "type": "integer",
+                    "description": "Page number (default: 1)",
+                    "minimum": 1
+                },
+                "per_page": {
+                    "type": "integer",
+                    "description": "Items per page (default: 20, max: 50)",
+                    "minimum": 1,
+                    "maximum": 50
+                },
+                "filter_kind": {
+                    "type": "string",
+                    "description": "Filter by type kind (OBJECT, SCALAR, ENUM, INPUT_OBJECT, INTERFACE, UNION)",
+                    "enum": ["OBJECT", "SCALAR", "ENUM", "INPUT_OBJECT", "INTERFACE", "UNION"]
+                },
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "get-type-info",
+        "description": "Get detailed information about a specific GraphQL type",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "type_name": {
+                    "type": "string",
+                    "description": "The name of the GraphQL type to inspect"
+                },
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "required": ["type_name"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "list-queries",
+        "description": "List all available Query operations with descriptions and arguments",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "list-mutations",
+        "description": "List all available Mutation operations with descriptions and arguments",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "analyze-relations",
+        "description": "Analyze relationships between GraphQL types",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "type_name": {
+                    "type": "string",
+                    "description": "The name of the type to analyze relations for (optional)"
+                },
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "search-schema",
+        "description": "Search for types and fields by name pattern",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query to match against type and field names"
+                },
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "required": ["query"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "execute-query",
+        "description": "Execute a GraphQL query or mutation against the endpoint",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "The GraphQL query or mutation to execute (required unless persisted_query is given)"
+                },
+                "persisted_query": {
+                    "type": "string",
+                    "description": "Operation name of a registered document to execute instead of query (see list-persisted-queries)"
+                },
+                "variables": {
+                    "type": "object",
+                    "description": "Variables for the GraphQL query (optional)",
+                    "additionalProperties": True
+                },
+                "operation_name": {
+                    "type": "string",
+                    "description": "Operation name if the query contains multiple operations (optional)"
+                },
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "required": [],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "list-endpoints",
+        "description": "List the configured GraphQL endpoints and their schema cache status",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "diff-schema",
+        "description": "Compare two schema versions (cached, file or live) and report added, removed, changed and breaking differences; diffing against the cache updates it incrementally",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "base": {
+                    "type": "string",
+                    "description": "Schema version to compare from (default: cached)",
+                    "enum": ["cached", "file", "live"]
+                },
+                "target": {
+                    "type": "string",
+                    "description": "Schema version to compare to (default: file if a schema file is configured, otherwise live)",
+                    "enum": ["cached", "file", "live"]
+                },
+                "update_cache": {
+                    "type": "boolean",
+                    "description": "When base is cached, move the cache to the target version re-indexing only changed types (default: true)"
+                },
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "build-query",
+        "description": "Generate a query/mutation document for a root field, expanding nested relationships to a given depth with variables declared from the field's arguments",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "root_field": {
+                    "type": "string",
+                    "description": "Root field on query_root, mutation_root or subscription_root (e.g. forms, insert_form_steps)"
+                },
+                "depth": {
+                    "type": "integer",
+                    "description": "Relationship levels to expand below the root field (default: 1)",
+                    "minimum": 0,
+                    "maximum": 5
+                },
+                "include": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Glob patterns; only matching fields (name or Type.field) are selected (optional)"
+                },
+                "exclude": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Glob patterns for fields (name or Type.field) to leave out (default: [\"*_aggregate\"])"
+                },
+                "operation": {
+                    "type": "string",
+                    "description": "Restrict the root field lookup to one operation type (optional)",
+                    "enum": ["query", "mutation", "subscription"]
+                },
+                "include_optional_args": {
+                    "type": "boolean",
+                    "description": "Declare variables for optional arguments too, not only required ones (default: true)"
+                },
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "required": ["root_field"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "aggregate",
+        "description": "Count, sum, average, min or max a table's rows server-side through its Hasura <table>_aggregate field, optionally filtered and grouped; only the aggregated numbers are returned",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "table": {
+                    "type": "string",
+                    "description": "Table root field (e.g. form_submissions); <table>_aggregate must exist on the query root"
+                },
+                "functions": {
+                    "type": "object",
+                    "additionalProperties": {"type": "array", "items": {"type": "string"}},
+                    "description": "Aggregate functions to columns, e.g. {\"sum\": [\"amount\"], \"max\": [\"created_at\"]} (count is always included)"
+                },
+                "where": {
+                    "type": "object",
+                    "description": "Hasura bool_exp filter, e.g. {\"created_at\": {\"_gte\": \"2024-01-01\"}} (optional)"
+                },
+                "group_by": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Columns to group by; each distinct combination gets its own aggregates (optional)"
+                },
+                "count_distinct": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Also count distinct values of these columns (optional)"
+                },
+                "max_groups": {
+                    "type": "integer",
+                    "description": "Maximum number of groups to aggregate (default: 50)",
+                    "minimum": 1,
+                    "maximum": 500
+                },
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "required": ["table"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "explain-query",
+        "description": "Show the SQL Hasura generates for a query and the Postgres plan per root field, with warnings for sequential scans, where columns filtered without an index and high row estimates",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "The GraphQL query to explain"
+                },
+                "variables": {
+                    "type": "object",
+                    "description": "Variables for the query (optional)"
+                },
+                "operation_name": {
+                    "type": "string",
+                    "description": "Operation name if the document contains multiple operations (optional)"
+                },
+                "role": {
+                    "type": "string",
+                    "description": "Hasura role to plan the query as, so its permission filters are included (optional)"
+                },
+                "row_threshold": {
+                    "type": "integer",
+                    "description": "Warn about plan nodes estimating at least this many rows (default: 10000)",
+                    "minimum": 1
+                },
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "required": ["query"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "bulk-mutation",
+        "description": "Insert or update many rows through a Hasura insert_<table> or update_<table>_many mutation, split into size-bounded chunks sent a few at a time; reports total affected_rows and the row ranges of failed chunks",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "mutation": {
+                    "type": "string",
+                    "description": "Mutation root field, e.g. insert_form_submissions or update_form_submissions_many"
+                },
+                "rows": {
+                    "type": "array",
+                    "items": {"type": "object"},
+                    "description": "The objects to insert, or the updates ({\"where\": ..., \"_set\": ...}) for update_<table>_many"
+                },
+                "rows_file": {
+                    "type": "string",
+                    "description": "Read the rows from a local JSON array or JSON Lines file instead (optional)"
+                },
+                "on_conflict": {
+                    "type": "object",
+                    "description": "Upsert condition for inserts, e.g. {\"constraint\": \"users_pkey\", \"update_columns\": [\"name\"]} (optional)"
+                },
+                "chunk_rows": {
+                    "type": "integer",
+                    "description": "Maximum rows per request (default: 1000)",
+                    "minimum": 1
+                },
+                "chunk_bytes": {
+                    "type": "integer",
+                    "description": "Approximate maximum encoded size of the rows per request (default: 524288)",
+                    "minimum": 1024
+                },
+                "concurrency": {
+                    "type": "integer",
+                    "description": "Chunks in flight at once (default: 4)",
+                    "minimum": 1,
+                    "maximum": 16
+                },
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "required": ["mutation"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "subscribe",
+        "description": "Start a GraphQL subscription (e.g. new form_submissions) over the endpoint's websocket; events are buffered for poll-subscription instead of re-running queries",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "The subscription document (live query or Hasura _stream subscription)"
+                },
+                "variables": {
+                    "type": "object",
+                    "description": "Variables for the subscription (optional)"
+                },
+                "operation_name": {
+                    "type": "string",
+                    "description": "Operation name if the document contains multiple operations (optional)"
+                },
+                "buffer_size": {
+                    "type": "integer",
+                    "description": "Maximum number of unread events kept (default: 1000)",
+                    "minimum": 1,
+                    "maximum": 100000
+                },
+                "overflow": {
+                    "type": "string",
+                    "description": "When the buffer is full: drop the oldest unread event, or stop reading from the server until events are polled (default: drop_oldest)",
+                    "enum": ["drop_oldest", "block"]
+                },
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "required": ["query"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "poll-subscription",
+        "description": "Read a batch of buffered subscription events from a cursor; pass the returned next cursor to continue (events before it are then released)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "subscription_id": {
+                    "type": "string",
+                    "description": "ID returned by subscribe"
+                },
+                "cursor": {
+                    "type": "integer",
+                    "description": "Cursor to read from (default: 0)",
+                    "minimum": 0
+                },
+                "max_events": {
+                    "type": "integer",
+                    "description": "Maximum number of events to return (default: 100)",
+                    "minimum": 1,
+                    "maximum": 1000
+                },
+                "wait_seconds": {
+                    "type": "number",
+                    "description": "Wait up to this long for an event if none is buffered (default: 0)",
+                    "minimum": 0,
+                    "maximum": 30
+                },
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "required": ["subscription_id"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "unsubscribe",
+        "description": "Stop a subscription and discard its buffered events",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "subscription_id": {
+                    "type": "string",
+                    "description": "ID returned by subscribe"
+                },
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "required": ["subscription_id"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "list-persisted-queries",
+        "description": "List the registered operation documents (from the repo's .gql files) and the endpoint's persisted query status",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "get-metrics",
+        "description": "Show request counters (retries, hedges, timeouts), circuit breaker state, recent latency percentiles and the timeout/retry policy for an endpoint",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "endpoint": ENDPOINT_PROPERTY
+            },
+            "additionalProperties": False
+        }
+    }
+]
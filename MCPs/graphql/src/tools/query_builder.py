@@ -0,0 +1,167 @@
+"""
+Selection-set generation for root fields.
+
+Expansion is memoized per (type, depth, filter). A relation back to a type that is
+already being expanded on the current path is skipped (cycle detection), so each
+memo entry records which relation targets it depends on and is only reused when
+those targets have the same on-path status.
+"""
+
+from fnmatch import fnmatchcase
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from schema_index import SchemaIndex, base_type_name, format_type_ref
+
+
+LEAF_KINDS = ("SCALAR", "ENUM")
+COMPOSITE_KINDS = ("OBJECT", "INTERFACE")
+DEFAULT_EXCLUDE = ["*_aggregate"]
+MAX_DEPTH = 5
+
+ROOT_TYPES = (("query", "queryType"), ("mutation", "mutationType"), ("subscription", "subscriptionType"))
+
+
+def _base_kind(type_ref: Optional[Dict[str, Any]]) -> Optional[str]:
+    current = type_ref
+    while current and current.get("kind") in ["NON_NULL", "LIST"]:
+        current = current.get("ofType")
+    return current.get("kind") if current else None
+
+
+def _has_required_args(field: Dict[str, Any]) -> bool:
+    return any(
+        (arg.get("type") or {}).get("kind") == "NON_NULL" and arg.get("defaultValue") is None
+        for arg in field.get("args") or []
+    )
+
+
+def operation_name_for(root_field: str) -> str:
+    """PascalCase operation name for a root field (insert_form_steps -> InsertFormSteps)."""
+    return "".join(part[:1].upper() + part[1:] for part in root_field.split("_") if part) or "Operation"
+
+
+class SelectionSetBuilder:
+    """Builds selection sets for one filter; the memo lives on the schema index."""
+    
+    def __init__(self, index: SchemaIndex, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None):
+        self.index = index
+        self.include = list(include or [])
+        self.exclude = list(DEFAULT_EXCLUDE if exclude is None else exclude)
+        filter_key = (tuple(self.include), tuple(self.exclude))
+        # (type, depth) -> [(dependencies, on-path dependencies, lines)]
+        self._memo: Dict[Tuple[str, int], List[Tuple[FrozenSet[str], FrozenSet[str], List[str]]]] = \
+            index.memo.setdefault(("selection", filter_key), {})
+        self.memo_hits = 0
+        self.memo_misses = 0
+    
+    def _allowed(self, type_name: str, field_name: str) -> bool:
+        """Include/exclude glob patterns match either `field` or `Type.field`."""
+        qualified = f"{type_name}.{field_name}"
+        
+        def matches(patterns: List[str]) -> bool:
+            return any(fnmatchcase(field_name, p) or fnmatchcase(qualified, p) for p in patterns)
+        
+        if self.include and not matches(self.include):
+            return False
+        return not matches(self.exclude)
+    
+    def expand(self, type_name: str, depth: int, path: FrozenSet[str] = frozenset()) -> Tuple[List[str], FrozenSet[str]]:
+        """
+        Selection lines for `type_name` with `depth` relation levels below it.
+        
+        `path` holds the types being expanded above this one. Returns the lines and
+        the relation targets the result depends on.
+        """
+        for dependencies, on_path, lines in self._memo.get((type_name, depth), []):
+            if dependencies & path == on_path:
+                self.memo_hits += 1
+                return lines, dependencies
+        self.memo_misses += 1
+        
+        type_info = self.index.get_type(type_name) or {}
+        inner_path = path | {type_name}
+        lines: List[str] = []
+        touched = set()
+        
+        for field in type_info.get("fields") or []:
+            field_name = field.get("name", "")
+            if field_name.startswith("__") or _has_required_args(field) or not self._allowed(type_name, field_name):
+                continue
+            
+            kind = _base_kind(field.get("type"))
+            if kind in LEAF_KINDS:
+                lines.append(field_name)
+            elif kind in COMPOSITE_KINDS and depth > 0:
+                target = base_type_name(field.get("type"))
+                touched.add(target)
+                if target in inner_path:
+                    # Cycle on the relation graph: don't walk back into an ancestor
+                    continue
+                sub_lines, sub_dependencies = self.expand(target, depth - 1, inner_path)
+                touched |= sub_dependencies
+                lines.append(f"{field_name} {{")
+                lines.extend(f"  {line}" for line in sub_lines)
+                lines.append("}")
+        
+        if not lines:
+            lines.append("__typename")
+        
+        # The type itself is always on its own inner path, so it is not a dependency on `path`
+        dependencies = frozenset(touched - {type_name})
+        self._memo.setdefault((type_name, depth), []).append((dependencies, dependencies & path, lines))
+        return lines, dependencies
+
+
+def find_root_field(index: SchemaIndex, root_field: str, operation: Optional[str] = None) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Locate a root field, returning (operation type, field)."""
+    for op, schema_key in ROOT_TYPES:
+        if operation and op != operation:
+            continue
+        root_type_name = (index.schema.get(schema_key) or {}).get("name")
+        root_type = index.get_type(root_type_name) if root_type_name else None
+        for field in (root_type or {}).get("fields") or []:
+            if field.get("name") == root_field:
+                return op, field
+    return None
+
+
+def build_document(index: SchemaIndex, operation: str, field: Dict[str, Any], depth: int,
+                   include: Optional[List[str]] = None, exclude: Optional[List[str]] = None,
+                   include_optional_args: bool = True) -> Dict[str, Any]:
+    """Generate an operation document for one root field with variables declared from its arguments."""
+    root_field = field.get("name", "")
+    args = [
+        arg for arg in field.get("args") or []
+        if include_optional_args or ((arg.get("type") or {}).get("kind") == "NON_NULL" and arg.get("defaultValue") is None)
+    ]
+    
+    variable_defs = ", ".join(f"${arg['name']}: {format_type_ref(arg.get('type'))}" for arg in args)
+    call_args = ", ".join(f"{arg['name']}: ${arg['name']}" for arg in args)
+    
+    header = f"{operation} {operation_name_for(root_field)}"
+    if variable_defs:
+        header += f"({variable_defs})"
+    field_line = root_field + (f"({call_args})" if call_args else "")
+    
+    builder = SelectionSetBuilder(index, include, exclude)
+    lines = [f"{header} {{"]
+    if _base_kind(field.get("type")) in COMPOSITE_KINDS:
+        selection, _ = builder.expand(base_type_name(field.get("type")), depth)
+        lines.append(f"  {field_line} {{")
+        lines.extend(f"    {line}" for line in selection)
+        lines.append("  }")
+        # Leaf and relation lines; the closing braces of nested selections are not fields
+        field_count = sum(1 for line in selection if line.strip() != "}")
+    else:
+        lines.append(f"  {field_line}")
+        field_count = 0
+    lines.append("}")
+    
+    return {
+        "document": "\n".join(lines),
+        "operation_name": operation_name_for(root_field),
+        "variables": args,
+        "field_count": field_count,
+        "memo_hits": builder.memo_hits,
+        "memo_misses": builder.memo_misses
+    }
@@ -0,0 +1,108 @@
+"""
+Hasura explain API helpers: the explain URL, Postgres plan parsing and plan warnings.
+
+Hasura answers POST /v1/graphql/explain with one entry per root field, each holding
+the generated SQL and the text-format EXPLAIN output as a list of lines.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+
+DEFAULT_ROW_THRESHOLD = 10000
+
+_NODE_RE = re.compile(r"^(?P<indent>\s*)(?:->\s+)?(?P<label>.+?)\s+\(cost=(?P<startup>[\d.]+)\.\.(?P<total>[\d.]+) rows=(?P<rows>\d+) width=\d+\)")
+_RELATION_RE = re.compile(r" on (?P<relation>[\w.\"]+)")
+_CONDITION_KEYS = ("Filter", "Index Cond", "Recheck Cond", "Join Filter", "Hash Cond", "Merge Cond")
+
+
+def explain_url(endpoint: str) -> str:
+    """https://host/v1/graphql -> https://host/v1/graphql/explain (other paths map to /v1/graphql/explain)."""
+    parts = urlsplit(endpoint)
+    path = parts.path.rstrip("/")
+    path = path + "/explain" if path.endswith("/v1/graphql") else "/v1/graphql/explain"
+    return urlunsplit((parts.scheme, parts.netloc, path, "", ""))
+
+
+def parse_plan(lines: List[str]) -> List[Dict[str, Any]]:
+    """Plan nodes in order, each with its label, relation, cost/row estimates and conditions."""
+    nodes: List[Dict[str, Any]] = []
+    for line in lines:
+        match = _NODE_RE.match(line)
+        if match:
+            label = match.group("label").strip()
+            relation = _RELATION_RE.search(label)
+            nodes.append({
+                "label": label,
+                "node_type": label.split(" on ")[0].split(" using ")[0],
+                "relation": relation.group("relation").replace('"', "") if relation else None,
+                "total_cost": float(match.group("total")),
+                "rows": int(match.group("rows")),
+                "depth": len(match.group("indent")),
+                "conditions": {}
+            })
+            continue
+        
+        stripped = line.strip()
+        for key in _CONDITION_KEYS:
+            if nodes and stripped.startswith(f"{key}:"):
+                nodes[-1]["conditions"][key] = stripped[len(key) + 1:].strip()
+    return nodes
+
+
+def _bool_exp_columns(value: Any, columns: set):
+    """Column names in a Hasura bool_exp (operators start with an underscore)."""
+    if isinstance(value, list):
+        for item in value:
+            _bool_exp_columns(item, columns)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key in ("_and", "_or", "_not"):
+                _bool_exp_columns(item, columns)
+            elif not key.startswith("_"):
+                columns.add(key)
+
+
+def where_columns(document: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, List[str]]:
+    """Top-level `where` columns per root field response key (alias or name)."""
+    from graphql import parse, value_from_ast_untyped
+    from graphql.language import FieldNode, OperationDefinitionNode
+    
+    columns: Dict[str, List[str]] = {}
+    for definition in parse(document).definitions:
+        if not isinstance(definition, OperationDefinitionNode):
+            continue
+        for selection in definition.selection_set.selections:
+            if not isinstance(selection, FieldNode):
+                continue
+            found: set = set()
+            for argument in selection.arguments or []:
+                if argument.name.value == "where":
+                    _bool_exp_columns(value_from_ast_untyped(argument.value, variables or {}), found)
+            key = (selection.alias or selection.name).value
+            columns[key] = sorted(found)
+    return columns
+
+
+def plan_warnings(nodes: List[Dict[str, Any]], filter_columns: List[str],
+                  row_threshold: int = DEFAULT_ROW_THRESHOLD) -> List[str]:
+    """Seq scans, `where` columns only applied as a filter (no index used) and large row estimates."""
+    warnings = []
+    indexed = " ".join(
+        node["conditions"].get(key, "") for node in nodes for key in ("Index Cond", "Recheck Cond")
+    )
+    
+    for node in nodes:
+        if node["node_type"] == "Seq Scan":
+            warnings.append(f"Sequential scan on {node['relation']} (~{node['rows']} rows estimated)")
+            condition = node["conditions"].get("Filter", "")
+            for column in filter_columns:
+                if re.search(rf"\b{re.escape(column)}\b", condition) and not re.search(rf"\b{re.escape(column)}\b", indexed):
+                    warnings.append(
+                        f"`where` column {column} on {node['relation']} is filtered without an index; "
+                        f"consider CREATE INDEX ON {node['relation']} ({column})"
+                    )
+        if node["rows"] >= row_threshold:
+            warnings.append(f"High row estimate: {node['label']} expects {node['rows']} rows")
+    return warnings
@@ -0,0 +1,51 @@
+"""
+Chunked rendering of tool output.
+
+Renderers yield output lines (a "line" may itself span several lines, e.g. one
+pretty-printed row) that would otherwise be "\\n".join()ed into one string. These
+helpers pack them into bounded parts instead, so a large result never needs one
+more full-size copy of itself; concatenating the parts gives the joined text.
+"""
+
+from typing import Iterable, Iterator
+
+
+# Roughly one screenful of markdown per content part
+CHUNK_CHARS = 32 * 1024
+
+
+def render(lines: Iterable[str]) -> str:
+    """The whole output as one string."""
+    return "\n".join(lines)
+
+
+def chunk_lines(lines: Iterable[str], max_chars: int = CHUNK_CHARS) -> Iterator[str]:
+    """Pack lines into parts of at most max_chars; a part ends with the newline that follows its last line."""
+    parts = []
+    size = 0
+    first = True
+    emitted = False
+    for line in lines:
+        if not first:
+            if size >= max_chars:
+                yield "".join(parts)
+                emitted = True
+                parts, size = [], 0
+            parts.append("\n")
+            size += 1
+        first = False
+        
+        while size + len(line) > max_chars:
+            # Fill the current part, splitting an oversized line across parts
+            room = max_chars - size
+            parts.append(line[:room])
+            line = line[room:]
+            yield "".join(parts)
+            emitted = True
+            parts, size = [], 0
+        parts.append(line)
+        size += len(line)
+    
+    text = "".join(parts)
+    if text or not emitted:
+        yield text
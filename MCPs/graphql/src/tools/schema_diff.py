@@ -0,0 +1,241 @@
+"""
+Schema comparison at the type, field and argument level.
+
+Types whose content hashes match are skipped without being inspected, so diffing
+two versions of a large schema only walks the types that actually changed. A type
+whose hash differs without any change reported here (e.g. only its fields were
+reordered) is listed as changed by hash only, never counted as unchanged.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from schema_index import format_type_ref
+
+
+def _is_required(value: Dict[str, Any]) -> bool:
+    """An argument or input field that callers must provide."""
+    return (value.get("type") or {}).get("kind") == "NON_NULL" and value.get("defaultValue") is None
+
+
+def _is_safe_output_change(old: str, new: str) -> bool:
+    """Output types may only become stricter (T -> T!)."""
+    return new == f"{old}!"
+
+
+def _is_safe_input_change(old: str, new: str) -> bool:
+    """Input types may only become looser (T! -> T)."""
+    return old == f"{new}!"
+
+
+def _by_name(items: Optional[List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    return {item.get("name", ""): item for item in items or []}
+
+
+def _description_changed(old: Dict[str, Any], new: Dict[str, Any]) -> bool:
+    return (old.get("description") or "") != (new.get("description") or "")
+
+
+def _diff_deprecation(old: Dict[str, Any], new: Dict[str, Any], label: str, changes: List[str]):
+    """Deprecation changes of a field, enum value or input value; `label` names it."""
+    if not old.get("isDeprecated") and new.get("isDeprecated"):
+        changes.append(f"{label} deprecated: {new.get('deprecationReason') or 'No reason provided'}")
+    elif old.get("isDeprecated") and not new.get("isDeprecated"):
+        changes.append(f"{label} no longer deprecated")
+    elif old.get("isDeprecated") and old.get("deprecationReason") != new.get("deprecationReason"):
+        changes.append(f"{label}: deprecation reason changed")
+
+
+def _diff_input_values(old_values: Optional[List[Dict[str, Any]]], new_values: Optional[List[Dict[str, Any]]],
+                       label: str, changes: List[str], breaking: List[str]):
+    """Compare arguments or input fields; `label` prefixes each message."""
+    old_map, new_map = _by_name(old_values), _by_name(new_values)
+    
+    for name, value in new_map.items():
+        if name not in old_map:
+            value_type = format_type_ref(value.get("type"))
+            message = f"{label}.{name}: {value_type} added"
+            changes.append(message)
+            if _is_required(value):
+                breaking.append(f"{message} (required)")
+    
+    for name, value in old_map.items():
+        if name not in new_map:
+            message = f"{label}.{name} removed"
+            changes.append(message)
+            breaking.append(message)
+            continue
+        
+        old_type = format_type_ref(value.get("type"))
+        new_type = format_type_ref(new_map[name].get("type"))
+        if old_type != new_type:
+            message = f"{label}.{name}: {old_type} → {new_type}"
+            changes.append(message)
+            if not _is_safe_input_change(old_type, new_type):
+                breaking.append(message)
+        if value.get("defaultValue") != new_map[name].get("defaultValue"):
+            changes.append(f"{label}.{name}: default {value.get('defaultValue')} → {new_map[name].get('defaultValue')}")
+        if _description_changed(value, new_map[name]):
+            changes.append(f"{label}.{name}: description changed")
+        _diff_deprecation(value, new_map[name], f"{label}.{name}", changes)
+
+
+def diff_type(old: Dict[str, Any], new: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """Return (changes, breaking changes) between two versions of one type."""
+    type_name = new.get("name", "")
+    changes: List[str] = []
+    breaking: List[str] = []
+    
+    if old.get("kind") != new.get("kind"):
+        message = f"{type_name}: kind {old.get('kind')} → {new.get('kind')}"
+        return [message], [message]
+    
+    if _description_changed(old, new):
+        changes.append(f"{type_name}: description changed")
+    
+    # Output fields and their arguments
+    old_fields, new_fields = _by_name(old.get("fields")), _by_name(new.get("fields"))
+    for name, field in new_fields.items():
+        if name not in old_fields:
+            changes.append(f"{type_name}.{name}: {format_type_ref(field.get('type'))} added")
+    for name, field in old_fields.items():
+        if name not in new_fields:
+            message = f"{type_name}.{name} removed"
+            changes.append(message)
+            breaking.append(message)
+            continue
+        
+        new_field = new_fields[name]
+        old_type = format_type_ref(field.get("type"))
+        new_type = format_type_ref(new_field.get("type"))
+        if old_type != new_type:
+            message = f"{type_name}.{name}: {old_type} → {new_type}"
+            changes.append(message)
+            if not _is_safe_output_change(old_type, new_type):
+                breaking.append(message)
+        if _description_changed(field, new_field):
+            changes.append(f"{type_name}.{name}: description changed")
+        _diff_deprecation(field, new_field, f"{type_name}.{name}", changes)
+        _diff_input_values(field.get("args"), new_field.get("args"), f"{type_name}.{name}(args)", changes, breaking)
+    
+    # Input object fields
+    if old.get("inputFields") is not None or new.get("inputFields") is not None:
+        _diff_input_values(old.get("inputFields"), new.get("inputFields"), type_name, changes, breaking)
+    
+    # Enum values
+    old_values, new_values = _by_name(old.get("enumValues")), _by_name(new.get("enumValues"))
+    for name in new_values:
+        if name not in old_values:
+            changes.append(f"{type_name}.{name} enum value added")
+    for name, value in old_values.items():
+        if name not in new_values:
+            message = f"{type_name}.{name} enum value removed"
+            changes.append(message)
+            breaking.append(message)
+            continue
+        if _description_changed(value, new_values[name]):
+            changes.append(f"{type_name}.{name}: description changed")
+        _diff_deprecation(value, new_values[name], f"{type_name}.{name}", changes)
+    
+    # Union members and implemented interfaces
+    for key, label in (("possibleTypes", "possible type"), ("interfaces", "interface")):
+        old_names = {t.get("name") for t in old.get(key) or []}
+        new_names = {t.get("name") for t in new.get(key) or []}
+        for name in sorted(new_names - old_names):
+            changes.append(f"{type_name}: {label} {name} added")
+        for name in sorted(old_names - new_names):
+            message = f"{type_name}: {label} {name} removed"
+            changes.append(message)
+            breaking.append(message)
+    
+    return changes, breaking
+
+
+def diff_schemas(old_types: Dict[str, Dict[str, Any]], old_hashes: Dict[str, str],
+                 new_types: Dict[str, Dict[str, Any]], new_hashes: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Compare two schema versions given their types by name and per-type content hashes.
+    
+    Returns added/removed type names, per-type changes for types whose hash differs,
+    the types whose hash differs without a reportable change (hash_only), and the
+    subset of changes that break existing operations.
+    """
+    added = sorted(name for name in new_hashes if name not in old_hashes)
+    removed = sorted(name for name in old_hashes if name not in new_hashes)
+    changed: Dict[str, List[str]] = {}
+    hash_only: List[str] = []
+    breaking: List[str] = [f"{name} removed" for name in removed if not name.startswith("__")]
+    
+    for name in sorted(new_hashes):
+        if name not in old_hashes or old_hashes[name] == new_hashes[name]:
+            continue
+        type_changes, type_breaking = diff_type(old_types[name], new_types[name])
+        if type_changes:
+            changed[name] = type_changes
+            breaking.extend(type_breaking)
+        else:
+            hash_only.append(name)
+    
+    return {
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "hash_only": hash_only,
+        "breaking": breaking,
+        "unchanged": len(new_hashes) - len(added) - len(changed) - len(hash_only)
+    }
+
+
+def format_schema_diff(diff: Dict[str, Any], base: str, target: str, max_changes_per_type: int = 50) -> str:
+    """Format a diff_schemas result for display."""
+    output = [f"# Schema Diff: {base} → {target}\n"]
+    
+    if not diff["added"] and not diff["removed"] and not diff["changed"] and not diff["hash_only"]:
+        output.append(f"No differences found ({diff['unchanged']} types compared)")
+        return "\n".join(output)
+    
+    output.append("## Summary")
+    output.append(f"- **Added types:** {len(diff['added'])}")
+    output.append(f"- **Removed types:** {len(diff['removed'])}")
+    output.append(f"- **Changed types:** {len(diff['changed'])}")
+    if diff["hash_only"]:
+        output.append(f"- **Changed types (hash only):** {len(diff['hash_only'])}")
+    output.append(f"- **Unchanged types:** {diff['unchanged']}")
+    output.append(f"- **Breaking changes:** {len(diff['breaking'])}")
+    output.append("")
+    
+    if diff["breaking"]:
+        output.append("## ⚠️ Breaking Changes")
+        for message in diff["breaking"]:
+            output.append(f"- {message}")
+        output.append("")
+    
+    if diff["added"]:
+        output.append("## Added Types")
+        for name in diff["added"]:
+            output.append(f"- {name}")
+        output.append("")
+    
+    if diff["removed"]:
+        output.append("## Removed Types")
+        for name in diff["removed"]:
+            output.append(f"- {name}")
+        output.append("")
+    
+    if diff["changed"]:
+        output.append("## Changed Types")
+        for name, changes in diff["changed"].items():
+            output.append(f"### {name}")
+            for message in changes[:max_changes_per_type]:
+                output.append(f"- {message}")
+            if len(changes) > max_changes_per_type:
+                output.append(f"- ... {len(changes) - max_changes_per_type} more")
+        output.append("")
+    
+    if diff["hash_only"]:
+        output.append("## Changed Types (hash only)")
+        output.append("Content differs (e.g. field order) without a change listed above:")
+        for name in diff["hash_only"]:
+            output.append(f"- {name}")
+        output.append("")
+    
+    return "\n".join(output)
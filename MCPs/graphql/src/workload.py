@@ -0,0 +1,137 @@
+"""
+Opt-in workload recording for sizing and load tests.
+
+With GRAPHQL_WORKLOAD_LOG set, every tool call appends one JSON line to that file:
+tool, endpoint, duration and response size, and for execute-query the normalized
+document, its hash and operation type, and the *shape* of its variables. Variable
+values are never written: each is replaced by its type ("uuid", "timestamp", "int",
+...; lists keep their length), which is enough for benchmarks/replay.py to
+synthesize placeholder values of the right type. Literals inlined in the document
+are kept, so sensitive values belong in variables.
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import json_codec
+
+
+_UUID_RE = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+_TIMESTAMP_RE = re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Shape of a list: {"__list__": length, "items": shape of its first element}
+LIST_KEY = "__list__"
+
+PLACEHOLDERS = {
+    "uuid": "00000000-0000-0000-0000-000000000000",
+    "timestamp": "1970-01-01T00:00:00+00:00",
+    "date": "1970-01-01",
+    "string": "x",
+    "int": 0,
+    "float": 0.0,
+    "bool": False,
+    "null": None
+}
+
+
+def value_shape(value: Any) -> Any:
+    """The redacted shape of a JSON value."""
+    if isinstance(value, dict):
+        return {key: value_shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return {LIST_KEY: len(value), "items": value_shape(value[0]) if value else None}
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    text = str(value)
+    if _UUID_RE.match(text):
+        return "uuid"
+    if _TIMESTAMP_RE.match(text):
+        return "timestamp"
+    if _DATE_RE.match(text):
+        return "date"
+    return "string"
+
+
+def synthesize(shape: Any) -> Any:
+    """A placeholder value with the given shape (inverse of value_shape, minus the values)."""
+    if isinstance(shape, dict):
+        if LIST_KEY in shape:
+            item = shape.get("items")
+            return [synthesize(item) for _ in range(shape[LIST_KEY])] if item is not None else []
+        return {key: synthesize(item) for key, item in shape.items()}
+    return PLACEHOLDERS.get(shape, "x")
+
+
+@lru_cache(maxsize=256)
+def normalize_document(document: str) -> str:
+    """Canonical formatting (graphql-core's printer), so the same operation always hashes the same."""
+    try:
+        from graphql import parse, print_ast
+        
+        return print_ast(parse(document, no_location=True))
+    except Exception:
+        return " ".join(document.split())
+
+
+def _is_error(text: str) -> bool:
+    return text.startswith(("Error", "Warning:", "# GraphQL Query Error"))
+
+
+class WorkloadRecorder:
+    """Appends one JSON line per tool call to a local file."""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self.records = 0
+    
+    @classmethod
+    def from_env(cls) -> Optional["WorkloadRecorder"]:
+        """A recorder for GRAPHQL_WORKLOAD_LOG, or None when recording is off."""
+        path = os.getenv("GRAPHQL_WORKLOAD_LOG")
+        return cls(path) if path else None
+    
+    def record(self, tool: str, arguments: Dict[str, Any], started_at: float, duration: float, texts: list):
+        record: Dict[str, Any] = {
+            "ts": round(started_at, 6),
+            "tool": tool,
+            "endpoint": arguments.get("endpoint"),
+            "duration_ms": round(duration * 1000, 3),
+            "response_chars": sum(len(text) for text in texts),
+            "parts": len(texts),
+            "error": bool(texts) and _is_error(texts[0])
+        }
+        
+        if tool == "execute-query":
+            from persisted_queries import document_hash
+            from resilience import operation_type
+            
+            query = arguments.get("query")
+            if query:
+                document = normalize_document(query)
+                record["document"] = document
+                record["document_sha256"] = document_hash(document)
+                record["operation_type"] = operation_type(document)
+            if arguments.get("persisted_query"):
+                record["persisted_query"] = arguments["persisted_query"]
+            if arguments.get("operation_name"):
+                record["operation_name"] = arguments["operation_name"]
+            record["variables"] = value_shape(arguments.get("variables") or {})
+        else:
+            record["arguments"] = value_shape({key: value for key, value in arguments.items() if key != "endpoint"})
+        
+        self._file.write(json_codec.dumps_bytes(record).decode() + "\n")
+        self._file.flush()
+        self.records += 1
+    
+    def close(self):
+        self._file.close()
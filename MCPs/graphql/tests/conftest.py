@@ -0,0 +1,29 @@
+"""
+Shared fixtures: the server modules are imported the way main.py imports them,
+and the benchmark stubs (benchmarks.stub_server, benchmarks.ws_stub) serve as
+the upstream.
+"""
+
+import os
+import sys
+
+import pytest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (PACKAGE_DIR, os.path.join(PACKAGE_DIR, "src")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from benchmarks.schema_gen import generate_introspection  # noqa: E402
+from benchmarks.stub_server import StubConfig, StubGraphQLServer  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def schema():
+    return generate_introspection(n_tables=3)
+
+
+@pytest.fixture
+def stub(schema):
+    with StubGraphQLServer(config=StubConfig(schema=schema)) as server:
+        yield server
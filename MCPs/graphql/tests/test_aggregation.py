@@ -0,0 +1,109 @@
+import asyncio
+
+from graphql_client import GraphQLClient
+from schema_index import SchemaIndex
+from tools.aggregation import build_aggregate_document, describe_aggregate, group_filter, validate_request
+
+ROWS = [
+    {"col_00": f"group {i % 5}" if i % 7 else None, "created_at": f"2024-01-{i % 28 + 1:02d}T00:00:00+00:00"}
+    for i in range(100)
+]
+
+
+def _matches(row, where):
+    """The subset of Hasura bool_exp the aggregate tool sends."""
+    for key, condition in (where or {}).items():
+        if key == "_and":
+            if not all(_matches(row, part) for part in condition):
+                return False
+        elif "_eq" in condition and row.get(key) != condition["_eq"]:
+            return False
+        elif condition.get("_is_null") and row.get(key) is not None:
+            return False
+    return True
+
+
+def _aggregate(where):
+    matching = [row for row in ROWS if _matches(row, where)]
+    return {"aggregate": {"count": len(matching), "max": {"created_at": max((row["created_at"] for row in matching), default=None)}}}
+
+
+def respond(request):
+    """entity_0000 backed by ROWS: distinct groups and aliased _aggregate fields."""
+    variables = request.get("variables") or {}
+    if "distinct_on" in request["query"]:
+        groups = []
+        for row in sorted(ROWS, key=lambda row: (row["col_00"] is None, row["col_00"] or "")):
+            if _matches(row, variables.get("where")) and {"col_00": row["col_00"]} not in groups:
+                groups.append({"col_00": row["col_00"]})
+        return {"data": {"entity_0000": groups[:variables.get("limit")]}}
+    filters = sorted(key for key in variables if key.startswith("w"))
+    if len(filters) == 1:
+        return {"data": {"entity_0000_aggregate": _aggregate(variables["w0"])}}
+    return {"data": {f"g{i}": _aggregate(variables[f"w{i}"]) for i in range(len(filters))}}
+
+
+def _run(stub, **kwargs):
+    stub.config.responder = respond
+    
+    async def scenario():
+        client = GraphQLClient(endpoint=stub.url)
+        try:
+            await client._get_index()
+            before = stub.stats["requests"]
+            output = await client.aggregate("entity_0000", functions={"max": ["created_at"]}, **kwargs)
+            return output, stub.stats["requests"] - before
+        finally:
+            await client.aclose()
+    
+    return asyncio.run(scenario())
+
+
+def test_describe_and_validate(schema):
+    info = describe_aggregate(SchemaIndex(schema), "entity_0000")
+    assert info["root_field"] == "entity_0000_aggregate" and info["select_field"] == "entity_0000"
+    assert "created_at" in info["functions"]["max"] and "col_00" in info["columns"]
+    assert describe_aggregate(SchemaIndex(schema), "entity_0000_aggregate")["table"] == "entity_0000"
+    assert describe_aggregate(SchemaIndex(schema), "no_such_table") is None
+    
+    assert validate_request(info, {"max": ["created_at"]}, ["col_00"], []) is None
+    assert "Unknown aggregate function 'median'" in validate_request(info, {"median": ["id"]}, [], [])
+    assert "not available for max" in validate_request(info, {"max": ["nope"]}, [], [])
+    assert "Unknown column 'nope'" in validate_request(info, {}, ["nope"], [])
+    
+    document = build_aggregate_document(info, {"max": ["created_at"]}, [], filters=2)
+    assert "g0: entity_0000_aggregate(where: $w0)" in document and "g1:" in document
+    assert group_filter(None, {"col_00": None}) == {"col_00": {"_is_null": True}}
+    assert group_filter({"id": {"_gt": 1}}, {"col_00": "a"}) == {"_and": [{"id": {"_gt": 1}}, {"col_00": {"_eq": "a"}}]}
+
+
+def test_plain_aggregate(stub):
+    output, requests = _run(stub, where={"col_00": {"_eq": "group 1"}})
+    expected = _aggregate({"col_00": {"_eq": "group 1"}})["aggregate"]
+    assert f"| count | {expected['count']} |" in output
+    assert f"| max.created_at | {expected['max']['created_at']} |" in output
+    assert requests == 1
+
+
+def test_group_by_aggregate(stub):
+    output, requests = _run(stub, group_by=["col_00"])
+    assert "6 groups, 1 aggregate requests" in output
+    for group in ["group 0", "group 4", None]:
+        count = _aggregate({"col_00": {"_is_null": True}} if group is None else {"col_00": {"_eq": group}})["aggregate"]["count"]
+        assert f"| {'null' if group is None else group} | {count} |" in output
+    # The distinct groups, then one batched request of aliased aggregates
+    assert requests == 2
+    assert "Only the first" not in output
+
+
+def test_max_groups_limit(stub):
+    output, requests = _run(stub, group_by=["col_00"], max_groups=3)
+    assert "3 groups, 1 aggregate requests" in output
+    assert "| group 3 |" not in output
+    assert "Only the first 3 groups are shown" in output
+
+
+def test_unknown_columns_are_rejected_before_any_request(stub):
+    output, requests = _run(stub, group_by=["nope"])
+    assert output.startswith("Error: Unknown column 'nope'")
+    assert requests == 0
@@ -0,0 +1,53 @@
+import asyncio
+
+from graphql_client import GraphQLClient
+from schema_index import SchemaIndex
+from tools.bulk_mutation import build_bulk_document, describe_bulk_mutation, split_rows
+
+
+def test_split_rows_bounds_rows_and_bytes():
+    rows = [{"id": i, "name": "x" * 10} for i in range(10)]
+    chunks = list(split_rows(rows, max_rows=4, max_bytes=10 ** 6))
+    assert [start for start, _ in chunks] == [0, 4, 8]
+    assert [len(chunk) for _, chunk in chunks] == [4, 4, 2]
+    
+    # Each row encodes to about 30 bytes: two fit under 64
+    chunks = list(split_rows(rows, max_rows=100, max_bytes=64))
+    assert [len(chunk) for _, chunk in chunks] == [2] * 5
+    
+    # A row larger than max_bytes goes alone
+    chunks = list(split_rows([{"a": 1}, {"big": "y" * 200}, {"a": 2}], max_rows=100, max_bytes=64))
+    assert [len(chunk) for _, chunk in chunks] == [1, 1, 1]
+    assert list(split_rows([])) == []
+
+
+def test_describe_bulk_mutation(schema):
+    index = SchemaIndex(schema)
+    insert = describe_bulk_mutation(index, "insert_entity_0000")
+    assert insert["rows_arg"] == "objects" and insert["on_conflict_type"] and not insert["returns_list"]
+    assert "objects: $rows" in build_bulk_document(insert)
+    
+    update = describe_bulk_mutation(index, "update_entity_0000_many")
+    assert update["rows_arg"] == "updates" and update["returns_list"]
+    
+    assert describe_bulk_mutation(index, "delete_entity_0000") is None
+    assert describe_bulk_mutation(index, "insert_entity_0000_one") is None
+
+
+def test_bulk_insert_is_chunked_under_the_body_limit(stub):
+    stub.config.max_request_bytes = 8 * 1024
+    rows = [{"name": f"row {i}", "count": i} for i in range(500)]
+    
+    async def scenario():
+        client = GraphQLClient(endpoint=stub.url)
+        try:
+            info = describe_bulk_mutation(await client._get_index(), "insert_entity_0000")
+            return await client._bulk_mutation(info, rows, None, 1000, 4 * 1024, 4)
+        finally:
+            await client.aclose()
+    
+    totals = asyncio.run(scenario())
+    assert totals["failures"] == []
+    assert totals["chunks"] > 1
+    assert totals["affected_rows"] == len(rows) == stub.stats["mutation_rows"]
+    assert stub.stats["too_large"] == 0
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from concurrency_limiter import PRIORITIES, AdaptiveLimiter, LimiterPolicy, OverloadedError
+
+
+def _limiter(limit: int, queue_size: int = 256) -> AdaptiveLimiter:
+    return AdaptiveLimiter(LimiterPolicy(initial_limit=limit, max_limit=limit, queue_size=queue_size),
+                           max_connections=limit)
+
+
+def test_calls_over_the_limit_queue_by_priority():
+    async def scenario():
+        limiter = _limiter(1)
+        await limiter.acquire(PRIORITIES["query"])
+        order = []
+        
+        async def waiter(name, op_type):
+            await limiter.acquire(PRIORITIES[op_type])
+            order.append(name)
+            limiter.release()
+        
+        tasks = [asyncio.ensure_future(waiter("query", "query"))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.ensure_future(waiter("introspection", "introspection")))
+        await asyncio.sleep(0)
+        assert limiter.in_flight == 1 and limiter._queued == 2
+        
+        limiter.release()
+        await asyncio.gather(*tasks)
+        # Schema traffic goes ahead of the data query that queued first
+        assert order == ["introspection", "query"]
+        assert limiter.in_flight == 0 and limiter._queued == 0
+        assert limiter.counters["admitted"] == 3 and limiter.counters["queued"] == 2
+    
+    asyncio.run(scenario())
+
+
+def test_full_queue_evicts_lower_priority_calls():
+    async def scenario():
+        limiter = _limiter(1, queue_size=1)
+        await limiter.acquire(PRIORITIES["query"])
+        queued = asyncio.ensure_future(limiter.acquire(PRIORITIES["query"]))
+        await asyncio.sleep(0)
+        
+        # Same priority: the newcomer is turned away
+        with pytest.raises(OverloadedError, match="queue is full"):
+            await limiter.acquire(PRIORITIES["query"])
+        assert limiter.counters["rejected_queue_full"] == 1
+        
+        # Higher priority: the queued query is displaced
+        introspection = asyncio.ensure_future(limiter.acquire(PRIORITIES["introspection"]))
+        await asyncio.sleep(0)
+        with pytest.raises(OverloadedError, match="Displaced"):
+            await queued
+        assert limiter.counters["evicted"] == 1
+        
+        limiter.release()
+        await introspection
+        assert limiter.in_flight == 1 and limiter._queued == 0
+    
+    asyncio.run(scenario())
+
+
+def test_rejects_without_waiting():
+    async def scenario():
+        limiter = _limiter(1)
+        await limiter.acquire(PRIORITIES["query"])
+        
+        with pytest.raises(OverloadedError, match="No free upstream slot"):
+            await limiter.acquire(PRIORITIES["query"], wait=False)
+        
+        # A call that can't get a slot before its deadline is rejected up front
+        limiter._rtt_avg = 0.5
+        deadline = asyncio.get_running_loop().time() + 0.1
+        with pytest.raises(OverloadedError, match="miss its deadline"):
+            await limiter.acquire(PRIORITIES["query"], deadline)
+        assert limiter.counters["rejected_deadline"] == 1
+        assert limiter._queued == 0
+    
+    asyncio.run(scenario())
+
+
+def test_limit_follows_latency():
+    limiter = AdaptiveLimiter(LimiterPolicy(initial_limit=4), max_connections=8)
+    for _ in range(20):
+        limiter.on_result(0.01, False, in_flight_at_start=4)
+    assert limiter.limit > 4
+    
+    grown = limiter.limit
+    limiter.on_result(0.1, False, in_flight_at_start=4)
+    assert limiter.limit == pytest.approx(grown * limiter.policy.backoff_ratio)
+    
+    limiter._last_decrease = 0.0
+    limiter.on_result(0.0, True, in_flight_at_start=1)
+    assert limiter.counters["decreases"] == 2
+    assert limiter.limit >= limiter.min_limit
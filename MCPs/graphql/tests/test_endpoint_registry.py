@@ -0,0 +1,118 @@
+import asyncio
+import os
+
+import pytest
+
+from benchmarks.schema_gen import write_schema_files
+from endpoint_registry import EndpointConfig, EndpointRegistry
+from schema_index import SchemaIndex
+
+
+@pytest.fixture
+def clean_env(monkeypatch):
+    for key in list(os.environ):
+        if key.startswith("GRAPHQL_"):
+            monkeypatch.delenv(key)
+    return monkeypatch
+
+
+def test_from_env_parses_named_endpoints(clean_env):
+    clean_env.setenv("GRAPHQL_ENDPOINT", "http://default.example/v1/graphql")
+    clean_env.setenv("GRAPHQL_MAX_CONNECTIONS", "7")
+    clean_env.setenv("GRAPHQL_ENDPOINTS", "dev, staging-eu")
+    clean_env.setenv("GRAPHQL_DEV_ENDPOINT", "http://dev.example/v1/graphql")
+    clean_env.setenv("GRAPHQL_DEV_AUTH_VALUE", "dev-secret")
+    clean_env.setenv("GRAPHQL_DEV_PERSISTED_QUERIES", "true")
+    clean_env.setenv("GRAPHQL_STAGING_EU_ENDPOINT", "http://staging.example/v1/graphql")
+    clean_env.setenv("GRAPHQL_STAGING_EU_MAX_CONNECTIONS", "3")
+    clean_env.setenv("GRAPHQL_STAGING_EU_LIMIT_MAX", "2")
+    clean_env.setenv("GRAPHQL_DEFAULT_ENDPOINT", "dev")
+    clean_env.setenv("GRAPHQL_SCHEMA_CACHE_MB", "1.5")
+    
+    registry = EndpointRegistry.from_env()
+    assert registry.names() == ["default", "dev", "staging-eu"]
+    assert registry.default_name == "dev"
+    assert registry.schema_cache_budget_bytes == int(1.5 * 1024 * 1024)
+    
+    default, dev, staging = (registry.configs[name] for name in registry.names())
+    assert default.endpoint == "http://default.example/v1/graphql" and default.max_connections == 7
+    assert dev.auth_value == "dev-secret" and dev.persisted_queries and not default.persisted_queries
+    # Unset per-endpoint values fall back to the GRAPHQL_* ones
+    assert dev.max_connections == 7 and dev.auth_header == "x-hasura-admin-secret"
+    assert staging.max_connections == 3 and staging.limiter.max_limit == 2
+    assert default.limiter.max_limit is None
+
+
+def test_from_env_rejects_incomplete_configuration(clean_env):
+    clean_env.setenv("GRAPHQL_ENDPOINTS", "prod")
+    with pytest.raises(ValueError, match="GRAPHQL_PROD_ENDPOINT is not set"):
+        EndpointRegistry.from_env()
+    
+    clean_env.setenv("GRAPHQL_PROD_ENDPOINT", "http://prod.example/v1/graphql")
+    clean_env.setenv("GRAPHQL_DEFAULT_ENDPOINT", "staging")
+    with pytest.raises(ValueError, match="Default endpoint 'staging' is not configured"):
+        EndpointRegistry.from_env()
+
+
+def test_tool_calls_are_routed_by_endpoint(tmp_path, monkeypatch):
+    import main
+    
+    small = write_schema_files(str(tmp_path / "small"), 2)["json"]
+    large = write_schema_files(str(tmp_path / "large"), 5)["json"]
+    registry = EndpointRegistry([
+        EndpointConfig("small", "http://127.0.0.1:9/v1/graphql", schema_file=small),
+        EndpointConfig("large", "http://127.0.0.1:9/v1/graphql", schema_file=large)
+    ])
+    monkeypatch.setattr(main, "_registry", registry)
+    monkeypatch.setattr(main, "_recorder", None)
+    
+    async def type_info(endpoint=None):
+        arguments = {"type_name": "entity_0004"}
+        if endpoint:
+            arguments["endpoint"] = endpoint
+        return (await main.dispatch_tool("get-type-info", arguments))[0].text
+    
+    async def scenario():
+        try:
+            assert (await type_info("large")).startswith("# Type: entity_0004")
+            # The default endpoint (the first configured) has only two tables
+            assert "not found" in await type_info()
+            assert "not found" in await type_info("small")
+            unknown = await type_info("prod")
+            assert unknown == "Error: Unknown endpoint 'prod'. Available endpoints: small, large"
+        finally:
+            await registry.aclose()
+    
+    asyncio.run(scenario())
+    assert registry.get_client("small").schema_file == small
+    assert registry.get_client("large").schema_file == large
+
+
+def test_least_recently_used_schema_is_evicted(tmp_path, schema):
+    path = write_schema_files(str(tmp_path), 3)["json"]
+    size = SchemaIndex(schema).estimated_bytes
+    names = ["a", "b", "c"]
+    # Room for two loaded schemas, not three
+    registry = EndpointRegistry(
+        [EndpointConfig(name, "http://127.0.0.1:9/v1/graphql", schema_file=path) for name in names],
+        schema_cache_budget_bytes=int(size * 2.5)
+    )
+    
+    async def scenario():
+        await registry.get_client("a")._get_index()
+        await registry.get_client("b")._get_index()
+        assert [status["schema_loaded"] for status in registry.describe()] == [True, True, False]
+        
+        # Touch a, so b is now the least recently used
+        registry.get_client("a")
+        await registry.get_client("c")._get_index()
+        statuses = {status["name"]: status["schema_loaded"] for status in registry.describe()}
+        assert statuses == {"a": True, "b": False, "c": True}
+        assert registry.evictions == 1
+        assert registry.schema_cache_bytes() <= registry.schema_cache_budget_bytes
+        
+        # An evicted schema reloads on its next use
+        await registry.get_client("b")._get_index()
+        assert registry.evictions == 2
+    
+    asyncio.run(scenario())
@@ -0,0 +1,29 @@
+import asyncio
+
+from graphql_client import GraphQLClient, dangerous_keyword
+from tools.query_builder import build_document, find_root_field
+
+
+def test_guard_matches_root_fields_not_column_names():
+    assert dangerous_keyword("query { users { id created_at deleted_at } }") is None
+    assert dangerous_keyword("query { delete_users(where: {}) { affected_rows } }") == "delete"
+    assert dangerous_keyword("{ drop_table }") == "drop"
+    assert dangerous_keyword("mutation { delete_users(where: {}) { affected_rows } }") is None
+    # Unparseable documents go to the server, which reports the syntax error
+    assert dangerous_keyword("query { users {") is None
+
+
+def test_execute_query_runs_build_query_documents(stub):
+    async def scenario():
+        client = GraphQLClient(endpoint=stub.url)
+        try:
+            index = await client._get_index()
+            op, field = find_root_field(index, "entity_0000")
+            document = build_document(index, op, field, depth=2)["document"]
+            assert "created_at" in document
+            result = await client.execute_query(document)
+            assert result.startswith("# GraphQL Query Result"), result[:200]
+        finally:
+            await client.aclose()
+    
+    asyncio.run(scenario())
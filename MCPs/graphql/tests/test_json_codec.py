@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+import json_codec
+
+DOCUMENT = {
+    "data": {
+        "items": [
+            {"id": i, "name": f"Zoë {i} — ✓", "score": i / 4, "active": i % 2 == 0, "tags": [], "meta": None}
+            for i in range(50)
+        ],
+        "total": 2 ** 40
+    }
+}
+
+
+def _stream_backends():
+    """The buffered path, and the ijson path when ijson is installed (any of its backends)."""
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+    return [
+        pytest.param(None, id="buffered"),
+        pytest.param(ijson, id="ijson", marks=pytest.mark.skipif(ijson is None, reason="ijson is not installed"))
+    ]
+
+
+@pytest.fixture(params=_stream_backends())
+def stream_backend(request, monkeypatch):
+    monkeypatch.setattr(json_codec, "_ijson", request.param)
+    return request.param
+
+
+def _decode(chunks):
+    decoder = json_codec.StreamDecoder()
+    for chunk in chunks:
+        decoder.feed(chunk)
+    return decoder.close()
+
+
+def test_stream_decoder_reassembles_chunks(stream_backend):
+    body = json.dumps(DOCUMENT, ensure_ascii=False).encode()
+    # Chunk boundaries fall inside tokens and multi-byte characters
+    chunks = [body[i:i + 7] for i in range(0, len(body), 7)]
+    result = _decode(chunks)
+    assert result == DOCUMENT
+    assert isinstance(result["data"]["items"][1]["score"], float)
+    assert isinstance(result["data"]["total"], int)
+
+
+@pytest.mark.parametrize("body", [b"", b'{"data": {"items": [1, 2', b'{"data": nope}'])
+def test_stream_decoder_rejects_invalid_bodies(stream_backend, body):
+    with pytest.raises(ValueError):
+        _decode([body])
+
+
+def test_dumps_pretty_is_the_same_for_every_backend(monkeypatch):
+    pytest.importorskip("orjson")
+    value = {"name": "Zoë — ✓", "rows": [{"id": 1, "score": 0.5}], "empty": {}}
+    fast = json_codec.dumps_pretty(value)
+    monkeypatch.setattr(json_codec, "_orjson", None)
+    assert json_codec.dumps_pretty(value) == fast
+    assert "Zoë — ✓" in fast
+    assert "\n".join(json_codec.iter_pretty(value)) == fast
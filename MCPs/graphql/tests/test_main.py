@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def test_dotenv_settings_apply_to_import_time_configuration():
+    # A fresh interpreter, since json_codec picks its backend when first imported
+    script = (
+        "import os, dotenv\n"
+        "dotenv.load_dotenv = lambda *args, **kwargs: os.environ.update(GRAPHQL_JSON_CODEC='stdlib') or True\n"
+        "import main\n"
+        "main.get_registry()\n"
+        "import json_codec\n"
+        "print(json_codec.BACKEND)\n"
+    )
+    env = {key: value for key, value in os.environ.items() if not key.startswith("GRAPHQL_")}
+    result = subprocess.run([sys.executable, "-c", script], cwd=SRC_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "stdlib"
@@ -0,0 +1,47 @@
+import asyncio
+
+from benchmarks.stub_server import StubConfig, StubGraphQLServer
+from endpoint_registry import EndpointRegistry
+from graphql_client import GraphQLClient
+
+QUERY = "query Items { items { id } }"
+
+
+def _run(server, repeats=3):
+    async def scenario():
+        client = GraphQLClient(endpoint=server.url, persisted_queries=True)
+        try:
+            for _ in range(repeats):
+                assert "items" in await client._execute_query(QUERY)
+            return client._apq_supported, dict(client.apq_stats)
+        finally:
+            await client.aclose()
+    
+    return asyncio.run(scenario())
+
+
+def test_persisted_queries_are_opt_in(monkeypatch):
+    monkeypatch.delenv("GRAPHQL_PERSISTED_QUERIES", raising=False)
+    monkeypatch.delenv("GRAPHQL_ENDPOINTS", raising=False)
+    assert not GraphQLClient(endpoint="http://localhost/v1/graphql").persisted_queries
+    assert not EndpointRegistry.from_env().configs["default"].persisted_queries
+
+
+def test_negotiates_on_persisted_query_not_found(schema):
+    with StubGraphQLServer(config=StubConfig(schema=schema)) as server:
+        supported, stats = _run(server)
+        assert server.stats["apq_hits"] == 2
+    assert supported is True
+    assert stats["registered"] == 1 and stats["hash_only"] == 2
+
+
+def test_generic_error_does_not_lock_in_hash_only(schema):
+    config = StubConfig(schema=schema, persisted_queries=False)
+    # Like a server without APQ: the hash-only body gets a 200 and an error that names neither outcome
+    config.apq_ignored = True
+    with StubGraphQLServer(config=config) as server:
+        supported, stats = _run(server)
+        # One hash-only probe, then full documents only
+        assert server.stats["requests"] == 4
+    assert supported is False
+    assert stats["hash_only"] == 0 and stats["full"] == 3
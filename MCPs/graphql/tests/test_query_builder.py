@@ -0,0 +1,87 @@
+import copy
+
+from schema_index import SchemaIndex, compute_type_hashes
+from tools.query_builder import build_document, find_root_field
+
+
+def _ref(kind, name=None, of_type=None):
+    return {"kind": kind, "name": name, "ofType": of_type}
+
+
+def _field(name, type_ref):
+    return {"name": name, "args": [], "type": type_ref, "isDeprecated": False, "deprecationReason": None}
+
+
+def _object(name, fields):
+    return {"kind": "OBJECT", "name": name, "fields": fields, "interfaces": []}
+
+
+def _cyclic_schema():
+    """node.parent -> node (self-reference) and node.owner -> user.nodes -> node."""
+    node_list = _ref("NON_NULL", of_type=_ref("LIST", of_type=_ref("OBJECT", "node")))
+    return {
+        "queryType": {"name": "query_root"},
+        "mutationType": None,
+        "subscriptionType": None,
+        "directives": [],
+        "types": [
+            {"kind": "SCALAR", "name": "Int"},
+            _object("query_root", [_field("nodes", node_list), _field("users", _ref("LIST", of_type=_ref("OBJECT", "user")))]),
+            _object("node", [
+                _field("id", _ref("SCALAR", "Int")),
+                _field("parent", _ref("OBJECT", "node")),
+                _field("children", node_list),
+                _field("owner", _ref("OBJECT", "user"))
+            ]),
+            _object("user", [_field("id", _ref("SCALAR", "Int")), _field("nodes", node_list)])
+        ]
+    }
+
+
+def _build(index, root_field, depth):
+    op, field = find_root_field(index, root_field)
+    return build_document(index, op, field, depth)
+
+
+def _body(document):
+    """Selection lines inside the root field."""
+    return [line.strip() for line in document.splitlines()[2:-2]]
+
+
+def test_field_count_excludes_nested_closing_braces(schema):
+    result = _build(SchemaIndex(schema), "entity_0000", 2)
+    body = _body(result["document"])
+    assert any(line.endswith("{") for line in body)
+    relations = sum(1 for line in body if line.endswith("{"))
+    leaves = sum(1 for line in body if line != "}" and not line.endswith("{"))
+    assert result["field_count"] == relations + leaves
+
+
+def test_self_referential_relations_are_not_expanded():
+    index = SchemaIndex(_cyclic_schema())
+    body = _body(_build(index, "nodes", 3)["document"])
+    # parent and children point back at node; owner's nodes point back at node too
+    assert body == ["id", "owner {", "id", "}"]
+    
+    # node was memoized with owner expanded; under users, owner leads back to user and is dropped
+    assert _body(_build(index, "users", 3)["document"]) == ["id", "nodes {", "id", "}"]
+
+
+def test_memo_is_reused_across_calls_and_cleared_on_reload(schema):
+    index = SchemaIndex(schema)
+    first = _build(index, "entity_0000", 2)
+    assert first["memo_misses"] > 0
+    
+    second = _build(index, "entity_0000", 2)
+    assert second["document"] == first["document"]
+    assert second["memo_misses"] == 0 and second["memo_hits"] == 1
+    
+    # A reloaded schema starts from an empty memo and sees the new fields
+    new = copy.deepcopy(schema)
+    entity = next(t for t in new["types"] if t["name"] == "entity_0000")
+    entity["fields"].append(_field("added_column", _ref("SCALAR", "String")))
+    index.update(new, compute_type_hashes(new))
+    assert not index.memo
+    third = _build(index, "entity_0000", 2)
+    assert third["memo_misses"] > 0
+    assert "added_column" in _body(third["document"])
@@ -0,0 +1,79 @@
+import asyncio
+
+from graphql_client import GraphQLClient
+from resilience import CircuitBreaker
+from tools.query_plan import explain_url, parse_plan, plan_warnings, where_columns
+
+INDEX_SCAN_PLAN = [
+    "Aggregate  (cost=8.30..8.31 rows=1 width=32)",
+    "  ->  Index Scan using entity_0000_pkey on public.entity_0000  (cost=0.29..8.30 rows=1 width=64)",
+    "        Index Cond: (entity_0000.id = '00000000-0000-4000-8000-000000000000'::uuid)"
+]
+
+
+def _explain(stub, query, variables=None):
+    async def scenario():
+        client = GraphQLClient(endpoint=stub.url)
+        try:
+            return await client.explain_query(query, variables), client.resilience.counters["requests"]
+        finally:
+            await client.aclose()
+    
+    return asyncio.run(scenario())
+
+
+def test_explain_url():
+    assert explain_url("https://host/v1/graphql") == "https://host/v1/graphql/explain"
+    assert explain_url("https://host/v1/graphql/?x=1") == "https://host/v1/graphql/explain"
+    assert explain_url("https://host/graphql") == "https://host/v1/graphql/explain"
+
+
+def test_parse_plan_and_where_columns():
+    nodes = parse_plan(INDEX_SCAN_PLAN)
+    assert [node["node_type"] for node in nodes] == ["Aggregate", "Index Scan"]
+    assert nodes[1]["relation"] == "public.entity_0000"
+    assert nodes[1]["rows"] == 1 and nodes[1]["depth"] == 2
+    assert "Index Cond" in nodes[1]["conditions"]
+    assert plan_warnings(nodes, ["id"]) == []
+    
+    document = "query($w: t_bool_exp) { a: t(where: {_and: [{x: {_eq: 1}}, {_not: {y: {_is_null: true}}}]}) { id } u(where: $w) { id } }"
+    assert where_columns(document, {"w": {"z": {"_gt": 0}}}) == {"a": ["x", "y"], "u": ["z"]}
+
+
+def test_seq_scan_is_flagged(stub):
+    output, requests = _explain(stub, "query { entity_0000 { id } }")
+    assert "Sequential scan on public.entity_0000" in output
+    assert "High row estimate" in output
+    assert "without an index" not in output
+    # Through the resilient caller, like execute-query
+    assert requests == 1
+    assert stub.stats["explains"] == 1
+
+
+def test_index_scan_has_no_warnings(stub):
+    stub.config.explain_plans["entity_0000"] = INDEX_SCAN_PLAN
+    output, _ = _explain(stub, 'query { entity_0000(where: {id: {_eq: "00000000-0000-4000-8000-000000000000"}}) { id } }')
+    assert "### Warnings" not in output
+    assert "**Estimated Cost:** 8.31 (1 rows)" in output
+
+
+def test_unindexed_where_column_is_flagged(stub):
+    output, _ = _explain(stub, "query($since: timestamptz) { entity_0000(where: {created_at: {_gte: $since}}) { id } }",
+                         {"since": "2024-01-01T00:00:00+00:00"})
+    assert "`where` column created_at on public.entity_0000 is filtered without an index" in output
+    assert "CREATE INDEX ON public.entity_0000 (created_at)" in output
+
+
+def test_explain_respects_the_circuit_breaker(stub):
+    async def scenario():
+        client = GraphQLClient(endpoint=stub.url)
+        try:
+            client.resilience.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+            client.resilience.breaker.record_failure()
+            return await client.explain_query("query { entity_0000 { id } }")
+        finally:
+            await client.aclose()
+    
+    output = asyncio.run(scenario())
+    assert output.startswith("Error explaining query: Circuit open")
+    assert stub.stats["explains"] == 0
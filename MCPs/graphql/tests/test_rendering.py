@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from benchmarks.schema_gen import write_schema_files
+from endpoint_registry import EndpointConfig, EndpointRegistry
+from tools.rendering import chunk_lines
+
+
+def _check(lines, max_chars):
+    parts = list(chunk_lines(lines, max_chars))
+    assert "".join(parts) == "\n".join(lines)
+    assert all(len(part) <= max_chars for part in parts)
+    return parts
+
+
+def test_short_lines_are_packed():
+    parts = _check([f"line {i}" for i in range(100)], 64)
+    assert len(parts) > 1
+    assert all(parts)
+
+
+def test_oversized_line_is_split():
+    parts = _check(["head", "x" * 250, "tail"], 100)
+    assert len(parts) == 3
+    assert parts[0].startswith("head\n")
+
+
+def test_small_and_empty_input():
+    assert _check(["a", "b"], 100) == ["a\nb"]
+    assert list(chunk_lines([], 100)) == [""]
+    assert list(chunk_lines([""], 100)) == [""]
+
+
+@pytest.mark.parametrize("tool, arguments, method", [
+    ("introspect-schema", {"page": 2, "per_page": 50}, lambda c: c.introspect_schema(2, 50)),
+    ("introspect-schema", {"filter_kind": "ENUM"}, lambda c: c.introspect_schema(1, 20, "ENUM")),
+    ("get-type-info", {"type_name": "entity_0001"}, lambda c: c.get_type_info("entity_0001")),
+    ("get-type-info", {"type_name": "missing"}, lambda c: c.get_type_info("missing")),
+    ("search-schema", {"query": "col_0"}, lambda c: c.search_schema("col_0")),
+    ("search-schema", {"query": "zzz"}, lambda c: c.search_schema("zzz"))
+])
+def test_streamed_schema_tools_match_their_string_form(tmp_path, monkeypatch, tool, arguments, method):
+    import main
+    
+    schema_file = write_schema_files(str(tmp_path), 20)["json"]
+    registry = EndpointRegistry([EndpointConfig("default", "http://127.0.0.1:9/v1/graphql", schema_file=schema_file)])
+    monkeypatch.setattr(main, "_registry", registry)
+    monkeypatch.setattr(main, "_recorder", None)
+    
+    async def scenario():
+        streamed = await main.dispatch_tool(tool, arguments)
+        return "".join(part.text for part in streamed), await method(registry.get_client())
+    
+    streamed, expected = asyncio.run(scenario())
+    assert streamed == expected
+    assert not expected.startswith("Error")
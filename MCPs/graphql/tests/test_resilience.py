@@ -0,0 +1,172 @@
+import asyncio
+
+import httpx
+import pytest
+
+from concurrency_limiter import AdaptiveLimiter, LimiterPolicy, OverloadedError
+from resilience import CircuitBreaker, CircuitOpenError, ResiliencePolicy, ResilientCaller
+
+
+def _limited(limit: int) -> AdaptiveLimiter:
+    return AdaptiveLimiter(LimiterPolicy(initial_limit=limit, max_limit=limit), max_connections=limit)
+
+
+def test_backoff_does_not_hold_a_limiter_slot(monkeypatch):
+    # Full jitter could pick a backoff shorter than the check below; take the upper bound
+    monkeypatch.setattr("resilience.random.uniform", lambda low, high: high)
+    
+    async def scenario():
+        limiter = _limited(1)
+        caller = ResilientCaller(ResiliencePolicy(max_retries=1, backoff_base=0.2, backoff_max=0.2, hedge=False))
+        seen = []
+        
+        async def send(timeout):
+            seen.append(limiter.in_flight)
+            if len(seen) == 1:
+                raise httpx.ConnectError("refused")
+            return "ok"
+        
+        task = asyncio.ensure_future(caller.call("query", send, slot=lambda wait: limiter.slot("query", None, wait)))
+        await asyncio.sleep(0.01)
+        # Backing off before the retry: the slot is free for other calls
+        assert limiter.in_flight == 0
+        assert await task == "ok"
+        assert seen == [1, 1]
+        assert caller.counters["retries"] == 1
+    
+    asyncio.run(scenario())
+
+
+def _hedging_caller() -> ResilientCaller:
+    caller = ResilientCaller(ResiliencePolicy(hedge=True, hedge_min_delay=0.01, hedge_min_samples=1))
+    caller.latency["query"].add(0.001)
+    return caller
+
+
+def test_hedge_takes_its_own_slot():
+    async def scenario():
+        limiter = _limited(2)
+        caller = _hedging_caller()
+        peak = []
+        
+        async def send(timeout):
+            peak.append(limiter.in_flight)
+            await asyncio.sleep(0.05)
+            return "ok"
+        
+        assert await caller.call("query", send, slot=lambda wait: limiter.slot("query", None, wait)) == "ok"
+        assert caller.counters["hedges"] == 1
+        assert max(peak) == 2
+        assert limiter.in_flight == 0
+    
+    asyncio.run(scenario())
+
+
+def test_hedge_is_skipped_without_a_free_slot():
+    async def scenario():
+        limiter = _limited(1)
+        caller = _hedging_caller()
+        calls = []
+        
+        async def send(timeout):
+            calls.append(timeout)
+            await asyncio.sleep(0.05)
+            return "ok"
+        
+        assert await caller.call("query", send, slot=lambda wait: limiter.slot("query", None, wait)) == "ok"
+        assert len(calls) == 1
+        assert caller.counters["hedges"] == 0
+        assert caller.counters["hedges_skipped"] == 1
+        assert limiter.in_flight == 0
+    
+    asyncio.run(scenario())
+
+
+def test_limiter_feedback_is_per_attempt_latency():
+    async def scenario():
+        limiter = _limited(4)
+        caller = ResilientCaller(ResiliencePolicy(max_retries=1, backoff_base=0.3, backoff_max=0.3, hedge=False))
+        attempts = []
+        
+        async def send(timeout):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise httpx.ConnectError("refused")
+            await asyncio.sleep(0.01)
+            return "ok"
+        
+        await caller.call("query", send, slot=lambda wait: limiter.slot("query", None, wait))
+        # The backoff (up to 300ms) is not part of any sample
+        assert limiter._rtt_avg < 0.1
+    
+    asyncio.run(scenario())
+
+
+def test_limiter_rejection_does_not_touch_the_breaker():
+    async def scenario():
+        limiter = _limited(1)
+        caller = ResilientCaller(ResiliencePolicy(hedge=False, breaker_failures=1))
+        
+        async def send(timeout):
+            return "ok"
+        
+        await limiter.acquire(1)
+        with pytest.raises(OverloadedError):
+            await caller.call("query", send, slot=lambda wait: limiter.slot("query", None, False))
+        assert caller.breaker.state == "closed"
+        assert caller.breaker.consecutive_failures == 0
+        limiter.release()
+    
+    asyncio.run(scenario())
+
+
+def test_hedging_is_opt_in(monkeypatch):
+    monkeypatch.delenv("GRAPHQL_HEDGE", raising=False)
+    assert not ResiliencePolicy().hedge
+    assert not ResiliencePolicy.from_env().hedge
+    caller = ResilientCaller(ResiliencePolicy.from_env())
+    caller.latency["query"].add(0.001)
+    assert caller.hedge_delay("query") is None
+    
+    monkeypatch.setenv("GRAPHQL_HEDGE", "true")
+    assert ResiliencePolicy.from_env().hedge
+
+
+def test_breaker_opens_probes_and_closes():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10.0, clock=lambda: now[0])
+    for _ in range(2):
+        breaker.check()
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.opens == 1
+    with pytest.raises(CircuitOpenError, match="retrying in"):
+        breaker.check()
+    
+    # After the reset timeout one probe goes out; others fail fast until it reports back
+    now[0] = 10.0
+    breaker.check()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError, match="waiting for the probe"):
+        breaker.check()
+    
+    # A failed probe reopens for another timeout
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.opens == 2 and breaker.opened_at == 10.0
+    now[0] = 20.0
+    breaker.check()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.consecutive_failures == 0
+    breaker.check()
+
+
+def test_abandoned_probe_lets_another_through():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=1.0, clock=lambda: now[0])
+    breaker.record_failure()
+    now[0] = 1.0
+    breaker.check()
+    breaker.release_probe()
+    breaker.check()
+    assert breaker.state == "half_open"
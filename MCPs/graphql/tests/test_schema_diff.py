@@ -0,0 +1,76 @@
+import asyncio
+import copy
+
+from graphql_client import GraphQLClient
+from schema_index import compute_type_hashes
+from tools.schema_diff import diff_schemas, format_schema_diff
+
+
+def _diff(old, new):
+    old_types = {t["name"]: t for t in old["types"]}
+    new_types = {t["name"]: t for t in new["types"]}
+    return diff_schemas(old_types, compute_type_hashes(old), new_types, compute_type_hashes(new))
+
+
+def _type(schema, name):
+    return next(t for t in schema["types"] if t["name"] == name)
+
+
+def test_identical_schemas(schema):
+    diff = _diff(schema, copy.deepcopy(schema))
+    assert not diff["changed"] and not diff["hash_only"]
+    assert diff["unchanged"] == len(schema["types"])
+    assert "No differences found" in format_schema_diff(diff, "cached", "live")
+
+
+def test_field_and_argument_descriptions_are_reported(schema):
+    new = copy.deepcopy(schema)
+    field = _type(new, "query_root")["fields"][0]
+    field["description"] = "rewritten"
+    field["args"][0]["description"] = "rewritten"
+    
+    diff = _diff(schema, new)
+    assert diff["changed"]["query_root"] == [
+        f"query_root.{field['name']}: description changed",
+        f"query_root.{field['name']}(args).{field['args'][0]['name']}: description changed"
+    ]
+    assert not diff["breaking"]
+    assert diff["unchanged"] == len(schema["types"]) - 1
+
+
+def test_hash_only_changes_are_not_counted_unchanged(schema):
+    new = copy.deepcopy(schema)
+    _type(new, "query_root")["fields"].reverse()
+    
+    diff = _diff(schema, new)
+    assert diff["hash_only"] == ["query_root"]
+    assert diff["unchanged"] == len(schema["types"]) - 1
+    output = format_schema_diff(diff, "cached", "live")
+    assert "No differences found" not in output
+    assert "## Changed Types (hash only)" in output
+
+
+def test_diff_leaves_a_reloaded_cache_alone(stub, schema):
+    new = copy.deepcopy(schema)
+    _type(new, "query_root")["fields"][0]["description"] = "rewritten"
+    
+    async def scenario():
+        client = GraphQLClient(endpoint=stub.url)
+        try:
+            index = await client._get_index()
+            
+            async def load_live(source):
+                # The cache is dropped while the live schema is being fetched
+                client.drop_schema_cache()
+                return new
+            
+            client._load_schema_source = load_live
+            output = await client.diff_schema("cached", "live")
+            assert "description changed" in output
+            assert "left as is" in output
+            assert client._index is None
+            assert _type(index.schema, "query_root")["fields"][0]["description"] != "rewritten"
+        finally:
+            await client.aclose()
+    
+    asyncio.run(scenario())
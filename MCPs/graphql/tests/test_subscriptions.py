@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from subscriptions import EventRing
+
+websockets = pytest.importorskip("websockets")
+
+from benchmarks.ws_stub import StubSubscriptionConfig, StubSubscriptionServer  # noqa: E402
+from graphql_client import GraphQLClient  # noqa: E402
+
+QUERY = "subscription Events { events { seq sent_at row } }"
+
+
+def test_ring_reads_by_cursor_and_reports_drops():
+    async def scenario():
+        ring = EventRing(capacity=3)
+        for i in range(5):
+            await ring.put(i)
+        events, cursor, missed = ring.read(0, 10)
+        assert [payload for _, _, payload in events] == [2, 3, 4]
+        assert (cursor, missed, ring.dropped) == (5, 2, 2)
+        # Reading from the returned cursor acknowledges and frees everything before it
+        assert ring.read(cursor, 10) == ([], 5, 0)
+        assert len(ring) == 0
+    
+    asyncio.run(scenario())
+
+
+def test_blocking_ring_waits_for_reader():
+    async def scenario():
+        ring = EventRing(capacity=1, overflow="block")
+        await ring.put("a")
+        blocked = asyncio.create_task(ring.put("b"))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        _, cursor, _ = ring.read(0, 1)
+        ring.read(cursor, 1)
+        await asyncio.wait_for(blocked, 1)
+        assert ring.dropped == 0
+    
+    asyncio.run(scenario())
+
+
+def test_closed_ring_releases_blocked_put():
+    async def scenario():
+        ring = EventRing(capacity=1, overflow="block")
+        await ring.put("a")
+        blocked = asyncio.create_task(ring.put("b"))
+        await asyncio.sleep(0.01)
+        ring.close()
+        await asyncio.wait_for(blocked, 1)
+        # The late event is discarded; what was buffered stays readable
+        events, _, _ = ring.read(0, 10)
+        assert [payload for _, _, payload in events] == ["a"]
+    
+    asyncio.run(scenario())
+
+
+def test_unsubscribing_blocked_subscription_unblocks_shared_socket():
+    async def scenario(server):
+        client = GraphQLClient(endpoint=server.http_url)
+        manager = client._get_subscriptions()
+        try:
+            blocked = await manager.subscribe(QUERY, buffer_size=2, overflow="block")
+            other = await manager.subscribe(QUERY)
+            # Nobody reads `blocked`: once its ring is full the shared reader parks in put()
+            for _ in range(200):
+                if len(blocked.ring) == 2:
+                    break
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+            stalled_at = other.ring.next_cursor
+            await asyncio.sleep(0.05)
+            assert other.ring.next_cursor == stalled_at
+            
+            await manager.unsubscribe(blocked.id)
+            await asyncio.sleep(0.1)
+            assert other.ring.next_cursor > stalled_at
+            assert other.status == "active"
+        finally:
+            await client.aclose()
+    
+    with StubSubscriptionServer(config=StubSubscriptionConfig(interval_ms=2)) as server:
+        asyncio.run(scenario(server))
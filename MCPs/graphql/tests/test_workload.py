@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+import json_codec
+from benchmarks.replay import load_workload, replay
+from workload import WorkloadRecorder, synthesize, value_shape
+
+SECRET = "hunter2-do-not-log"
+
+
+def test_value_shape_redacts_values():
+    value = {
+        "id": "0b6cd7b2-54b2-4a39-9a62-0f1d8ca3a1f2",
+        "since": "2024-05-01T10:00:00Z",
+        "day": "2024-05-01",
+        "name": SECRET,
+        "count": 3,
+        "ratio": 0.5,
+        "active": True,
+        "missing": None,
+        "tags": ["a", "b"],
+        "empty": []
+    }
+    shape = value_shape(value)
+    assert shape == {
+        "id": "uuid", "since": "timestamp", "day": "date", "name": "string", "count": "int",
+        "ratio": "float", "active": "bool", "missing": "null",
+        "tags": {"__list__": 2, "items": "string"}, "empty": {"__list__": 0, "items": None}
+    }
+    assert SECRET not in json_codec.dumps_bytes(shape).decode()
+
+
+def test_synthesize_inverts_the_shape():
+    shape = value_shape({"ids": ["0b6cd7b2-54b2-4a39-9a62-0f1d8ca3a1f2"] * 3, "where": {"at": {"_gte": "2024-05-01 10:00"}}})
+    values = synthesize(shape)
+    assert len(values["ids"]) == 3
+    assert value_shape(values) == shape
+    assert synthesize({"__list__": 0, "items": None}) == []
+
+
+def test_recorder_redacts_and_flags_mutations(tmp_path, monkeypatch):
+    path = tmp_path / "workload.jsonl"
+    monkeypatch.delenv("GRAPHQL_WORKLOAD_LOG", raising=False)
+    assert WorkloadRecorder.from_env() is None
+    monkeypatch.setenv("GRAPHQL_WORKLOAD_LOG", str(path))
+    recorder = WorkloadRecorder.from_env()
+    
+    recorder.record("execute-query", {"query": "query Q($name: String) { users(where: {name: {_eq: $name}}) { id } }",
+                                      "variables": {"name": SECRET}}, 100.0, 0.01, ["# GraphQL Query Result"])
+    recorder.record("execute-query", {"query": 'mutation { delete_users(where: {id: {_eq: 1}}) { affected_rows } }',
+                                      "endpoint": "prod"}, 101.0, 0.02, ["Error executing query: boom"])
+    recorder.record("bulk-mutation", {"mutation": "insert_users", "rows": [{"name": SECRET}] * 2, "endpoint": "prod"},
+                    102.0, 0.5, ["# Bulk insert_users"])
+    recorder.close()
+    
+    text = path.read_text()
+    assert SECRET not in text
+    query, mutation, bulk = [json_codec.loads(line) for line in text.splitlines()]
+    assert query["operation_type"] == "query" and query["variables"] == {"name": "string"}
+    assert len(query["document_sha256"]) == 64 and not query["error"]
+    assert mutation["operation_type"] == "mutation" and mutation["endpoint"] == "prod" and mutation["error"]
+    # Inline literals are kept (the module docstring says to put sensitive values in variables)
+    assert "_eq: 1" in mutation["document"]
+    assert bulk["arguments"] == {"mutation": "string", "rows": {"__list__": 2, "items": {"name": "string"}}}
+    assert recorder.records == 3
+    
+    records, skipped = load_workload(str(path))
+    assert [record["operation_type"] for record in records] == ["query"]
+    assert skipped == {"mutations": 1, "bulk_mutations": 1, "unknown_persisted_queries": 0}
+
+
+@pytest.mark.parametrize("concurrency, expected", [(0, 24), (12, 12)])
+def test_replay_applies_the_requested_concurrency(stub, concurrency, expected):
+    stub.config.latency_ms = 100
+    records = [{"ts": 0.0, "document": "query Q { items { id } }"} for _ in range(24)]
+    results = asyncio.run(replay(records, stub.url, speedup=0, concurrency=concurrency))
+    assert results["ok"] == 24
+    # Neither a one-connection pool nor the adaptive limiter holds requests back
+    assert stub.stats["max_in_flight"] == expected